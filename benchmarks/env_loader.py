@@ -0,0 +1,47 @@
+"""Measure the env loader with a large environment and long allow lists. Run with
+`python -m benchmarks.env_loader`."""
+
+import os
+import time
+
+from confz import EnvSource
+from confz.loaders.env_loader import EnvLoader
+
+N_VARIABLES = 10_000
+N_ALLOWED = 500
+
+
+def measure(config_source: EnvSource, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        EnvLoader.populate_config({}, config_source)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    variables = {f"BENCH_VAR_{idx}": str(idx) for idx in range(N_VARIABLES)}
+    allow = [
+        f"bench_var_{idx}" for idx in range(0, N_VARIABLES, N_VARIABLES // N_ALLOWED)
+    ]
+    environ_backup = os.environ.copy()
+    os.environ.update(variables)
+    try:
+        sources = {
+            "allow_all": EnvSource(allow_all=True),
+            "allow_all with prefix": EnvSource(allow_all=True, prefix="BENCH_"),
+            f"allow {N_ALLOWED}": EnvSource(allow=allow),
+            f"allow {N_ALLOWED}, deny {N_ALLOWED}": EnvSource(allow=allow, deny=allow),
+            "nothing allowed": EnvSource(),
+        }
+        print(f"{len(os.environ)} environment variables")
+        for name, config_source in sources.items():
+            print(f"{name:>25}: {measure(config_source) * 1000:8.2f}ms")
+    finally:
+        os.environ.clear()
+        os.environ.update(environ_backup)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Generators of synthetic inputs for the benchmarks."""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+
+def _services(target_size: int, entry_size: int) -> Iterator[Tuple[int, dict]]:
+    for idx in range(max(1, target_size // entry_size)):
+        yield idx, {
+            "host": f"host-{idx}.example.com",
+            "port": 8000 + idx % 1000,
+            "enabled": idx % 2 == 0,
+            "timeout": idx % 100 / 10,
+            "tags": [f"tag_{tag}" for tag in range(5)],
+            "limits": {"cpu": idx % 8 + 1, "memory": f"{idx % 16 + 1}Gi"},
+        }
+
+
+def _yaml_entry(idx: int, service: dict) -> str:
+    tags = "".join(f"    - {tag}\n" for tag in service["tags"])
+    return (
+        f"  service_{idx}:\n"
+        f"    host: {service['host']}\n"
+        f"    port: {service['port']}\n"
+        f"    enabled: {str(service['enabled']).lower()}\n"
+        f"    timeout: {service['timeout']}\n"
+        f"    tags:\n{tags}"
+        f"    limits:\n"
+        f"      cpu: {service['limits']['cpu']}\n"
+        f"      memory: {service['limits']['memory']}\n"
+    )
+
+
+def _toml_entry(idx: int, service: dict) -> str:
+    tags = ", ".join(f'"{tag}"' for tag in service["tags"])
+    return (
+        f"[services.service_{idx}]\n"
+        f"host = \"{service['host']}\"\n"
+        f"port = {service['port']}\n"
+        f"enabled = {str(service['enabled']).lower()}\n"
+        f"timeout = {service['timeout']}\n"
+        f"tags = [{tags}]\n"
+        f"[services.service_{idx}.limits]\n"
+        f"cpu = {service['limits']['cpu']}\n"
+        f"memory = \"{service['limits']['memory']}\"\n"
+    )
+
+
+def config_text(file_format: str, target_size: int) -> str:
+    """Generate a config file of roughly `target_size` bytes with a dict of services.
+
+    :param file_format: One of `json`, `yaml` or `toml`.
+    :param target_size: Approximate size in bytes.
+    """
+    if file_format == "json":
+        services = dict(
+            (f"service_{idx}", service) for idx, service in _services(target_size, 190)
+        )
+        return json.dumps({"services": services})
+    if file_format == "yaml":
+        entries = [_yaml_entry(*item) for item in _services(target_size, 210)]
+        return "services:\n" + "".join(entries)
+    if file_format == "toml":
+        return "".join(_toml_entry(*item) for item in _services(target_size, 205))
+    raise ValueError(f"Unknown format {file_format}")
+
+
+def write_config(folder: Path, file_format: str, target_size: int) -> Path:
+    path = folder / f"config_{target_size}.{file_format}"
+    path.write_text(config_text(file_format, target_size), encoding="utf-8")
+    return path
+
+
+def environment(n_variables: int, prefix: str = "BENCH_") -> Dict[str, str]:
+    """Environment variables with nested names, e.g. `BENCH_SERVICES.SERVICE_1.PORT`."""
+    return {
+        f"{prefix}SERVICES.SERVICE_{idx // 4}.FIELD_{idx % 4}": str(idx)
+        for idx in range(n_variables)
+    }
+
+
+def env_file(folder: Path, n_variables: int, prefix: str = "BENCH_") -> Path:
+    path = folder / f"bench_{n_variables}.env"
+    lines = [
+        f"{name}={value}" for name, value in environment(n_variables, prefix).items()
+    ]
+    path.write_text("\n".join(lines), encoding="utf-8")
+    return path
+
+
+def nested_keys(n_keys: int, depth: int) -> Dict[str, str]:
+    """Flat dict with keys of `depth` parts separated by dots, as produced by env
+    variables or command line arguments."""
+    keys = {}
+    for idx in range(n_keys):
+        parts = [f"level{level}_{idx % (level + 2)}" for level in range(depth - 1)]
+        keys[".".join(parts + [f"key_{idx}"])] = str(idx)
+    return keys
+
+
+def nested_dict(n_keys: int, depth: int) -> dict:
+    """Nested dict with `n_keys` leaves at the given depth."""
+    result: dict = {}
+    for key, value in nested_keys(n_keys, depth).items():
+        current = result
+        *parents, leaf = key.split(".")
+        for parent in parents:
+            current = current.setdefault(parent, {})
+        current[leaf] = value
+    return result
+
+
+def argv(n_arguments: int, prefix: str = "bench_") -> List[str]:
+    """Command line with `n_arguments` options, alternating `--name value` and
+    `--name=value`."""
+    args = ["program"]
+    for idx in range(n_arguments):
+        name = f"--{prefix}services.service_{idx // 4}.field_{idx % 4}"
+        if idx % 2 == 0:
+            args.extend([name, str(idx)])
+        else:
+            args.append(f"{name}={idx}")
+    return args
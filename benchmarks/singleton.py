@@ -0,0 +1,48 @@
+"""Measure access to an already loaded singleton config, single-threaded and from
+multiple threads. Run with `python -m benchmarks.singleton`."""
+
+import threading
+import time
+
+from confz import BaseConfig, DataSource
+
+N_CALLS = 1_000_000
+N_THREADS = 8
+
+
+class BenchConfig(BaseConfig):
+    number: int
+
+    CONFIG_SOURCES = DataSource(data={"number": 1})
+
+
+def access(n_calls: int):
+    for _ in range(n_calls):
+        BenchConfig()
+
+
+def measure_threads(n_threads: int) -> float:
+    threads = [
+        threading.Thread(target=access, args=(N_CALLS // n_threads,))
+        for _ in range(n_threads)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main():
+    BenchConfig()
+    for n_threads in [1, N_THREADS]:
+        duration = measure_threads(n_threads)
+        print(
+            f"{n_threads} thread(s): {duration * 1e9 / N_CALLS:6.1f}ns per access "
+            f"({N_CALLS} accesses)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""Benchmark suite for the loaders, the merge helpers and end-to-end config creation
+on generated inputs. Results are written as JSON and can be compared against a
+baseline::
+
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --baseline baseline.json
+
+Comparing exits with status 1 if any benchmark got slower than the threshold."""
+
+import argparse
+import copy
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from confz import BaseConfig, CLArgSource, EnvSource, FileSource
+from confz.loaders.cl_arg_loader import CLArgLoader
+from confz.loaders.env_loader import EnvLoader
+from confz.loaders.file_loader import FileLoader
+from confz.loaders.loader import Loader
+
+from . import generate
+
+SIZES = {
+    "1KB": 1024,
+    "100KB": 100 * 1024,
+    "1MB": 1024**2,
+    "10MB": 10 * 1024**2,
+    "50MB": 50 * 1024**2,
+}
+FORMATS = ["json", "yaml", "toml"]
+N_VARIABLES = 10_000
+N_ARGUMENTS = 10_000
+N_KEYS = 10_000
+DEPTH = 8
+
+
+class Suite:
+    def __init__(self, repeat: int, max_size: int, pattern: Optional[str]):
+        self.repeat = repeat
+        self.max_size = max_size
+        self.pattern = pattern
+        self.results: Dict[str, dict] = {}
+
+    def measure(
+        self,
+        name: str,
+        fn: Callable[[], None],
+        setup: Optional[Callable[[], None]] = None,
+        repeat: Optional[int] = None,
+        **info,
+    ):
+        if self.pattern is not None and self.pattern not in name:
+            return
+        timings = []
+        if (repeat or self.repeat) > 1:  # warm up
+            if setup is not None:
+                setup()
+            fn()
+        for _ in range(repeat or self.repeat):
+            if setup is not None:
+                setup()
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        self.results[name] = {
+            "min": min(timings),
+            "median": statistics.median(timings),
+            "repeat": len(timings),
+            **info,
+        }
+        print(f"{name:<45} {min(timings) * 1000:10.3f}ms", flush=True)
+
+
+def bench_files(suite: Suite, folder: Path):
+    for file_format in FORMATS:
+        for size_name, size in SIZES.items():
+            if size > suite.max_size:
+                continue
+            path = generate.write_config(folder, file_format, size)
+            source = FileSource(file=path)
+            # few repetitions for large files, parsing them takes seconds
+            repeat = suite.repeat if size <= SIZES["1MB"] else 1
+            suite.measure(
+                f"file.{file_format}.{size_name}",
+                lambda source=source: FileLoader.populate_config({}, source),
+                setup=FileLoader.cache_clear,
+                repeat=repeat,
+                size_bytes=path.stat().st_size,
+            )
+            suite.measure(
+                f"file.{file_format}.{size_name}.cached",
+                lambda source=source: FileLoader.populate_config({}, source),
+                repeat=repeat,
+                size_bytes=path.stat().st_size,
+            )
+            path.unlink()
+
+
+def bench_env(suite: Suite, folder: Path):
+    variables = generate.environment(N_VARIABLES)
+    environ_backup = os.environ.copy()
+    os.environ.update(variables)
+    try:
+        allowed = [name[len("BENCH_") :].lower() for name in list(variables)[::20]]
+        sources = {
+            "allow_all": EnvSource(allow_all=True, prefix="BENCH_"),
+            "allow": EnvSource(allow=allowed, prefix="BENCH_"),
+        }
+        for name, source in sources.items():
+            suite.measure(
+                f"env.{name}.{N_VARIABLES}",
+                lambda source=source: EnvLoader.populate_config({}, source),
+            )
+    finally:
+        os.environ.clear()
+        os.environ.update(environ_backup)
+
+    path = generate.env_file(folder, N_VARIABLES)
+    source = EnvSource(allow_all=True, prefix="BENCH_", file=path)
+    suite.measure(
+        f"env.file.{N_VARIABLES}",
+        lambda: EnvLoader.populate_config({}, source),
+        size_bytes=path.stat().st_size,
+    )
+
+
+def bench_argv(suite: Suite):
+    argv = generate.argv(N_ARGUMENTS)
+    argv_backup = sys.argv
+    source = CLArgSource(prefix="bench_")
+    runs = iter(range(sys.maxsize))
+
+    def change_argv():
+        # a different command line each time, so it is parsed again
+        sys.argv = argv + [f"--run={next(runs)}"]
+
+    try:
+        suite.measure(
+            f"argv.{N_ARGUMENTS}",
+            lambda: CLArgLoader.populate_config({}, source),
+            setup=change_argv,
+        )
+        suite.measure(
+            f"argv.{N_ARGUMENTS}.cached",
+            lambda: CLArgLoader.populate_config({}, source),
+        )
+    finally:
+        sys.argv = argv_backup
+
+
+def bench_merge(suite: Suite):
+    keys = generate.nested_keys(N_KEYS, DEPTH)
+    suite.measure(
+        f"transform_nested_dicts.{N_KEYS}x{DEPTH}",
+        lambda: Loader.transform_nested_dicts(keys),
+    )
+
+    original = generate.nested_dict(N_KEYS, DEPTH)
+    update = generate.nested_dict(N_KEYS, DEPTH)
+    targets: List[dict] = []
+    suite.measure(
+        f"update_dict_recursively.{N_KEYS}x{DEPTH}",
+        lambda: Loader.update_dict_recursively(targets.pop(), update),
+        setup=lambda: targets.append(copy.deepcopy(original)),
+    )
+
+
+def bench_end_to_end(suite: Suite, folder: Path):
+    class Limits(BaseConfig):
+        cpu: int
+        memory: str
+
+    class Service(BaseConfig):
+        host: str
+        port: int
+        enabled: bool
+        timeout: float
+        tags: List[str]
+        limits: Limits
+
+    class BenchConfig(BaseConfig):
+        services: Dict[str, Service]
+
+    for size_name in ["1KB", "100KB", "1MB"]:
+        if SIZES[size_name] > suite.max_size:
+            continue
+        path = generate.write_config(folder, "yaml", SIZES[size_name])
+        sources = [
+            FileSource(file=path),
+            EnvSource(allow_all=True, prefix="BENCH_"),
+            CLArgSource(prefix="bench_"),
+        ]
+
+        def reset():
+            FileLoader.cache_clear()
+            BenchConfig.confz_layers = None
+
+        suite.measure(
+            f"config.{size_name}",
+            lambda sources=sources: BenchConfig(config_sources=sources),
+            setup=reset,
+            size_bytes=path.stat().st_size,
+        )
+        suite.measure(
+            f"config.{size_name}.cached",
+            lambda sources=sources: BenchConfig(config_sources=sources),
+            size_bytes=path.stat().st_size,
+        )
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float):
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["min"] / baseline[name]["min"]
+        marker = ""
+        if ratio > 1 + threshold:
+            marker = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<45} {ratio:6.2f}x{marker}")
+    return regressions
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare with these results")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative slowdown considered a regression (default: 0.2)",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--max-size",
+        choices=list(SIZES),
+        default="50MB",
+        help="largest generated config file",
+    )
+    parser.add_argument("--filter", help="only run benchmarks containing this")
+    options = parser.parse_args(args)
+
+    suite = Suite(options.repeat, SIZES[options.max_size], options.filter)
+    with tempfile.TemporaryDirectory() as folder:
+        bench_files(suite, Path(folder))
+        bench_env(suite, Path(folder))
+        bench_argv(suite)
+        bench_merge(suite)
+        bench_end_to_end(suite, Path(folder))
+
+    output = {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "yaml_backend": FileLoader.yaml_backend(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": suite.results,
+    }
+    if options.output is not None:
+        options.output.write_text(json.dumps(output, indent=2), encoding="utf-8")
+
+    if options.baseline is not None:
+        baseline = json.loads(options.baseline.read_text(encoding="utf-8"))
+        regressions = compare(suite.results, baseline["results"], options.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""Compare the libyaml and the pure-Python backend of the file loader on large
+generated YAML files. Run with `python -m benchmarks.yaml_backends`."""
+
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+from confz import FileSource
+from confz.loaders.file_loader import FileLoader
+
+
+def generate_yaml(path: Path, n_services: int):
+    data = {
+        "services": {
+            f"service_{idx}": {
+                "host": f"host-{idx}.example.com",
+                "port": 8000 + idx,
+                "enabled": idx % 2 == 0,
+                "timeout": idx / 10,
+                "tags": [f"tag_{tag}" for tag in range(5)],
+            }
+            for idx in range(n_services)
+        }
+    }
+    with path.open("w", encoding="utf-8") as file:
+        yaml.safe_dump(data, file)
+
+
+def measure(path: Path, pure_python: bool, repeat: int = 1) -> float:
+    timings = []
+    for _ in range(repeat):
+        FileLoader.cache_clear()
+        start = time.perf_counter()
+        FileLoader.populate_config({}, FileSource(file=path, pure_python=pure_python))
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    print(f"default backend: {FileLoader.yaml_backend()}")
+    with tempfile.TemporaryDirectory() as folder:
+        for n_services in (1_000, 5_000, 10_000):
+            path = Path(folder) / f"config_{n_services}.yml"
+            generate_yaml(path, n_services)
+            size_mb = path.stat().st_size / 1024**2
+            python_time = measure(path, pure_python=True)
+            default_time = measure(path, pure_python=False)
+            print(
+                f"{size_mb:6.1f} MB: python {python_time:7.3f}s, "
+                f"default {default_time:7.3f}s, "
+                f"speedup {python_time / default_time:4.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,21 @@
-from .change import depends_on
-from .base_config import BaseConfig
-from .config_source import (
-    ConfigSources,
-    ConfigSource,
-    FileSource,
-    EnvSource,
-    CLArgSource,
-    FileFormat,
-    DataSource,
-)
-from .validate import validate_all_configs
+import importlib
+import importlib.util
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .change import depends_on
+    from .base_config import BaseConfig
+    from .config_source import (
+        ConfigSources,
+        ConfigSource,
+        FileSource,
+        EnvSource,
+        CLArgSource,
+        FileFormat,
+        DataSource,
+    )
+    from .memoize import memoize_sources
+    from .validate import validate_all_configs
 
 
 __all__ = [
@@ -23,4 +29,35 @@ __all__ = [
     "FileFormat",
     "DataSource",
     "validate_all_configs",
+    "memoize_sources",
 ]
+
+# The public names are imported on first access, so that `import confz` stays cheap.
+_lazy_imports = {
+    "depends_on": ".change",
+    "BaseConfig": ".base_config",
+    "ConfigSources": ".config_source",
+    "ConfigSource": ".config_source",
+    "FileSource": ".config_source",
+    "EnvSource": ".config_source",
+    "CLArgSource": ".config_source",
+    "FileFormat": ".config_source",
+    "DataSource": ".config_source",
+    "validate_all_configs": ".validate",
+    "memoize_sources": ".memoize",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _lazy_imports:
+        # submodules, e.g. `confz.exceptions` after a plain `import confz`
+        if importlib.util.find_spec(f".{name}", __name__) is not None:
+            return importlib.import_module(f".{name}", __name__)
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    value = getattr(importlib.import_module(_lazy_imports[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
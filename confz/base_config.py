@@ -1,26 +1,440 @@
 from __future__ import annotations  # for sphinx's autodoc_type_aliases
 
+import contextvars
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import AbstractContextManager
-from typing import ClassVar, List, Optional, Any
+from functools import partial
+from os import PathLike
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ClassVar,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from pydantic import BaseModel
 
+from . import instrumentation, registry, snapshot, trusted
+from .cache import MISSING, CacheInfo, LRUCache, copy_tree, estimate_size
 from .change import SourceChangeManager
-from .config_source import ConfigSources
+from .config_source import ConfigSource, ConfigSources
 from .exceptions import ConfigException
-from .loaders import get_loader
+from .loaders import Loader, get_loader
+from .loaders.loader import digest, is_plain
+from .memoize import memoized
 
+if TYPE_CHECKING:
+    import asyncio
 
-def _load_config(config_kwargs: dict, config_sources: ConfigSources) -> dict:
+    from .watch import ConfigWatcher
+
+T = TypeVar("T")
+
+_class_locks: "weakref.WeakKeyDictionary[type, threading.RLock]"
+_class_locks = weakref.WeakKeyDictionary()
+_class_locks_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_class_lock(config_class) -> threading.RLock:
+    lock = _class_locks.get(config_class)
+    if lock is None:
+        with _class_locks_lock:
+            lock = _class_locks.setdefault(config_class, threading.RLock())
+    return lock
+
+
+def _get_layers(config_class) -> Optional[LRUCache]:
+    max_bytes = config_class.CONFIG_LAYER_CACHE_BYTES
+    if max_bytes <= 0:
+        return None
+    layers = config_class.__dict__.get("confz_layers")
+    if layers is None:
+        with _class_locks_lock:
+            layers = config_class.__dict__.get("confz_layers")
+            if layers is None:
+                layers = LRUCache(max_entries=16, max_bytes=max_bytes)
+                config_class.confz_layers = layers
+    if layers.max_bytes != max_bytes:
+        layers.configure(max_entries=16, max_bytes=max_bytes)
+    return layers
+
+
+def _get_instances(config_class) -> Optional[LRUCache]:
+    size = config_class.CONFIG_INSTANCE_CACHE_SIZE
+    if size <= 0:
+        return None
+    ttl = config_class.CONFIG_INSTANCE_CACHE_TTL
+    instances = config_class.__dict__.get("confz_instances")
+    if instances is None:
+        with _class_locks_lock:
+            instances = config_class.__dict__.get("confz_instances")
+            if instances is None:
+                instances = LRUCache(max_entries=size, max_bytes=size, ttl=ttl)
+                config_class.confz_instances = instances
+    if instances.max_entries != size or instances.ttl != ttl:
+        instances.configure(max_entries=size, max_bytes=size, ttl=ttl)
+    return instances
+
+
+class _InstanceKey(NamedTuple):
+    instances: LRUCache
+    key: str
+    fingerprint: Tuple[str, ...]
+
+
+def _get_instance_key(
+    config_class, config_sources: ConfigSources, config_kwargs: dict
+) -> Optional[_InstanceKey]:
+    # where to look up an instance created from explicit sources, if it can be cached
+    instances = _get_instances(config_class)
+    if instances is None or not is_plain(config_kwargs):
+        return None  # arbitrary objects could have equal representations
+    sources = config_sources if isinstance(config_sources, list) else [config_sources]
+    fingerprints = []
+    for config_source in sources:
+        fingerprint = get_loader(type(config_source)).fingerprint(config_source)
+        if fingerprint is None:
+            return None
+        fingerprints.append(fingerprint)
+    key = digest(sources, config_kwargs)
+    return _InstanceKey(instances, key, tuple(fingerprints))
+
+
+class _Layer(NamedTuple):
+    loader: Type[Loader]
+    data: Optional[dict]  # None if the source has to populate the merged config
+
+
+def _get_layer(
+    layers: Optional[LRUCache], config_source: ConfigSource, fingerprint: Any
+):
+    return memoized(
+        config_source, partial(_load_layer, layers, config_source, fingerprint)
+    )
+
+
+def _load_layer(
+    layers: Optional[LRUCache], config_source: ConfigSource, fingerprint: Any
+):
+    start = time.perf_counter() if instrumentation.hooks else 0.0
+    loader = get_loader(type(config_source))
+    if fingerprint is MISSING:
+        fingerprint = loader.fingerprint(config_source)
+    if fingerprint is None:
+        return _Layer(loader, None)
+
+    # the output of each source is cached as a separate layer, so that only
+    # changed sources have to be loaded again
+    data: Any = MISSING if layers is None else layers.get(fingerprint, True)
+    cache_hit = data is not MISSING
+    if not cache_hit:
+        data = {}
+        loader.populate_layer(data, config_source)
+        if layers is not None:
+            layers.put(fingerprint, True, data, estimate_size(data))
+    if start:
+        instrumentation.emit(
+            "source", start, source_type=type(config_source), cache_hit=cache_hit
+        )
+    return _Layer(loader, data)
+
+
+def _emit_merged(start: float, config_source: ConfigSource, layer: _Layer):
+    # sources without fingerprint are loaded directly into the merged config
+    phase = "source" if layer.data is None else "merge"
+    instrumentation.emit(phase, start, source_type=type(config_source))
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor  # pylint: disable=global-statement
+    with _class_locks_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(thread_name_prefix="confz-load")
+        return _executor
+
+
+def _get_layers_concurrently(
+    layers: Optional[LRUCache],
+    config_sources: List[ConfigSource],
+    fingerprints: List[Any],
+) -> Iterator[_Layer]:
+    executor = _get_executor()
+    futures = [
+        executor.submit(
+            contextvars.copy_context().run, _get_layer, layers, source, fingerprint
+        )
+        for source, fingerprint in zip(config_sources, fingerprints)
+    ]
+    try:
+        for future, source, fingerprint in zip(futures, config_sources, fingerprints):
+            # sources not picked up by the pool yet are loaded in this thread, so
+            # nested loading can not deadlock on a busy pool
+            if future.cancel():
+                yield _get_layer(layers, source, fingerprint)
+            else:
+                yield future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def _load_sources(
+    config_class,
+    config_kwargs: dict,
+    config_sources: List[ConfigSource],
+    fingerprints: Optional[List[Optional[str]]] = None,
+) -> dict:
+    layers = _get_layers(config_class)
+    fingerprints_or_missing: List[Any] = (
+        [MISSING] * len(config_sources) if fingerprints is None else fingerprints
+    )
+    if config_class.CONFIG_CONCURRENT_LOADING and len(config_sources) > 1:
+        loaded_layers: Iterator[_Layer] = _get_layers_concurrently(
+            layers, config_sources, fingerprints_or_missing
+        )
+    else:
+        loaded_layers = map(
+            partial(_get_layer, layers), config_sources, fingerprints_or_missing
+        )
+
+    # layers are merged in the declared order, also if they are loaded concurrently,
+    # and the first error in this order is raised
     config = config_kwargs.copy()
-    if isinstance(config_sources, list):
-        for config_source in config_sources:
-            loader = get_loader(type(config_source))
-            loader.populate_config(config, config_source)
+    for config_source, layer in zip(config_sources, loaded_layers):
+        start = time.perf_counter() if instrumentation.hooks else 0.0
+        if layer.data is None:
+            # the loader could modify nested dicts, which are shared with the layers
+            config = copy_tree(config)
+            layer.loader.populate_config(config, config_source)
+        else:
+            layer.loader.update_dict_recursively(config, layer.data)
+        if start:
+            _emit_merged(start, config_source, layer)
+    # Nested containers are shared with the cached layers, but fields of the instance
+    # (e.g. of type Any) could be modified. Unless sources without fingerprint are
+    # loaded, this is the only copy of the loaded data.
+    return copy_tree(config)
+
+
+class _SnapshotKey(NamedTuple):
+    folder: Union[PathLike, str]
+    name: str
+    fingerprint: str
+
+
+class _LoadedConfig(NamedTuple):
+    config: dict
+    snapshot_key: Optional[_SnapshotKey]  # where to store a snapshot once validated
+    trusted: bool  # restored from a trusted snapshot, which may skip validation
+
+
+def _load_config(
+    config_class, config_kwargs: dict, config_sources: ConfigSources
+) -> _LoadedConfig:
+    sources = config_sources if isinstance(config_sources, list) else [config_sources]
+    snapshot_dir = config_class.CONFIG_SNAPSHOT_DIR
+    if snapshot_dir is None:
+        config = _load_sources(config_class, config_kwargs, sources)
+        return _LoadedConfig(config, None, False)
+
+    fingerprints = [
+        get_loader(type(config_source)).fingerprint(config_source)
+        for config_source in sources
+    ]
+    if None in fingerprints or not is_plain(config_kwargs):
+        # keyword arguments are identified by their representation
+        snapshot.record(hit=False)
+        config = _load_sources(config_class, config_kwargs, sources, fingerprints)
+        return _LoadedConfig(config, None, False)
+
+    name = digest(config_class.__module__, config_class.__qualname__, sources)
+    fingerprint = digest(config_kwargs, fingerprints)
+    if config_class.CONFIG_SNAPSHOT_TRUSTED:
+        fingerprint = digest(fingerprint, trusted.schema_fingerprint(config_class))
+    data = snapshot.load_snapshot(snapshot_dir, name, fingerprint)
+    if data is not None:
+        return _LoadedConfig(data, None, config_class.CONFIG_SNAPSHOT_TRUSTED)
+    config = _load_sources(config_class, config_kwargs, sources, fingerprints)
+    return _LoadedConfig(config, _SnapshotKey(snapshot_dir, name, fingerprint), False)
+
+
+def _store_snapshot(config_class, key: _SnapshotKey, config: dict, instance):
+    # Trusted snapshots store the validated instance, which later loads construct
+    # without validation. Fall back to the loaded config if the instance can not be
+    # restored from JSON with exactly the same types.
+    data = trusted.dump(instance) if config_class.CONFIG_SNAPSHOT_TRUSTED else None
+    if (
+        data is None
+        or trusted.construct(config_class, data) is None
+        or not snapshot.store_snapshot(*key, data, exact=True)
+    ):
+        # a schema fingerprint added by a source must not make the config trusted
+        config = {
+            name: value for name, value in config.items() if name != trusted.SCHEMA_KEY
+        }
+        snapshot.store_snapshot(*key, config)
+
+
+async def _run_in_executor(fn: Callable[..., T], *args) -> T:
+    # imported lazily to keep the import of confz cheap
+    import asyncio  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(None, partial(context.run, fn, *args))
+
+
+def _has_async_loading(loader: Type[Loader]) -> bool:
+    return getattr(loader.apopulate_config, "__func__", None) is not getattr(
+        Loader.apopulate_config, "__func__", None
+    )
+
+
+async def _aget_layer(
+    layers: Optional[LRUCache], config_source: ConfigSource
+) -> _Layer:
+    loader = get_loader(type(config_source))
+    if not _has_async_loading(loader):
+        # fingerprinting and loading together in a single thread hop
+        return await _run_in_executor(_get_layer, layers, config_source, MISSING)
+
+    start = time.perf_counter() if instrumentation.hooks else 0.0
+    fingerprint = loader.fingerprint(config_source)
+    if fingerprint is None:
+        return _Layer(loader, None)
+    data: Any = MISSING if layers is None else layers.get(fingerprint, True)
+    cache_hit = data is not MISSING
+    if not cache_hit:
+        data = {}
+        await loader.apopulate_config(data, config_source)
+        if layers is not None:
+            layers.put(fingerprint, True, data, estimate_size(data))
+    if start:
+        instrumentation.emit(
+            "source", start, source_type=type(config_source), cache_hit=cache_hit
+        )
+    return _Layer(loader, data)
+
+
+async def _aload_sources(
+    config_class, config_kwargs: dict, config_sources: List[ConfigSource]
+) -> dict:
+    import asyncio  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+    layers = _get_layers(config_class)
+    tasks: Optional[List[asyncio.Future]] = None
+    if config_class.CONFIG_CONCURRENT_LOADING and len(config_sources) > 1:
+        tasks = [
+            asyncio.ensure_future(_aget_layer(layers, config_source))
+            for config_source in config_sources
+        ]
+
+    config = config_kwargs.copy()
+    try:
+        for idx, config_source in enumerate(config_sources):
+            if tasks is None:
+                layer = await _aget_layer(layers, config_source)
+            else:
+                layer = await tasks[idx]
+            start = time.perf_counter() if instrumentation.hooks else 0.0
+            if layer.data is None:
+                config = copy_tree(config)
+                await layer.loader.apopulate_config(config, config_source)
+            else:
+                layer.loader.update_dict_recursively(config, layer.data)
+            if start:
+                _emit_merged(start, config_source, layer)
+    finally:
+        for task in tasks or []:
+            if not task.cancel() and not task.cancelled():
+                task.exception()  # errors after the first one are not reported
+    return copy_tree(config)  # see _load_sources
+
+
+async def _aload_config(
+    config_class, config_kwargs: dict, config_sources: ConfigSources
+) -> _LoadedConfig:
+    sources = config_sources if isinstance(config_sources, list) else [config_sources]
+    if config_class.CONFIG_SNAPSHOT_DIR is not None:
+        # snapshots need all fingerprints upfront, so load synchronously in a thread
+        return await _run_in_executor(
+            _load_config, config_class, config_kwargs, sources
+        )
+    config = await _aload_sources(config_class, config_kwargs, sources)
+    return _LoadedConfig(config, None, False)
+
+
+_SINGLETON_KWARGS_ERROR = (
+    'Singleton mechanism enabled ("CONFIG_SOURCES" is defined), so keyword arguments '
+    "are not supported"
+)
+_pending_loads: "weakref.WeakKeyDictionary[type, Tuple[Any, asyncio.Future]]"
+_pending_loads = weakref.WeakKeyDictionary()
+
+
+def _store_instance(config_class, config_sources, instance, blocking: bool):
+    lock = _get_class_lock(config_class)
+    if not lock.acquire(blocking=blocking):
+        return None
+    try:
+        if config_class.CONFIG_SOURCES is not config_sources:
+            return instance  # sources changed in the meantime, e.g. in a unit test
+        if config_class.confz_instance is None:
+            config_class.confz_instance = instance
+        return config_class.confz_instance
+    finally:
+        lock.release()
+
+
+async def _acreate_singleton(config_class, config_sources):
+    instance = await config_class.confz_acreate(config_sources, {})
+    # the lock is only held shortly by other async loads, but can be held during a
+    # whole synchronous load, so wait for it in a thread if necessary
+    stored = _store_instance(config_class, config_sources, instance, blocking=False)
+    if stored is None:
+        stored = await _run_in_executor(
+            _store_instance, config_class, config_sources, instance, True
+        )
+    return stored
+
+
+async def _aload_singleton(config_class):
+    import asyncio  # pylint: disable=import-outside-toplevel,redefined-outer-name
+
+    config_sources = config_class.CONFIG_SOURCES
+    pending = _pending_loads.get(config_class)
+    if (
+        pending is not None
+        and pending[0] is config_sources
+        and pending[1].get_loop() is asyncio.get_running_loop()
+    ):
+        task = pending[1]
     else:
-        loader = get_loader(type(config_sources))
-        loader.populate_config(config, config_sources)
-    return config
+        task = asyncio.ensure_future(_acreate_singleton(config_class, config_sources))
+        _pending_loads[config_class] = (config_sources, task)
+
+        def forget(done_task: asyncio.Future):
+            pending = _pending_loads.get(config_class)
+            if pending is not None and pending[1] is done_task:
+                del _pending_loads[config_class]
+            if not done_task.cancelled():
+                done_task.exception()  # reported to the waiters
+
+        task.add_done_callback(forget)
+    # concurrent callers share a single load
+    return await asyncio.shield(task)
 
 
 # Metaclass of pydantic.BaseModel is not in __all__, so use type(BaseModel).
@@ -29,25 +443,115 @@ class BaseConfigMetaclass(type(BaseModel)):  # type: ignore
     """BaseConfig Meta Class, inheriting from the pydantic `BaseModel` MetaClass."""
 
     # pylint: disable=no-self-argument,no-member
+    def __new__(cls, cls_name, bases, namespace, **kwargs):
+        # pylint: disable=signature-differs
+        new_cls = super().__new__(cls, cls_name, bases, namespace, **kwargs)
+        if any(isinstance(base, BaseConfigMetaclass) for base in bases):
+            registry.register(new_cls)
+        return new_cls
+
+    def __setattr__(cls, name, value):
+        super().__setattr__(name, value)
+        if name == "CONFIG_SOURCES":
+            registry.invalidate()
+
+    def confz_lock(cls) -> threading.RLock:
+        """Lock guarding the singleton instance and `CONFIG_SOURCES` while they are
+        replaced. *For internal use only.*"""
+        return _get_class_lock(cls)
+
+    def confz_create(cls, config_sources: ConfigSources, kwargs: dict):
+        """Load and validate a new instance from the sources, bypassing the singleton
+        mechanism. *For internal use only.*"""
+        token = instrumentation.set_config_class(cls)
+        try:
+            if not instrumentation.hooks:
+                loaded = _load_config(cls, kwargs, config_sources)
+                instance = cls.confz_construct(loaded.config, loaded.trusted)
+            else:
+                start = time.perf_counter()
+                loaded = _load_config(cls, kwargs, config_sources)
+                instrumentation.emit("load", start)
+                start = time.perf_counter()
+                instance = cls.confz_construct(loaded.config, loaded.trusted)
+                instrumentation.emit("validate", start)
+        finally:
+            instrumentation.reset_config_class(token)
+
+        if loaded.snapshot_key is not None:
+            _store_snapshot(cls, loaded.snapshot_key, loaded.config, instance)
+        return instance
+
+    async def confz_acreate(cls, config_sources: ConfigSources, kwargs: dict):
+        """Asynchronous variant of :meth:`confz_create`. *For internal use only.*"""
+        token = instrumentation.set_config_class(cls)
+        try:
+            if not instrumentation.hooks:
+                loaded = await _aload_config(cls, kwargs, config_sources)
+                instance = cls.confz_construct(loaded.config, loaded.trusted)
+            else:
+                start = time.perf_counter()
+                loaded = await _aload_config(cls, kwargs, config_sources)
+                instrumentation.emit("load", start)
+                start = time.perf_counter()
+                instance = cls.confz_construct(loaded.config, loaded.trusted)
+                instrumentation.emit("validate", start)
+        finally:
+            instrumentation.reset_config_class(token)
+
+        if loaded.snapshot_key is not None:
+            await _run_in_executor(
+                _store_snapshot, cls, loaded.snapshot_key, loaded.config, instance
+            )
+        return instance
+
+    def confz_construct(cls, config: dict, trust: bool = False):
+        """Validate a loaded config. Trusted data (see :meth:`BaseConfig.from_trusted`)
+        carrying the schema fingerprint of the class is constructed without
+        validation instead. Data loaded from sources is never trusted, since any
+        source could add the fingerprint. *For internal use only.*"""
+        if trust:
+            instance = trusted.construct(cls, config)
+            if instance is not None:
+                return instance
+        if trusted.SCHEMA_KEY in config:
+            config = {
+                key: value for key, value in config.items() if key != trusted.SCHEMA_KEY
+            }
+        return super().__call__(**config)
+
     def __call__(cls, config_sources: Optional[ConfigSources] = None, **kwargs):
         """Called every time an instance of any BaseConfig object is created. Injects
         the config value population and singleton mechanism."""
         if config_sources is not None:
-            config = _load_config(kwargs, config_sources)
-            return super().__call__(**config)
+            instance_key = _get_instance_key(cls, config_sources, kwargs)
+            if instance_key is None:
+                return cls.confz_create(config_sources, kwargs)
+            instance = instance_key.instances.get(
+                instance_key.key, instance_key.fingerprint
+            )
+            if instance is MISSING:
+                instance = cls.confz_create(config_sources, kwargs)
+                instance_key.instances.put(
+                    instance_key.key, instance_key.fingerprint, instance, 1
+                )
+            return instance
 
         if cls.CONFIG_SOURCES is not None:  # type: ignore
             # pylint: disable=access-member-before-definition
             # pylint: disable=attribute-defined-outside-init
             if len(kwargs) > 0:
-                raise ConfigException(
-                    'Singleton mechanism enabled ("CONFIG_SOURCES" is defined), so '
-                    "keyword arguments are not supported"
-                )
-            if cls.confz_instance is None:  # type: ignore
-                config = _load_config(kwargs, cls.CONFIG_SOURCES)  # type: ignore
-                cls.confz_instance = super().__call__(**config)
-            return cls.confz_instance
+                raise ConfigException(_SINGLETON_KWARGS_ERROR)
+            instance = cls.confz_instance  # type: ignore
+            if instance is not None:
+                return instance
+            # only one thread loads the singleton, all others wait for its result
+            with _get_class_lock(cls):
+                instance = cls.confz_instance  # type: ignore
+                if instance is None:
+                    instance = cls.confz_create(cls.CONFIG_SOURCES, kwargs)
+                    cls.confz_instance = instance
+            return instance
 
         return super().__call__(**kwargs)
 
@@ -66,12 +570,141 @@ class BaseConfig(BaseModel, metaclass=BaseConfigMetaclass, frozen=True):
 
     CONFIG_SOURCES: ClassVar[Optional[ConfigSources]] = None  #: Sources to use.
 
+    CONFIG_SNAPSHOT_DIR: ClassVar[Union[PathLike, str, None]] = None
+    """Opt-in: Folder to store snapshots of the loaded config in. If a later instance
+    is created from sources with the same fingerprint (e.g. same file content, same
+    relevant environment variables and command line arguments), the config is loaded
+    from the snapshot instead of the sources, which speeds up cold starts. Requires
+    the loaders of all sources to support fingerprints, see
+    :meth:`~confz.loaders.Loader.fingerprint`. Statistics are available with
+    :func:`confz.snapshot.snapshot_info`."""
+
+    CONFIG_SNAPSHOT_TRUSTED: ClassVar[bool] = False
+    """Opt-in: Whether snapshots of `CONFIG_SNAPSHOT_DIR` store the validated config,
+    which is then constructed without validating it again, see :meth:`from_trusted`.
+    This pays off for models with custom validators or large collections, and in
+    general with pydantic v1. With pydantic v2, validating many small nested models
+    is faster than constructing them."""
+
+    CONFIG_CONCURRENT_LOADING: ClassVar[bool] = False
+    """Opt-in: Whether to load the sources of `CONFIG_SOURCES` (or `config_sources`)
+    concurrently on a thread pool, e.g. if several files are read from a slow file
+    system. The results are still merged in the declared order. Setting it on
+    :class:`BaseConfig` enables it for all config classes."""
+
+    CONFIG_LAYER_CACHE_BYTES: ClassVar[int] = 16 * 1024**2
+    """Maximum approximate size of the layers to keep per config class, i.e. of the
+    output of its sources. If a config is loaded again, only sources whose
+    fingerprint changed are loaded again, see
+    :meth:`~confz.loaders.Loader.fingerprint`. Layers of config files share the
+    parsed content with the cache of the file loader. Set to zero to not keep any
+    layers, e.g. if a singleton is only loaded once."""
+
+    CONFIG_INSTANCE_CACHE_SIZE: ClassVar[int] = 0
+    """Opt-in: Maximum number of instances created with `config_sources` as keyword
+    argument to keep per config class. If an instance is created again from the same
+    sources and keyword arguments and the fingerprints of the sources did not change
+    (e.g. same file content, see :meth:`~confz.loaders.Loader.fingerprint`), the
+    cached instance is returned instead of loading and validating the config again.
+    Cached instances are shared, so they must not be modified. Instances from
+    sources without fingerprint or from keyword arguments other than builtin values
+    (e.g. nested models) are never cached. Statistics are available with
+    :meth:`instance_cache_info`."""
+
+    CONFIG_INSTANCE_CACHE_TTL: ClassVar[Optional[float]] = None
+    """Seconds after which instances of `CONFIG_INSTANCE_CACHE_SIZE` expire, e.g. to
+    pick up changed sources which have no fingerprint of their content."""
+
     # type is ClassVar[Optional["ConfZ"]] (pydantic throws error with forward ref)
     confz_instance: ClassVar[Optional[Any]] = None  #: *for internal use only*
 
     # type is ClassVar[Optional[List["Listener"]]] (same here)
     listeners: ClassVar[Optional[List[Any]]] = None  #: *for internal use only*
 
+    # type is ClassVar[Optional[LRUCache]] (same here)
+    confz_layers: ClassVar[Optional[Any]] = None  #: *for internal use only*
+
+    # type is ClassVar[Optional[LRUCache]] (same here)
+    confz_instances: ClassVar[Optional[Any]] = None  #: *for internal use only*
+
+    @classmethod
+    async def aload(cls, config_sources: Optional[ConfigSources] = None, **kwargs):
+        """Asynchronous variant of the constructor, which does not block the event loop
+        while the sources are loaded. Loaders run in the default executor of the loop
+        unless they support asynchronous loading natively, see
+        :meth:`~confz.loaders.Loader.apopulate_config`. The singleton mechanism is
+        shared with the constructor and concurrent calls load the singleton only once.
+
+        :param config_sources: Sources to use instead of `CONFIG_SOURCES`, see
+            constructor.
+        :param kwargs: Keyword arguments, see constructor.
+        :return: The config instance.
+        """
+        if config_sources is not None:
+            instance_key = _get_instance_key(cls, config_sources, kwargs)
+            if instance_key is None:
+                return await cls.confz_acreate(config_sources, kwargs)
+            instance = instance_key.instances.get(
+                instance_key.key, instance_key.fingerprint
+            )
+            if instance is MISSING:
+                instance = await cls.confz_acreate(config_sources, kwargs)
+                instance_key.instances.put(
+                    instance_key.key, instance_key.fingerprint, instance, 1
+                )
+            return instance
+        if cls.CONFIG_SOURCES is None:
+            return cls(**kwargs)
+        if len(kwargs) > 0:
+            raise ConfigException(_SINGLETON_KWARGS_ERROR)
+        instance = cls.confz_instance
+        if instance is not None:
+            return instance
+        return await _aload_singleton(cls)
+
+    @classmethod
+    def instance_cache_info(cls) -> CacheInfo:
+        """Statistics of the instance cache of this class, see
+        :attr:`CONFIG_INSTANCE_CACHE_SIZE`.
+
+        :return: Hits, misses and size of the cache.
+        """
+        instances = cls.__dict__.get("confz_instances")
+        if instances is None:
+            instances = LRUCache(max_entries=0, max_bytes=0)
+        return instances.info()
+
+    @classmethod
+    def instance_cache_clear(cls):
+        """Remove all cached instances of this class and reset the statistics."""
+        instances = cls.__dict__.get("confz_instances")
+        if instances is not None:
+            instances.clear()
+
+    @classmethod
+    def from_trusted(cls, data: dict):
+        """Create an instance from data of :meth:`trusted_dump`, e.g. handed over by a
+        parent process. If the data carries the schema fingerprint of this class, the
+        instance is constructed without validating the data again, which skips
+        custom validators and the checks of large collections. Otherwise, the data
+        is validated as usual. Neither sources nor the singleton mechanism are
+        involved.
+
+        :param data: Data of :meth:`trusted_dump`.
+        :return: The config instance.
+        """
+        return cls.confz_construct(data, trust=True)
+
+    def trusted_dump(self) -> Optional[dict]:
+        """Dump the validated config into data for :meth:`from_trusted`. Nested models
+        become dicts and the data carries a fingerprint of the JSON schema of this
+        class, so it is only trusted by the same class with the same schema. Only
+        pass the data to code which trusts its origin.
+
+        :return: The data or `None` if the class has no JSON schema.
+        """
+        return trusted.dump(self)
+
     @classmethod
     def change_config_sources(
         cls, config_sources: ConfigSources
@@ -84,3 +717,35 @@ class BaseConfig(BaseModel, metaclass=BaseConfigMetaclass, frozen=True):
         :return: Context manager for change of config sources.
         """
         return SourceChangeManager(cls, config_sources)
+
+    @classmethod
+    def watch_config_sources(
+        cls,
+        *,
+        debounce: float = 0.5,
+        min_interval: float = 1.0,
+        poll_interval: float = 1.0,
+        use_inotify: Optional[bool] = None,
+    ) -> ConfigWatcher:
+        """Watch the files of the `CONFIG_SOURCES` class variable and reload the
+        singleton whenever they change, see :class:`~confz.watch.ConfigWatcher`. The
+        watcher can be used as context manager or be started explicitly.
+
+        :param debounce: Seconds without further changes before a reload starts.
+        :param min_interval: Minimum seconds between two reloads.
+        :param poll_interval: Seconds between checks if files are polled.
+        :param use_inotify: Whether to use inotify instead of polling. Per default,
+            inotify is used on Linux and polling otherwise.
+        :return: The (not yet started) watcher.
+        """
+        from .watch import (  # pylint: disable=import-outside-toplevel
+            ConfigWatcher,  # pylint: disable=redefined-outer-name
+        )
+
+        return ConfigWatcher(
+            cls,
+            debounce=debounce,
+            min_interval=min_interval,
+            poll_interval=poll_interval,
+            use_inotify=use_inotify,
+        )
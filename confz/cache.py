@@ -0,0 +1,147 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, NamedTuple, Optional, Tuple
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a cache, similar to :func:`functools.lru_cache`."""
+
+    hits: int  #: Number of lookups served from the cache.
+    misses: int  #: Number of lookups which had to (re-)load the data.
+    entries: int  #: Number of entries currently in the cache.
+    max_entries: int  #: Maximum number of entries.
+    bytes: int  #: Approximate size of all cached entries.
+    max_bytes: int  #: Maximum approximate size of all cached entries.
+
+
+MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe LRU cache with a fingerprint per entry and a byte budget. Entries
+    whose fingerprint does not match anymore count as miss and are replaced. With a
+    `ttl`, entries also expire that many seconds after they were stored."""
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[Hashable, Any, int, float]]" = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, fingerprint: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != fingerprint:
+                self._misses += 1
+                return MISSING
+            if self.ttl is not None and time.monotonic() - entry[3] > self.ttl:
+                self._remove(key)
+                self._misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, fingerprint: Hashable, value: Any, size: int):
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes or self.max_entries <= 0:
+                return
+            self._entries[key] = (fingerprint, value, size, time.monotonic())
+            self._bytes += size
+            self._evict()
+
+    def configure(self, max_entries: int, max_bytes: int, ttl: Optional[float] = None):
+        with self._lock:
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            self.ttl = ttl
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = 0
+            self._misses = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                entries=len(self._entries),
+                max_entries=self.max_entries,
+                bytes=self._bytes,
+                max_bytes=self.max_bytes,
+            )
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, (_, _, size, _) = self._entries.popitem(last=False)
+            self._bytes -= size
+
+
+def copy_tree(data: Any) -> Any:
+    """Copy all containers of parsed file content, sharing the immutable leaves. This
+    is much cheaper than :func:`copy.deepcopy` for the data parsers produce. Nested
+    containers are copied iteratively, so deep data can not hit the recursion
+    limit."""
+    if isinstance(data, set):
+        return set(data)
+    if not isinstance(data, (dict, list)):
+        return data
+    root = dict(data) if isinstance(data, dict) else list(data)
+    stack = [root]
+    while stack:
+        container = stack.pop()
+        items = (
+            container.items() if isinstance(container, dict) else enumerate(container)
+        )
+        for key, value in items:
+            # replacing the values of existing keys is safe while iterating
+            if isinstance(value, dict):
+                container[key] = value = dict(value)
+                stack.append(value)
+            elif isinstance(value, list):
+                container[key] = value = list(value)
+                stack.append(value)
+            elif isinstance(value, set):
+                container[key] = set(value)
+    return root
+
+
+def estimate_size(data: Any) -> int:
+    """Approximate the memory used by parsed file content, i.e. by its containers,
+    strings and bytes. Other leaves are small or shared and not counted."""
+    size = 0
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, (str, bytes)):
+            size += sys.getsizeof(value)
+        elif isinstance(value, dict):
+            size += sys.getsizeof(value)
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            size += sys.getsizeof(value)
+            stack.extend(value)
+    return size
@@ -9,12 +9,15 @@ from typing import (
     TypeVar,
     Generic,
     Optional,
+    Tuple,
     TYPE_CHECKING,
 )
 
 from .config_source import ConfigSources
 
 if TYPE_CHECKING:
+    import asyncio
+
     from .base_config import BaseConfig
 
 
@@ -29,11 +32,13 @@ class SourceChangeManager(AbstractContextManager):
         self._backup_sources = None
 
     def __enter__(self):
-        self._backup_instance = self._config_class.confz_instance
-        self._config_class.confz_instance = None
+        # atomic for reloads, see ConfigWatcher
+        with self._config_class.confz_lock():
+            self._backup_instance = self._config_class.confz_instance
+            self._config_class.confz_instance = None
 
-        self._backup_sources = self._config_class.CONFIG_SOURCES
-        self._config_class.CONFIG_SOURCES = self._config_sources
+            self._backup_sources = self._config_class.CONFIG_SOURCES
+            self._config_class.CONFIG_SOURCES = self._config_sources
 
         if self._config_class.listeners is not None:
             for listener in self._config_class.listeners:
@@ -42,8 +47,9 @@ class SourceChangeManager(AbstractContextManager):
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        self._config_class.confz_instance = self._backup_instance
-        self._config_class.CONFIG_SOURCES = self._backup_sources
+        with self._config_class.confz_lock():
+            self._config_class.confz_instance = self._backup_instance
+            self._config_class.CONFIG_SOURCES = self._backup_sources
 
         if self._config_class.listeners is not None:
             for listener in self._config_class.listeners:
@@ -67,7 +73,15 @@ class Listener(Generic[T]):
 
         self._fn = fn
         self._instance: Optional[T] = None
-        self._backup_instances: Dict[SourceChangeManager, T] = {}
+        self._pending: Optional["asyncio.Future"] = None
+        self._backup_instances: Dict[
+            SourceChangeManager, Tuple[Optional[T], Optional["asyncio.Future"]]
+        ] = {}
+
+    @property
+    def name(self) -> str:
+        """Qualified name of the function."""
+        return getattr(self._fn, "__qualname__", repr(self._fn))
 
     @property
     def is_async(self):
@@ -77,9 +91,21 @@ class Listener(Generic[T]):
         if self.is_async:
 
             async def inner():
-                if self._instance is None:
-                    self._instance = await self._fn()
-                return self._instance
+                # imported lazily to keep the import of confz cheap
+                # pylint: disable-next=import-outside-toplevel,redefined-outer-name
+                import asyncio
+
+                if self._instance is not None:
+                    return self._instance
+                # concurrent callers share a single execution of the function
+                task = self._pending
+                if task is None or task.get_loop() is not asyncio.get_running_loop():
+                    task = asyncio.ensure_future(self._fn())
+                    task.add_done_callback(self._task_done)
+                    self._pending = task
+                instance = await asyncio.shield(task)
+                self._task_done(task)
+                return instance
 
         else:
 
@@ -90,13 +116,30 @@ class Listener(Generic[T]):
 
         return inner()
 
+    def _task_done(self, task: "asyncio.Future"):
+        if self._pending is not task:
+            return  # outdated, e.g. the listener got reset in the meantime
+        self._pending = None
+        if not task.cancelled() and task.exception() is None:
+            self._instance = task.result()
+
+    def reset(self):
+        """Invalidate the singleton, the function is executed again on next access."""
+        self._instance = None
+        self._pending = None
+
     def change_enter(self, context):
-        self._backup_instances[context] = self._instance
+        self._backup_instances[context] = (self._instance, self._pending)
         self._instance = None
+        self._pending = None
 
     def change_exit(self, context):
-        self._instance = self._backup_instances[context]
+        self._instance, self._pending = self._backup_instances[context]
         del self._backup_instances[context]
+        if self._pending is not None and self._pending.done():
+            # finished within the context, where its result was not taken over, and
+            # errors must not be restored
+            self._task_done(self._pending)
 
 
 def depends_on(*args):
@@ -25,6 +25,8 @@ class FileFormat(Enum):
 class FileSource(ConfigSource):
     """Source config for files."""
 
+    # pylint: disable=too-many-instance-attributes
+
     file: Union[PathLike, str, bytes, None] = None
     """Specify a config file directly by a path or by providing its content as
     bytes-string."""
@@ -33,8 +35,8 @@ class FileSource(ConfigSource):
     file_from_cl: Optional[Union[int, str]] = None
     """Alternatively, use this command line argument to get the file name/path. It can
     be a specific position (integer, e.g. `1`) or after a specific option (string,
-    e.g. `\\-\\-config-file`). In the latter case, the file name must follow after
-    whitespace, an equal sign between argument and value is not supported right now."""
+    e.g. `\\-\\-config-file`). In the latter case, the file name follows after
+    whitespace or an equal sign."""
     folder: Union[PathLike, str, None] = None
     """The file specified above can optionally be relative to this folder."""
     format: Optional[FileFormat] = None
@@ -46,6 +48,24 @@ class FileSource(ConfigSource):
     """True if this config file is only optional. If set to True no error is
     thrown when the file was not found or when the environment variable or the
     command line argument were not set."""
+    pure_python: bool = False
+    """Parse the file with a pure-Python parser backend, even if a faster one (e.g.
+    libyaml for YAML or orjson for JSON) is available. The result is the same, this
+    is mostly useful for debugging."""
+    select: Union[str, List[str], None] = None
+    """Only load the subtree at this key path, e.g. `services.billing`, and use it as
+    the config. Nested keys are separated by dots, or given as a list if they contain
+    dots themselves. JSON and YAML files are parsed selectively, i.e. the rest of the
+    file is skipped instead of loaded. If the key path does not exist, an error is
+    thrown unless the file is optional."""
+    select_fields: bool = False
+    """Only keep the top-level keys (of the subtree selected above) which match a field
+    name or alias of the config class being loaded. JSON and YAML files skip all other
+    keys while parsing. Note that extra keys are dropped, even if the config class
+    allows them."""
+    response_files: bool = False
+    """Replace command line arguments of the form `@file` by the lines of this file,
+    one argument per line, before looking up `file_from_cl`."""
 
 
 @dataclass
@@ -87,8 +107,7 @@ class CLArgSource(ConfigSource):
     """Source config for command line arguments. Command line arguments are
     case-sensitive. Dot-notation can be used to access nested configurations. Only
     command line arguments starting with two dashes (\\-\\-) are considered. Between
-    argument and value must be whitespace, an equal sign is not supported at the
-    moment."""
+    argument and value can be whitespace or an equal sign."""
 
     prefix: Optional[str] = None
     """Optionally, all command line arguments can have a prefix, e.g. `config_`. The
@@ -99,6 +118,9 @@ class CLArgSource(ConfigSource):
     name. The map does not need to include the two dashes at the beginning."""
     nested_separator: str = "."
     """Separator will be used in nested command line arguments."""
+    response_files: bool = False
+    """Replace arguments of the form `@file` by the lines of this file, one argument
+    per line, which allows to pass very long lists of arguments."""
 
 
 @dataclass
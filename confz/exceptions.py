@@ -9,3 +9,19 @@ class UpdateException(ConfigException):
 class FileException(ConfigException):
     """Exception which is raised if something went wrong while reading a
     configuration file."""
+
+
+class ValidateAllException(ConfigException):
+    """Exception which is raised by :func:`~confz.validate_all_configs` in parallel
+    mode if any config class or listener failed. Contains the results of all of
+    them."""
+
+    def __init__(self, results):
+        self.results = results  #: All results.
+        self.errors = [result for result in results if result.error is not None]
+        """Results with an error."""
+        details = "\n".join(
+            f"  {result.name}: {type(result.error).__name__}: {result.error}"
+            for result in self.errors
+        )
+        super().__init__(f"Loading failed for {len(self.errors)} item(s):\n{details}")
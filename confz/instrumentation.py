@@ -0,0 +1,190 @@
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+PHASES = ("load", "source", "parse", "merge", "validate")
+"""Phases reported by events: loading a whole config (`load`), loading a single source
+(`source`), parsing a file (`parse`), merging a source into the config (`merge`) and
+validating the config with pydantic (`validate`)."""
+
+
+class Event(NamedTuple):
+    """A phase of loading a config which has finished."""
+
+    phase: str  #: One of :data:`PHASES`.
+    config_class: Optional[type]  #: The config class being loaded, if any.
+    source_type: Optional[type]  #: The type of the config source, if any.
+    file: Optional[Path]  #: The file, for the `parse` phase.
+    bytes_read: Optional[int]  #: Number of bytes read, for the `parse` phase.
+    duration: float  #: Duration in seconds.
+    cache_hit: Optional[bool]  #: Whether a cache was hit, if a cache is involved.
+
+
+Hook = Callable[[Event], None]
+
+# Immutable, so it can be read without a lock. Call sites check it before measuring,
+# which keeps the overhead negligible as long as no hook is registered.
+hooks: Tuple[Hook, ...] = ()
+_lock = threading.Lock()
+_config_class: contextvars.ContextVar[Optional[type]] = contextvars.ContextVar(
+    "confz_config_class", default=None
+)
+
+
+def add_hook(hook: Hook):
+    """Register a callback, which gets an :class:`Event` for each finished phase.
+    Callbacks are called synchronously in the thread doing the work, so they should be
+    fast. Exceptions of callbacks are propagated.
+
+    :param hook: The callback.
+    """
+    global hooks  # pylint: disable=global-statement
+    with _lock:
+        hooks = hooks + (hook,)
+
+
+def remove_hook(hook: Hook):
+    """Unregister a callback registered with :func:`add_hook`.
+
+    :param hook: The callback.
+    """
+    global hooks  # pylint: disable=global-statement
+    with _lock:
+        remaining = list(hooks)
+        remaining.remove(hook)
+        hooks = tuple(remaining)
+
+
+def set_config_class(config_class: Optional[type]) -> contextvars.Token:
+    """Set the config class being loaded in the current context, which is reported in
+    events and used by :attr:`~confz.FileSource.select_fields`."""
+    return _config_class.set(config_class)
+
+
+def get_config_class() -> Optional[type]:
+    """The config class being loaded in the current context, if any."""
+    return _config_class.get()
+
+
+def reset_config_class(token: contextvars.Token):
+    _config_class.reset(token)
+
+
+def emit(
+    phase: str,
+    start: float,
+    *,
+    source_type: Optional[type] = None,
+    file: Optional[Path] = None,
+    bytes_read: Optional[int] = None,
+    cache_hit: Optional[bool] = None,
+):
+    """Report a finished phase, which started at `start` (see
+    :func:`time.perf_counter`), to all hooks."""
+    # pylint: disable=too-many-arguments
+    event = Event(
+        phase=phase,
+        config_class=_config_class.get(),
+        source_type=source_type,
+        file=file,
+        bytes_read=bytes_read,
+        duration=time.perf_counter() - start,
+        cache_hit=cache_hit,
+    )
+    for hook in hooks:
+        hook(event)
+
+
+class Histogram(NamedTuple):
+    """Distribution of durations."""
+
+    bounds: Tuple[float, ...]  #: Upper bounds of the buckets in seconds.
+    counts: Tuple[int, ...]  #: Number of durations per bucket, plus one for larger.
+    total_count: int  #: Total number of durations.
+    total_duration: float  #: Sum of all durations in seconds.
+
+
+class Recorder:
+    """A hook aggregating events into counters and duration histograms per phase.
+    Register it with :func:`add_hook` or use it as context manager::
+
+        with Recorder() as recorder:
+            validate_all_configs()
+        print(recorder.counters(), recorder.histograms()["load"])
+
+    :param bounds: Upper bounds of the histogram buckets in seconds.
+    """
+
+    DEFAULT_BOUNDS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_BOUNDS):
+        self._bounds = tuple(sorted(bounds))
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._buckets: Dict[str, List[int]] = {}
+        self._totals: Dict[str, float] = {}
+
+    def __call__(self, event: Event):
+        phase = event.phase
+        bucket = bisect_left(self._bounds, event.duration)
+        with self._lock:
+            counters = self._counters
+            counters[phase] = counters.get(phase, 0) + 1
+            if event.cache_hit is not None:
+                key = (
+                    f"{phase}.cache_hits"
+                    if event.cache_hit
+                    else f"{phase}.cache_misses"
+                )
+                counters[key] = counters.get(key, 0) + 1
+            if event.bytes_read is not None:
+                key = f"{phase}.bytes_read"
+                counters[key] = counters.get(key, 0) + event.bytes_read
+            if phase not in self._buckets:
+                self._buckets[phase] = [0] * (len(self._bounds) + 1)
+                self._totals[phase] = 0.0
+            self._buckets[phase][bucket] += 1
+            self._totals[phase] += event.duration
+
+    def counters(self) -> Dict[str, int]:
+        """Counters, e.g. `{"parse": 3, "parse.cache_hits": 2, "parse.cache_misses": 1,
+        "parse.bytes_read": 1024}`.
+
+        :return: Number of events per phase, number of cache hits and misses per phase
+            and number of bytes read per phase.
+        """
+        with self._lock:
+            return dict(self._counters)
+
+    def histograms(self) -> Dict[str, Histogram]:
+        """Duration histograms per phase.
+
+        :return: A histogram for each phase with at least one event.
+        """
+        with self._lock:
+            return {
+                phase: Histogram(
+                    bounds=self._bounds,
+                    counts=tuple(buckets),
+                    total_count=sum(buckets),
+                    total_duration=self._totals[phase],
+                )
+                for phase, buckets in self._buckets.items()
+            }
+
+    def reset(self):
+        """Reset all counters and histograms."""
+        with self._lock:
+            self._counters = {}
+            self._buckets = {}
+            self._totals = {}
+
+    def __enter__(self) -> "Recorder":
+        add_hook(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        remove_hook(self)
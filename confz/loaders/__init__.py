@@ -1,4 +1,5 @@
 from .loader import Loader
+from .parsers import Parser, register_parser, get_parser
 from .register import register_loader, get_loader
 
 
@@ -6,4 +7,7 @@ __all__ = [
     "Loader",
     "register_loader",
     "get_loader",
+    "Parser",
+    "register_parser",
+    "get_parser",
 ]
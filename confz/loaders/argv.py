@@ -0,0 +1,73 @@
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+
+class ParsedArgv(NamedTuple):
+    """Index of the command line arguments, created once per distinct `sys.argv`."""
+
+    args: Tuple[str, ...]
+    """All arguments, with response files (`@file`) expanded if requested."""
+    options: Dict[str, str]
+    """Options in the form `--name value` or `--name=value`, without the leading
+    dashes, in the order of their first occurrence. For repeated options, the value
+    of the last occurrence wins."""
+    values: Dict[str, Optional[str]]
+    """Value after the first occurrence of each argument, or after the equal sign for
+    options in the form `--name=value`. `None` if there is no value."""
+
+
+# by whether response files are expanded
+_cache: Dict[bool, Tuple[Tuple[str, ...], ParsedArgv]] = {}
+
+
+def _expand_response_files(args: Sequence[str], seen: Set[Path]) -> List[str]:
+    expanded = []
+    for arg in args:
+        path = Path(arg[1:]) if arg.startswith("@") else None
+        if path is None or not path.is_file() or path.resolve() in seen:
+            expanded.append(arg)
+            continue
+        lines = path.read_text(encoding="utf-8").splitlines()
+        expanded.extend(
+            _expand_response_files(
+                [line for line in lines if line.strip() != ""],
+                seen | {path.resolve()},
+            )
+        )
+    return expanded
+
+
+def _parse(argv: Tuple[str, ...], response_files: bool) -> ParsedArgv:
+    args = argv
+    if response_files:
+        args = tuple(argv[:1]) + tuple(_expand_response_files(argv[1:], set()))
+    options: Dict[str, str] = {}
+    values: Dict[str, Optional[str]] = {}
+    for idx, arg in enumerate(args):
+        value: Optional[str]
+        if arg.startswith("-") and "=" in arg:
+            name, value = arg.split("=", 1)
+        else:
+            name, value = arg, args[idx + 1] if idx + 1 < len(args) else None
+        values.setdefault(name, value)
+
+        if idx > 0 and name.startswith("--") and value is not None:
+            options[name[2:]] = value
+    return ParsedArgv(args=args, options=options, values=values)
+
+
+def parse_argv(response_files: bool = False) -> ParsedArgv:
+    """Parse `sys.argv` into an index of options and values. The result is cached
+    until `sys.argv` changes.
+
+    :param response_files: Whether arguments of the form `@file` are replaced by the
+        lines of this file if it exists, one argument per line.
+    :return: The parsed command line arguments.
+    """
+    argv = tuple(sys.argv)
+    cache = _cache.get(response_files)
+    if cache is None or cache[0] != argv:
+        cache = (argv, _parse(argv, response_files))
+        _cache[response_files] = cache
+    return cache[1]
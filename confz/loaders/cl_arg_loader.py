@@ -1,31 +1,36 @@
-import sys
+from typing import Dict, Optional
 
 from confz.config_source import CLArgSource
-from .loader import Loader
+from .argv import parse_argv
+from .loader import Loader, digest
 
 
 class CLArgLoader(Loader):
     """Config loader for command line arguments."""
 
     @classmethod
-    def populate_config(cls, config: dict, config_source: CLArgSource):
+    def _get_cl_args(cls, config_source: CLArgSource) -> Dict[str, str]:
         cl_args = {}
-        for idx, cl_arg in enumerate(sys.argv[1:]):
-            if cl_arg.startswith("--") and idx + 2 < len(sys.argv):
-                cl_name = cl_arg[2:]
-                cl_value = sys.argv[idx + 2]
+        options = parse_argv(config_source.response_files).options
+        for cl_name, cl_value in options.items():
+            if config_source.prefix is not None:
+                if not cl_name.startswith(config_source.prefix):
+                    continue
+                cl_name = cl_name[len(config_source.prefix) :]
 
-                if config_source.prefix is not None:
-                    if not cl_name.startswith(config_source.prefix):
-                        continue
-                    cl_name = cl_name[len(config_source.prefix) :]
+            if config_source.remap is not None and cl_name in config_source.remap:
+                cl_name = config_source.remap[cl_name]
 
-                if config_source.remap is not None and cl_name in config_source.remap:
-                    cl_name = config_source.remap[cl_name]
+            cl_args[cl_name] = cl_value
+        return cl_args
 
-                cl_args[cl_name] = cl_value
+    @classmethod
+    def fingerprint(cls, config_source: CLArgSource) -> Optional[str]:
+        return digest(config_source, list(cls._get_cl_args(config_source).items()))
 
+    @classmethod
+    def populate_config(cls, config: dict, config_source: CLArgSource):
         cl_args = cls.transform_nested_dicts(
-            cl_args, separator=config_source.nested_separator
+            cls._get_cl_args(config_source), separator=config_source.nested_separator
         )
         cls.update_dict_recursively(config, cl_args)
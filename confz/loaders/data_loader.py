@@ -1,5 +1,7 @@
+from typing import Optional
+
 from confz.config_source import DataSource
-from .loader import Loader
+from .loader import Loader, digest, is_plain
 
 
 class DataLoader(Loader):
@@ -8,3 +10,10 @@ class DataLoader(Loader):
     @classmethod
     def populate_config(cls, config: dict, config_source: DataSource):
         cls.update_dict_recursively(config, config_source.data)
+
+    @classmethod
+    def fingerprint(cls, config_source: DataSource) -> Optional[str]:
+        # arbitrary objects could have equal representations for different values
+        if not is_plain(config_source.data):
+            return None
+        return digest(config_source)
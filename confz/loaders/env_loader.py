@@ -1,83 +1,268 @@
+import functools
+import hashlib
 import io
 import os
-from typing import Dict, Optional, Any
-
-from dotenv import dotenv_values
+import stat
+from os import PathLike
+from pathlib import Path
+from types import MappingProxyType
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
+from confz.cache import MISSING, CacheInfo, LRUCache
 from confz.config_source import EnvSource
-from .loader import Loader
+from .loader import Loader, digest
+
+_dotenv_cache = LRUCache(max_entries=128, max_bytes=16 * 1024 * 1024)
+
+
+def _transform_name(name: str) -> str:
+    return name.lower().replace("-", "_")
+
+
+class _EnvPlan(NamedTuple):
+    """Pre-compiled selection of environment variables for an :class:`EnvSource`."""
+
+    prefix: Optional[str]
+    allow: Optional[FrozenSet[str]]  # None if all variables are allowed
+    deny: FrozenSet[str]
+    remap: Mapping[str, str]
+
+    def allows(self, var_name: str) -> bool:
+        if self.allow is not None and var_name not in self.allow:
+            return False
+        return var_name not in self.deny
+
+
+class _EnvIndex(NamedTuple):
+    """Environment variables starting with a prefix, in the order of the environment."""
+
+    entries: List[Tuple[str, str]]  # variable and transformed name without prefix
+    positions: Dict[str, List[int]]  # positions of the entries by transformed name
+
+
+class _EnvSnapshot:
+    """Copy of the environment, shared by all sources until the environment changes."""
+
+    def __init__(self):
+        # copied first, so a concurrent change is detected by the next check
+        raw = getattr(os.environ, "_data", None)
+        self._raw = dict(raw) if isinstance(raw, dict) else None
+        self.env: Dict[str, str] = dict(os.environ)
+        self._indexes: Dict[str, _EnvIndex] = {}
+
+    def is_current(self) -> bool:
+        # Comparing the encoded variables of os.environ is much cheaper than copying
+        # them, which decodes every key and value. Without access to them, e.g. if
+        # os.environ was replaced, the environment is copied every time.
+        return self._raw is not None and getattr(os.environ, "_data", None) == self._raw
+
+    def index(self, prefix: str) -> _EnvIndex:
+        index = self._indexes.get(prefix)
+        if index is None:
+            index = _EnvIndex([], {})
+            for env_var in self.env:
+                if env_var.startswith(prefix):
+                    var_name = _transform_name(env_var[len(prefix) :])
+                    index.positions.setdefault(var_name, []).append(len(index.entries))
+                    index.entries.append((env_var, var_name))
+            self._indexes[prefix] = index
+        return index
+
+    def select(self, plan: _EnvPlan) -> Dict[str, Any]:
+        index = self.index(plan.prefix or "")
+        entries: Iterable[Tuple[str, str]] = index.entries
+        if plan.allow is not None:
+            # only visit the allowed variables, still in the order of the environment
+            # to resolve conflicting names the same way
+            positions = sorted(
+                position
+                for var_name in plan.allow
+                for position in index.positions.get(var_name, ())
+            )
+            entries = [index.entries[position] for position in positions]
+        return {
+            plan.remap.get(var_name, var_name): self.env[env_var]
+            for env_var, var_name in entries
+            if var_name not in plan.deny
+        }
+
+
+_snapshot: Optional[_EnvSnapshot] = None
+
+
+class _DotEnv(NamedTuple):
+    """Parsed .env file."""
+
+    values: Dict[str, Optional[str]]
+    snapshot: Optional[_EnvSnapshot]  # environment used for interpolation, if any
+
+
+def _get_snapshot() -> _EnvSnapshot:
+    global _snapshot  # pylint: disable=global-statement
+    snapshot = _snapshot
+    if snapshot is None or not snapshot.is_current():
+        snapshot = _snapshot = _EnvSnapshot()
+    return snapshot
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_plan(
+    allow_all: bool,
+    allow: Optional[Tuple[str, ...]],
+    deny: Optional[Tuple[str, ...]],
+    prefix: Optional[str],
+    remap: Optional[Tuple[Tuple[str, str], ...]],
+) -> _EnvPlan:
+    if allow_all:
+        allow_set = None
+    else:
+        allow_set = frozenset(_transform_name(var) for var in allow or ())
+    return _EnvPlan(
+        prefix=prefix,
+        allow=allow_set,
+        deny=frozenset(_transform_name(var) for var in deny or ()),
+        remap=MappingProxyType(
+            {_transform_name(key): value for key, value in remap or ()}
+        ),
+    )
 
 
 class EnvLoader(Loader):
     """Config loader for environment variables."""
 
     @classmethod
-    def _transform_name(cls, name: str):
-        return name.lower().replace("-", "_")
+    def _get_plan(cls, config_source: EnvSource) -> _EnvPlan:
+        return _compile_plan(
+            config_source.allow_all,
+            None if config_source.allow is None else tuple(config_source.allow),
+            None if config_source.deny is None else tuple(config_source.deny),
+            config_source.prefix,
+            None if config_source.remap is None else tuple(config_source.remap.items()),
+        )
 
     @classmethod
-    def _transform_remap(
-        cls, map_in: Optional[Dict[str, str]]
-    ) -> Optional[Dict[str, str]]:
-        if map_in is None:
-            return None
-
-        map_out = {}
-        for key, value in map_in.items():
-            map_out[cls._transform_name(key)] = value
-        return map_out
+    def refresh(cls):
+        """Drop the shared snapshot of the environment. Changes of `os.environ` are
+        detected automatically, so this is only necessary if the environment is
+        changed in other ways, e.g. by C extensions calling `setenv`."""
+        global _snapshot  # pylint: disable=global-statement
+        _snapshot = None
 
     @classmethod
-    def _check_allowance(cls, var_name: str, config_source: EnvSource) -> bool:
-        if not config_source.allow_all:
-            if config_source.allow is None:
-                return False
+    def _get_env_vars(cls, config_source: EnvSource) -> Dict[str, Any]:
+        plan = cls._get_plan(config_source)
+        if plan.allow is not None and len(plan.allow) == 0:
+            return {}
 
-            allow_list = [cls._transform_name(var) for var in config_source.allow]
-            if var_name not in allow_list:
-                return False
+        snapshot = _get_snapshot()
+        if config_source.file is None:
+            return snapshot.select(plan)
 
-        if config_source.deny is not None:
-            deny_list = [cls._transform_name(var) for var in config_source.deny]
-            if var_name in deny_list:
-                return False
-
-        return True
-
-    @classmethod
-    def populate_config(cls, config: dict, config_source: EnvSource):
-        remap = cls._transform_remap(config_source.remap)
-
-        origin_env_vars: Dict[str, Any] = dict(os.environ)
-        if config_source.file is not None:
-            if not isinstance(config_source.file, bytes):
-                origin_env_vars = {
-                    **dotenv_values(config_source.file),
-                    **origin_env_vars,
-                }
-            else:
-                byte_stream = io.BytesIO(config_source.file)
-                stream = io.TextIOWrapper(byte_stream, encoding="utf-8")
-                origin_env_vars = {**dotenv_values(None, stream), **origin_env_vars}
+        # variables of .env files are merged in, so all of them are visited
+        file_env_vars = cls._load_dotenv(config_source.file, snapshot)
+        origin_env_vars: Dict[str, Any] = {**file_env_vars, **snapshot.env}
 
         env_vars = {}
-        for env_var in origin_env_vars:
+        for env_var, value in origin_env_vars.items():
             var_name = env_var
-            if config_source.prefix is not None:
-                if not var_name.startswith(config_source.prefix):
+            if plan.prefix is not None:
+                if not var_name.startswith(plan.prefix):
                     continue
-                var_name = var_name[len(config_source.prefix) :]
+                var_name = var_name[len(plan.prefix) :]
 
-            var_name = cls._transform_name(var_name)
-            if not cls._check_allowance(var_name, config_source):
+            var_name = _transform_name(var_name)
+            if not plan.allows(var_name):
                 continue
 
-            if remap is not None and var_name in remap:
-                var_name = remap[var_name]
+            env_vars[plan.remap.get(var_name, var_name)] = value
+        return env_vars
+
+    @classmethod
+    def _parse_dotenv(cls, data: bytes, snapshot: _EnvSnapshot) -> _DotEnv:
+        # imported lazily to keep the import of confz cheap
+        # pylint: disable-next=import-outside-toplevel
+        from dotenv import dotenv_values
+
+        stream = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8")
+        values = dotenv_values(None, stream)
+        # values are interpolated with the environment, e.g. ${HOME}
+        return _DotEnv(values, snapshot if b"$" in data else None)
+
+    @classmethod
+    def _load_dotenv(
+        cls, file: Union[bytes, PathLike, str], snapshot: _EnvSnapshot
+    ) -> Dict[str, Optional[str]]:
+        if isinstance(file, bytes):
+            key: Tuple[Any, ...] = ("bytes", hashlib.sha256(file).hexdigest())
+            fingerprint: Tuple[Any, ...] = ()
+        else:
+            file_path = Path(file)
+            try:
+                stat_result = file_path.stat()
+                key = ("file", str(file_path.resolve()))
+            except OSError:
+                return {}  # missing files are skipped, as by python-dotenv
+            if not stat.S_ISREG(stat_result.st_mode):
+                return {}
+            fingerprint = (
+                stat_result.st_mtime_ns,
+                stat_result.st_size,
+                stat_result.st_ino,
+            )
+
+        dotenv = _dotenv_cache.get(key, fingerprint)
+        if dotenv is MISSING or dotenv.snapshot not in (None, snapshot):
+            data = file if isinstance(file, bytes) else file_path.read_bytes()
+            dotenv = cls._parse_dotenv(data, snapshot)
+            _dotenv_cache.put(key, fingerprint, dotenv, len(data))
+        return dotenv.values
+
+    @classmethod
+    def cache_info(cls) -> CacheInfo:
+        """Statistics of the process-wide cache of parsed .env files.
+
+        :return: Hits, misses and size of the cache.
+        """
+        return _dotenv_cache.info()
+
+    @classmethod
+    def cache_clear(cls):
+        """Remove all entries from the cache of parsed .env files and reset its
+        statistics."""
+        _dotenv_cache.clear()
+
+    @classmethod
+    def configure_cache(cls, max_entries: int = 128, max_bytes: int = 16 * 1024**2):
+        """Configure the size of the process-wide cache of parsed .env files. Files
+        are cached by their resolved path together with their modification time, size
+        and inode, byte strings by a hash of their content. Files using interpolation
+        are parsed again once the environment changes. The least recently used
+        entries are evicted first.
+
+        :param max_entries: Maximum number of cached files. Set to zero to disable the
+            cache.
+        :param max_bytes: Maximum total size of all cached files.
+        """
+        _dotenv_cache.configure(max_entries, max_bytes)
 
-            env_vars[var_name] = origin_env_vars[env_var]
+    @classmethod
+    def fingerprint(cls, config_source: EnvSource) -> Optional[str]:
+        return digest(config_source, list(cls._get_env_vars(config_source).items()))
 
+    @classmethod
+    def populate_config(cls, config: dict, config_source: EnvSource):
         env_vars = cls.transform_nested_dicts(
-            env_vars, separator=config_source.nested_separator
+            cls._get_env_vars(config_source), separator=config_source.nested_separator
         )
         cls.update_dict_recursively(config, env_vars)
@@ -1,17 +1,42 @@
 from contextlib import contextmanager
+import hashlib
 import io
-import json
 import os
-import sys
+import time
 from pathlib import Path
-from typing import Iterator, Optional, TextIO, Union
-
-import toml
-import yaml
+from typing import Any, FrozenSet, Iterator, Optional, TextIO, Tuple, Union
 
+from confz import instrumentation
+from confz.cache import MISSING, CacheInfo, LRUCache, copy_tree
 from confz.config_source import FileSource, FileFormat
 from confz.exceptions import FileException
-from .loader import Loader
+from .argv import parse_argv
+from .loader import Loader, digest
+from .parsers import get_parser, select_subtree
+
+
+_file_cache = LRUCache(max_entries=128, max_bytes=64 * 1024 * 1024)
+_digest_cache = LRUCache(max_entries=1024, max_bytes=1024)
+
+_Selection = Tuple[Tuple[str, ...], Optional[FrozenSet[str]]]
+
+
+def _field_keys(config_class: type) -> FrozenSet[str]:
+    # all keys which can populate a field, i.e. names and aliases
+    keys = set()
+    fields = getattr(config_class, "model_fields", None)
+    if fields is None:  # pragma: no cover (pydantic v1)
+        fields = getattr(config_class, "__fields__", {})
+    for name, field in fields.items():
+        keys.add(name)
+        aliases = [getattr(field, "alias", None)]
+        validation_alias = getattr(field, "validation_alias", None)
+        aliases.extend(getattr(validation_alias, "choices", [validation_alias]))
+        for alias in aliases:
+            alias = getattr(alias, "path", [alias])[0]  # first key of an AliasPath
+            if isinstance(alias, str):
+                keys.add(alias)
+    return frozenset(keys)
 
 
 class FileLoader(Loader):
@@ -30,29 +55,28 @@ class FileLoader(Loader):
                 )
             file_path = Path(os.environ[config_source.file_from_env])
         elif config_source.file_from_cl is not None:
+            argv = parse_argv(config_source.response_files)
             if isinstance(config_source.file_from_cl, int):
                 try:
-                    file_path = Path(sys.argv[config_source.file_from_cl])
+                    file_path = Path(argv.args[config_source.file_from_cl])
                 except IndexError as e:
                     raise FileException(
                         f"Command-line argument number {config_source.file_from_cl} "
                         f"is not set."
                     ) from e
             else:
-                try:
-                    idx = sys.argv.index(config_source.file_from_cl)
-                except ValueError as e:
+                if config_source.file_from_cl not in argv.values:
                     raise FileException(
                         f"Command-line argument '{config_source.file_from_cl}' "
                         f"not found."
-                    ) from e
-                try:
-                    file_path = Path(sys.argv[idx + 1])
-                except IndexError as e:
+                    )
+                file_value = argv.values[config_source.file_from_cl]
+                if file_value is None:
                     raise FileException(
                         f"Command-line argument '{config_source.file_from_cl}' is not "
                         f"set."
-                    ) from e
+                    )
+                file_path = Path(file_value)
         else:
             raise FileException("No file source set.")
 
@@ -85,21 +109,56 @@ class FileLoader(Loader):
 
         return suffix_format
 
+    @classmethod
+    def yaml_backend(cls, pure_python: bool = False) -> str:
+        """The backend used to parse YAML files. The C implementation of libyaml is
+        used whenever PyYAML was built with it, since it is considerably faster than
+        the pure-Python implementation. Both are safe loaders and produce the same
+        result.
+
+        :param pure_python: Whether the pure-Python implementation is enforced, see
+            :attr:`~confz.FileSource.pure_python`.
+        :return: `"libyaml"` or `"pyyaml"`, unless another backend was registered with
+            :func:`~confz.loaders.register_parser`.
+        """
+        return get_parser(FileFormat.YAML, pure_python).name
+
     @classmethod
     def _parse_stream(
         cls,
         stream: Union[TextIO],
         file_format: FileFormat,
+        pure_python: bool = False,
+        selection: _Selection = ((), None),
     ) -> dict:
-        if file_format == FileFormat.YAML:
-            file_content = yaml.load(stream, Loader=yaml.SafeLoader)
-        elif file_format == FileFormat.JSON:
-            file_content = json.load(stream)
-        elif file_format == FileFormat.TOML:
-            file_content = toml.load(stream)
+        parser = get_parser(file_format, pure_python)
+        path, keys = selection
+        if not path and keys is None:
+            return parser.parse(stream)
+        try:
+            if parser.select is not None:
+                return parser.select(stream, path, keys)
+            return select_subtree(parser.parse(stream), path, keys)
+        except KeyError as e:
+            raise FileException(
+                f"Key path '{'.'.join(path)}' not found in config file."
+            ) from e
+
+    @classmethod
+    def _get_selection(cls, config_source: FileSource) -> _Selection:
+        select = config_source.select
+        if select is None:
+            path: Tuple[str, ...] = ()
+        elif isinstance(select, str):
+            path = tuple(select.split("."))
         else:
-            raise FileException(f"Unknown file format {file_format}.")
-        return file_content
+            path = tuple(select)
+
+        keys = None
+        config_class = instrumentation.get_config_class()
+        if config_source.select_fields and config_class is not None:
+            keys = _field_keys(config_class)
+        return path, keys
 
     @classmethod
     @contextmanager
@@ -111,6 +170,114 @@ class FileLoader(Loader):
         with stream:
             yield stream
 
+    @classmethod
+    def _load_file(
+        cls,
+        file_path: Path,
+        file_format: FileFormat,
+        config_source: FileSource,
+        selection: _Selection = ((), None),
+    ) -> Any:
+        file_encoding = config_source.encoding
+        try:
+            stat_result = file_path.stat()
+            key = (
+                str(file_path.resolve()),
+                file_format,
+                file_encoding,
+                config_source.pure_python,
+                selection,
+            )
+        except OSError as e:
+            raise FileException(f"Could not open config file '{file_path}'.") from e
+
+        start = time.perf_counter() if instrumentation.hooks else 0.0
+        fingerprint = (stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino)
+        cached = _file_cache.get(key, fingerprint)
+        if cached is not MISSING:
+            if start:
+                instrumentation.emit(
+                    "parse",
+                    start,
+                    source_type=type(config_source),
+                    file=file_path,
+                    bytes_read=0,
+                    cache_hit=True,
+                )
+            return cached
+
+        with cls._create_stream(file_path, file_encoding) as file_stream:
+            file_content = cls._parse_stream(
+                file_stream, file_format, config_source.pure_python, selection
+            )
+        _file_cache.put(key, fingerprint, file_content, stat_result.st_size)
+        if start:
+            instrumentation.emit(
+                "parse",
+                start,
+                source_type=type(config_source),
+                file=file_path,
+                bytes_read=stat_result.st_size,
+                cache_hit=False,
+            )
+        return file_content
+
+    @classmethod
+    def _file_digest(cls, file_path: Path) -> str:
+        stat_result = file_path.stat()
+        key = str(file_path.resolve())
+        fingerprint = (stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino)
+        file_digest = _digest_cache.get(key, fingerprint)
+        if file_digest is MISSING:
+            file_digest = hashlib.sha256(file_path.read_bytes()).hexdigest()
+            _digest_cache.put(key, fingerprint, file_digest, 1)
+        return file_digest
+
+    @classmethod
+    def fingerprint(cls, config_source: FileSource) -> Optional[str]:
+        # the selected keys depend on the fields of the config class being loaded,
+        # sorted since the order of sets differs between processes
+        path, keys = cls._get_selection(config_source)
+        selection = (path, None if keys is None else sorted(keys))
+        if isinstance(config_source.file, bytes):
+            return digest(config_source, selection)
+        try:
+            file_path = cls._get_filename(config_source)
+            file_digest = cls._file_digest(file_path)
+            return digest(config_source, file_path, file_digest, selection)
+        except (FileException, OSError):
+            if config_source.optional:
+                return digest(config_source, None)
+            return None
+
+    @classmethod
+    def cache_info(cls) -> CacheInfo:
+        """Statistics of the process-wide cache of parsed config files.
+
+        :return: Hits, misses and size of the cache.
+        """
+        return _file_cache.info()
+
+    @classmethod
+    def cache_clear(cls):
+        """Remove all entries from the cache of parsed config files and reset its
+        statistics."""
+        _file_cache.clear()
+
+    @classmethod
+    def configure_cache(cls, max_entries: int = 128, max_bytes: int = 64 * 1024**2):
+        """Configure the size of the process-wide cache of parsed config files. Parsed
+        files are cached by their resolved path, format and encoding together with
+        their modification time, size and inode, so a changed file is always parsed
+        again. The least recently used entries are evicted first.
+
+        :param max_entries: Maximum number of cached files. Set to zero to disable the
+            cache.
+        :param max_bytes: Maximum total size of all cached files, measured by their
+            size on disk.
+        """
+        _file_cache.configure(max_entries, max_bytes)
+
     @classmethod
     def _populate_config_from_bytes(
         cls, config: dict, data: bytes, config_source: FileSource
@@ -120,17 +287,39 @@ class FileLoader(Loader):
                 "The format needs to be defined if the "
                 "configuration is passed as byte-string"
             )
+        start = time.perf_counter() if instrumentation.hooks else 0.0
         byte_stream = io.BytesIO(data)
         text_stream = io.TextIOWrapper(byte_stream, encoding=config_source.encoding)
-        file_content = cls._parse_stream(text_stream, config_source.format)
+        file_content = cls._parse_stream(
+            text_stream,
+            config_source.format,
+            config_source.pure_python,
+            cls._get_selection(config_source),
+        )
+        if start:
+            instrumentation.emit(
+                "parse", start, source_type=type(config_source), bytes_read=len(data)
+            )
         cls.update_dict_recursively(config, file_content)
 
     @classmethod
     def populate_config(cls, config: dict, config_source: FileSource):
+        cls._populate_config(config, config_source, shared=False)
+
+    @classmethod
+    def populate_layer(cls, config: dict, config_source: FileSource):
+        cls._populate_config(config, config_source, shared=True)
+
+    @classmethod
+    def _populate_config(cls, config: dict, config_source: FileSource, shared: bool):
         if config_source.file is not None and isinstance(config_source.file, bytes):
-            cls._populate_config_from_bytes(
-                config=config, data=config_source.file, config_source=config_source
-            )
+            try:
+                cls._populate_config_from_bytes(
+                    config=config, data=config_source.file, config_source=config_source
+                )
+            except FileException as e:
+                if not config_source.optional:
+                    raise e
             return
         try:
             file_path = cls._get_filename(config_source)
@@ -139,11 +328,16 @@ class FileLoader(Loader):
                 return
             raise e
         file_format = cls._get_format(file_path, config_source.format)
+        selection = cls._get_selection(config_source)
         try:
-            with cls._create_stream(file_path, config_source.encoding) as file_stream:
-                file_content = cls._parse_stream(file_stream, file_format)
+            file_content = cls._load_file(
+                file_path, file_format, config_source, selection
+            )
         except FileException as e:
             if config_source.optional:
                 return
             raise e
+        if not shared:
+            # the cached content must not be modified by callers
+            file_content = copy_tree(file_content)
         cls.update_dict_recursively(config, file_content)
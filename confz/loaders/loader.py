@@ -1,9 +1,93 @@
+import contextvars
+import dataclasses
+import datetime
+import decimal
+import hashlib
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from functools import partial
+from pathlib import PurePath
+from typing import Dict, Any, List, Optional, Tuple
 
 from confz.exceptions import UpdateException
 
 
+_PLAIN_SCALARS = frozenset(
+    [
+        str,
+        bytes,
+        int,
+        float,
+        bool,
+        type(None),
+        datetime.date,
+        datetime.datetime,
+        datetime.time,
+        datetime.timedelta,
+        decimal.Decimal,
+    ]
+)
+_PLAIN_CONTAINERS = (dict, list, tuple, set, frozenset)
+
+
+def digest(*parts: Any) -> str:
+    """Hash the representation of some data, used to create fingerprints."""
+    try:
+        data = repr(parts).encode("utf-8", "backslashreplace")
+    except RecursionError:
+        return _digest_nested(parts)
+    return hashlib.sha256(data).hexdigest()
+
+
+def _digest_nested(parts: Any) -> str:
+    # Walks containers and dataclasses (e.g. config sources) iteratively for deeply
+    # nested data. Much slower than repr, but can not hit the recursion limit.
+    hasher = hashlib.sha256(b"nested\n")
+    stack: List[Any] = [parts]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            children = [item for pair in value.items() for item in pair]
+        elif isinstance(value, _PLAIN_CONTAINERS):
+            children = list(value)
+        elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+            children = [
+                item
+                for field in dataclasses.fields(value)
+                if field.repr  # like repr, e.g. to skip mutable bookkeeping
+                for item in (field.name, getattr(value, field.name))
+            ]
+        else:
+            hasher.update(repr(value).encode("utf-8", "backslashreplace") + b"\n")
+            continue
+        # the number of children keeps the structure unambiguous
+        header = f"{type(value).__qualname__}({len(children)}\n"
+        hasher.update(header.encode("utf-8", "backslashreplace"))
+        stack.extend(reversed(children))
+    return hasher.hexdigest()
+
+
+def is_plain(data: Any) -> bool:
+    """Whether some data only consists of builtin values whose representation
+    identifies them, so that :func:`digest` can fingerprint it. Representations of
+    arbitrary objects can be equal for different values, e.g. with a custom
+    `__repr__`, a default one with a reused address, or a truncated one."""
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        value_type = type(value)
+        if value_type in _PLAIN_SCALARS or isinstance(value, PurePath):
+            continue
+        if value_type in _PLAIN_CONTAINERS:
+            if value_type is dict:
+                stack.extend(value.keys())
+                stack.extend(value.values())
+            else:
+                stack.extend(value)
+            continue
+        return False
+    return True
+
+
 class Loader(ABC):
     """An abstract base class for all config loaders."""
 
@@ -12,20 +96,37 @@ class Loader(ABC):
         """Updates the original dict with the new data. Similar to `dict.update()`, but
         works with nested dicts.
 
+        Only `original_dict` itself is modified. Nested dicts are never modified, but
+        copied along the paths which change (copy-on-write), while untouched nested
+        dicts are shared. Thus, neither the update nor dicts stored in the original
+        by earlier updates (e.g. of other sources) are ever changed.
+
         :param original_dict: The original dictionary to update in-place.
         :param update_dict: The new data.
         :raises UpdateException: If dict keys contradict each other.
         """
-        for key, value in update_dict.items():
-            if isinstance(value, dict) and key in original_dict:
-                if not isinstance(original_dict[key], dict):
-                    raise UpdateException(
-                        f"Config variables contradict each other: "
-                        f"Key '{key}' is both a value and a nested dict."
-                    )
-                cls.update_dict_recursively(original_dict[key], value)
+        copies = set()  # ids of nested dicts copied by this call, modified in-place
+        # iterative depth-first traversal, deep dicts can not hit the recursion limit
+        stack = [(original_dict, iter(update_dict.items()))]
+        while stack:
+            target, items = stack[-1]
+            for key, value in items:
+                if isinstance(value, dict) and key in target:
+                    nested = target[key]
+                    if not isinstance(nested, dict):
+                        raise UpdateException(
+                            f"Config variables contradict each other: "
+                            f"Key '{key}' is both a value and a nested dict."
+                        )
+                    if id(nested) not in copies:
+                        nested = dict(nested)
+                        copies.add(id(nested))
+                        target[key] = nested
+                    stack.append((nested, iter(value.items())))
+                    break
+                target[key] = value
             else:
-                original_dict[key] = value
+                stack.pop()
 
     @classmethod
     def transform_nested_dicts(
@@ -42,27 +143,99 @@ class Loader(ABC):
         :raises UpdateException: If dict keys contradict each other.
         """
         dict_out: Dict[str, Any] = {}
+        # Nested dicts by the key prefix leading to them. Keys often share prefixes,
+        # so most keys do not need to be split and walked through the nested dicts.
+        nodes: Dict[str, Dict[str, Any]] = {}
+        length = len(separator)
+        # with separators like "__", the last occurrence found from the right is not
+        # necessarily the last one used by str.split()
+        overlapping = any(separator[:i] == separator[-i:] for i in range(1, length))
         for key, value in dict_in.items():
-            if separator in key and not key.startswith(separator):
-                inner_keys = key.split(separator)
-                dict_inner = dict_out
-                for idx, inner_key in enumerate(inner_keys):
-                    if idx == len(inner_keys) - 1:
-                        dict_inner[inner_key] = value
-                    else:
-                        if inner_key not in dict_inner:
-                            dict_inner[inner_key] = {}
-                        elif not isinstance(dict_inner[inner_key], dict):
-                            raise UpdateException(
-                                f"Config variables contradict each other: Key "
-                                f"'{inner_key}' is both a value and a nested dict."
-                            )
-                        dict_inner = dict_inner[inner_key]
-            else:
-                dict_out[key] = value
+            idx = key.rfind(separator)
+            node: Optional[Dict[str, Any]] = None
+            last_key = key
+            if idx <= 0 or key.startswith(separator):
+                node = dict_out
+            elif not overlapping or not cls._is_ambiguous(key, idx, separator):
+                prefix, last_key = key[:idx], key[idx + length :]
+                node = nodes.get(prefix)
+                if node is None:
+                    node = cls._get_nested_dict(
+                        dict_out, nodes, prefix, separator, overlapping
+                    )
+            if node is None:
+                node, last_key = cls._walk_nested_dicts(dict_out, key.split(separator))
+            dict_inner = node
+
+            if last_key in dict_inner and isinstance(dict_inner[last_key], dict):
+                nodes.clear()  # a nested dict gets replaced by a value
+            dict_inner[last_key] = value
 
         return dict_out
 
+    @staticmethod
+    def _is_ambiguous(key: str, idx: int, separator: str) -> bool:
+        # whether str.split() might split the key at a different position than idx
+        length = len(separator)
+        return separator in key[max(idx - length + 1, 0) : idx + length - 1]
+
+    @staticmethod
+    def _get_nested_dict(
+        dict_out: Dict[str, Any],
+        nodes: Dict[str, Dict[str, Any]],
+        prefix: str,
+        separator: str,
+        overlapping: bool,
+    ) -> Optional[Dict[str, Any]]:
+        # Find the nearest known ancestor of the prefix, then walk down from it and
+        # remember all nested dicts on the way.
+        length = len(separator)
+        missing = []
+        node = None
+        while node is None:
+            idx = prefix.rfind(separator)
+            if (
+                idx >= 0
+                and overlapping
+                and Loader._is_ambiguous(prefix, idx, separator)
+            ):
+                return None  # the caller splits the whole key instead
+            if idx < 0:
+                missing.append((prefix, prefix))
+                node = dict_out
+            else:
+                missing.append((prefix, prefix[idx + length :]))
+                prefix = prefix[:idx]
+                node = nodes.get(prefix)
+
+        for node_prefix, inner_key in reversed(missing):
+            if inner_key not in node:
+                node[inner_key] = {}
+            elif not isinstance(node[inner_key], dict):
+                raise UpdateException(
+                    f"Config variables contradict each other: Key "
+                    f"'{inner_key}' is both a value and a nested dict."
+                )
+            node = node[inner_key]
+            nodes[node_prefix] = node
+        return node
+
+    @staticmethod
+    def _walk_nested_dicts(
+        dict_out: Dict[str, Any], inner_keys: List[str]
+    ) -> Tuple[Dict[str, Any], str]:
+        dict_inner = dict_out
+        for inner_key in inner_keys[:-1]:
+            if inner_key not in dict_inner:
+                dict_inner[inner_key] = {}
+            elif not isinstance(dict_inner[inner_key], dict):
+                raise UpdateException(
+                    f"Config variables contradict each other: Key "
+                    f"'{inner_key}' is both a value and a nested dict."
+                )
+            dict_inner = dict_inner[inner_key]
+        return dict_inner, inner_keys[-1]
+
     @classmethod
     @abstractmethod
     def populate_config(cls, config: dict, config_source):
@@ -71,3 +244,51 @@ class Loader(ABC):
         :param config: Config dictionary, gets extended with new arguments
         :param config_source: Source configuration.
         """
+
+    @classmethod
+    def populate_layer(cls, config: dict, config_source):
+        """Variant of :meth:`populate_config` which loads a source into a layer of a
+        config class, see :attr:`~confz.BaseConfig.CONFIG_LAYER_CACHE_BYTES`. Layers
+        are never modified, but merged copy-on-write, so loaders can add data shared
+        with their own caches instead of copies. Per default, this is
+        :meth:`populate_config`.
+
+        :param config: Config dictionary, gets extended with new arguments
+        :param config_source: Source configuration.
+        """
+        cls.populate_config(config, config_source)
+
+    @classmethod
+    async def apopulate_config(cls, config: dict, config_source):
+        """Asynchronous variant of :meth:`populate_config`, used by
+        :meth:`~confz.BaseConfig.aload`. Per default, :meth:`populate_config` runs in
+        the default executor of the event loop, so that it does not block the loop.
+        Loaders which can load their sources with asyncio can override it.
+
+        :param config: Config dictionary, gets extended with new arguments
+        :param config_source: Source configuration.
+        """
+        # imported lazily to keep the import of confz cheap
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        await loop.run_in_executor(
+            None, partial(context.run, cls.populate_config, config, config_source)
+        )
+
+    @classmethod
+    def fingerprint(  # pylint: disable=unused-argument
+        cls, config_source
+    ) -> Optional[str]:
+        """Create a fingerprint of everything this loader would read for the source,
+        i.e. the source itself and e.g. the content of files, environment variables or
+        command line arguments. If the fingerprint did not change, loading the source
+        again must give the same result. Used to cache loaded configs, see
+        :attr:`~confz.BaseConfig.CONFIG_SNAPSHOT_DIR`.
+
+        :param config_source: Source configuration.
+        :return: The fingerprint or `None` if no fingerprint can be created. Sources
+            without fingerprint are always loaded again.
+        """
+        return None
@@ -0,0 +1,436 @@
+import functools
+import importlib.util
+import io
+import json
+import re
+from dataclasses import dataclass
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+)
+
+from confz.cache import MISSING
+from confz.config_source import FileFormat
+from confz.exceptions import FileException
+
+# All parsers are imported lazily to keep the import of confz cheap.
+# pylint: disable=import-outside-toplevel
+
+
+def _module_available(name: str) -> Callable[[], bool]:
+    return lambda: importlib.util.find_spec(name) is not None
+
+
+@dataclass(frozen=True)
+class Parser:
+    """A backend to parse config files of a certain :class:`~confz.FileFormat`."""
+
+    name: str
+    """Name of the backend, e.g. the name of the package doing the parsing."""
+    parse: Callable[[TextIO], Any]
+    """Parses a text stream into a (usually nested) dictionary."""
+    is_available: Callable[[], bool] = lambda: True
+    """Whether the backend can be used, e.g. whether its package is installed."""
+    pure_python: bool = False
+    """Whether the backend is implemented in pure Python (or the standard library),
+    see :attr:`~confz.FileSource.pure_python`."""
+    select: Optional[
+        Callable[[TextIO, Sequence[str], Optional[AbstractSet[str]]], Any]
+    ] = None
+    """Optionally, parses only the subtree at a key path of a text stream, skipping
+    the rest, see :attr:`~confz.FileSource.select`. If a set of keys is given, only
+    these keys of the subtree are kept. Raises `KeyError` if the key path does not
+    exist. If not set, the whole stream is parsed and the subtree selected
+    afterwards."""
+
+
+_parsers: Dict[FileFormat, List[Parser]] = {}
+_selected_parsers: Dict[Tuple[FileFormat, bool], Parser] = {}
+
+
+def register_parser(
+    file_format: FileFormat, parser: Parser, position: Optional[int] = 0
+):
+    """Register a parser backend for a file format. Every format has an ordered list of
+    candidate backends and the first available one is used. All backends of a format
+    need to produce identical results.
+
+    :param file_format: The file format the backend can parse.
+    :param parser: The backend.
+    :param position: Position in the list of candidates, by default the backend is
+        preferred over all existing ones. `None` appends it to the end.
+    """
+    candidates = _parsers.setdefault(file_format, [])
+    if position is None:
+        candidates.append(parser)
+    else:
+        candidates.insert(position, parser)
+    _selected_parsers.clear()
+
+
+def get_parser(file_format: FileFormat, pure_python: bool = False) -> Parser:
+    """Get the backend which is used to parse a file format.
+
+    :param file_format: The file format.
+    :param pure_python: Only consider pure-Python backends.
+    :return: The first available candidate backend.
+    :raises FileException: If no backend is available for this format.
+    """
+    key = (file_format, pure_python)
+    if key not in _selected_parsers:
+        for parser in _parsers.get(file_format, []):
+            if (parser.pure_python or not pure_python) and parser.is_available():
+                _selected_parsers[key] = parser
+                break
+        else:
+            raise FileException(f"Unknown file format {file_format}.")
+    return _selected_parsers[key]
+
+
+def select_subtree(
+    data: Any, path: Sequence[str], keys: Optional[AbstractSet[str]] = None
+) -> Any:
+    """Select the subtree at a key path of parsed data, see :attr:`Parser.select`.
+
+    :param data: The parsed data.
+    :param path: The keys leading to the subtree.
+    :param keys: If given, only these keys of the subtree are kept.
+    :return: The subtree.
+    :raises KeyError: If the key path does not exist.
+    """
+    for key in path:
+        if not isinstance(data, dict) or key not in data:
+            raise KeyError(".".join(path))
+        data = data[key]
+    if keys is not None and isinstance(data, dict):
+        data = {key: value for key, value in data.items() if key in keys}
+    return data
+
+
+def _parse_json(stream: TextIO) -> Any:
+    return json.load(stream)
+
+
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def _skip_json_whitespace(text: str, pos: int) -> int:
+    match = _JSON_WHITESPACE.match(text, pos)
+    return pos if match is None else match.end()
+
+
+def _select_json_object(
+    text: str, pos: int, path: Sequence[str], keys: Optional[AbstractSet[str]]
+) -> Tuple[Any, int]:
+    # pylint: disable=too-many-branches
+    # Walks through the members of the object starting at pos. Values which are not
+    # selected are still decoded (in C), but dropped right away, so the whole document
+    # never exists in memory. As with json.load(), the last of duplicate keys wins.
+    decode = json.JSONDecoder().raw_decode
+    selected: Dict[str, Any] = {}
+    result: Any = MISSING
+    pos = _skip_json_whitespace(text, pos + 1)
+    if text.startswith("}", pos):
+        return (result if path else selected), pos + 1
+    while True:
+        if not text.startswith('"', pos):
+            raise json.JSONDecodeError("Expecting property name", text, pos)
+        key, pos = json.decoder.scanstring(text, pos + 1)  # type: ignore
+        pos = _skip_json_whitespace(text, pos)
+        if not text.startswith(":", pos):
+            raise json.JSONDecodeError("Expecting ':' delimiter", text, pos)
+        pos = _skip_json_whitespace(text, pos + 1)
+
+        if not path:
+            value, pos = decode(text, pos)
+            if keys is None or key in keys:
+                selected[key] = value
+        elif key != path[0]:
+            _, pos = decode(text, pos)
+        elif text.startswith("{", pos) and (len(path) > 1 or keys is not None):
+            result, pos = _select_json_object(text, pos, path[1:], keys)
+        else:
+            result, pos = decode(text, pos)
+            if len(path) > 1:
+                result = MISSING  # not an object, so the path does not exist
+
+        pos = _skip_json_whitespace(text, pos)
+        if text.startswith(",", pos):
+            pos = _skip_json_whitespace(text, pos + 1)
+        elif text.startswith("}", pos):
+            return (result if path else selected), pos + 1
+        else:
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, pos)
+
+
+def _select_json(
+    stream: TextIO, path: Sequence[str], keys: Optional[AbstractSet[str]]
+) -> Any:
+    text = stream.read()
+    pos = _skip_json_whitespace(text, 0)
+    if not text.startswith("{", pos):
+        result = json.loads(text)
+        if path:
+            raise KeyError(path[0])
+        return result
+
+    result, pos = _select_json_object(text, pos, path, keys)
+    pos = _skip_json_whitespace(text, pos)
+    if pos != len(text):
+        raise json.JSONDecodeError("Extra data", text, pos)
+    if result is MISSING:
+        raise KeyError(".".join(path))
+    return result
+
+
+_LONG_NUMBER = re.compile(r"\d{19}")
+
+
+def _parse_json_orjson(stream: TextIO) -> Any:
+    # pylint: disable=no-member
+    import orjson
+
+    content = stream.read()
+    if _LONG_NUMBER.search(content) is not None:
+        # orjson converts integers exceeding 64 bit to float
+        return json.loads(content)
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        # orjson is stricter than json, e.g. regarding NaN
+        return json.loads(content)
+
+
+def _parse_toml(stream: TextIO) -> Any:
+    import toml
+
+    return toml.load(stream)
+
+
+def _parse_toml_tomllib(stream: TextIO) -> Any:
+    import toml
+    import tomllib  # type: ignore[import-not-found,unused-ignore]
+
+    content = stream.read()
+    try:
+        return tomllib.loads(content)
+    except tomllib.TOMLDecodeError:
+        # the toml package is more lenient and raises its own exception types
+        return toml.loads(content)
+
+
+def _yaml_with_libyaml() -> bool:
+    import yaml
+
+    return getattr(yaml, "__with_libyaml__", False)
+
+
+def _parse_yaml(stream: TextIO) -> Any:
+    import yaml
+
+    return yaml.load(stream, Loader=yaml.SafeLoader)
+
+
+def _parse_yaml_libyaml(stream: TextIO) -> Any:
+    import yaml
+
+    return yaml.load(stream, Loader=yaml.CSafeLoader)
+
+
+class _YamlFallback(Exception):
+    """The subtree can not be selected while parsing, e.g. due to merge keys."""
+
+
+def _skip_yaml_node(loader: Any):
+    from yaml.events import AliasEvent, MappingEndEvent, ScalarEvent, SequenceEndEvent
+
+    event = loader.peek_event()
+    if isinstance(event, AliasEvent):
+        loader.get_event()
+    elif event.anchor is not None:
+        loader.compose_node(None, None)  # aliases could refer to it later
+    elif isinstance(event, ScalarEvent):
+        loader.get_event()
+    else:
+        loader.get_event()
+        # libyaml only matches the exact event classes
+        while not loader.check_event(SequenceEndEvent, MappingEndEvent):
+            _skip_yaml_node(loader)
+        loader.get_event()
+
+
+def _select_yaml_node(
+    loader: Any, path: Sequence[str], keys: Optional[AbstractSet[str]]
+) -> Any:
+    # pylint: disable=too-many-branches
+    # Walks through the parser events, composing only the selected nodes. Returns the
+    # node of the subtree, or MISSING if the key path does not exist.
+    from yaml.events import MappingEndEvent, MappingStartEvent
+    from yaml.nodes import MappingNode
+
+    if not path and keys is None:
+        return loader.compose_node(None, None)
+    start_event = loader.peek_event()
+    if not isinstance(start_event, MappingStartEvent):
+        if path:
+            _skip_yaml_node(loader)
+            return MISSING
+        return loader.compose_node(None, None)
+    if start_event.anchor is not None:
+        raise _YamlFallback()  # aliases to this mapping need all of it
+
+    loader.get_event()
+    result: Any = MISSING
+    pairs = []
+    while not loader.check_event(MappingEndEvent):
+        key_node = loader.compose_node(None, None)
+        if key_node.tag == "tag:yaml.org,2002:merge":
+            raise _YamlFallback()  # merged keys are only known after composing
+        key = key_node.value if key_node.tag == "tag:yaml.org,2002:str" else None
+        if not path:
+            if key in keys:  # type: ignore
+                pairs.append((key_node, loader.compose_node(None, None)))
+            else:
+                _skip_yaml_node(loader)
+        elif key == path[0]:
+            result = _select_yaml_node(loader, path[1:], keys)
+        else:
+            _skip_yaml_node(loader)
+    end_event = loader.get_event()
+    if path:
+        return result
+
+    tag = start_event.tag
+    if tag is None or tag == "!":
+        tag = loader.resolve(MappingNode, None, start_event.implicit)
+    return MappingNode(
+        tag,
+        pairs,
+        start_event.start_mark,  # type: ignore[arg-type]
+        end_event.end_mark,
+        flow_style=start_event.flow_style,
+    )
+
+
+def _select_yaml_with(
+    loader_class: Callable[[str], Any],
+    parse: Callable[[TextIO], Any],
+    stream: TextIO,
+    path: Sequence[str],
+    keys: Optional[AbstractSet[str]],
+) -> Any:
+    from yaml.composer import ComposerError
+    from yaml.events import StreamEndEvent
+
+    content = stream.read()
+    loader = loader_class(content)
+    try:
+        # same as Composer.get_single_node(), but only composing the selected nodes
+        loader.get_event()
+        node = None
+        if not loader.check_event(StreamEndEvent):
+            loader.get_event()
+            node = _select_yaml_node(loader, path, keys)
+            loader.get_event()
+        if not loader.check_event(StreamEndEvent):
+            event = loader.get_event()
+            raise ComposerError(
+                "expected a single document in the stream",
+                None,
+                "but found another document",
+                event.start_mark,
+            )
+        if node is MISSING or (node is None and path):
+            raise KeyError(".".join(path))
+        if node is None:
+            return None
+        # aliases are composed in full, so the keys are filtered once more
+        return select_subtree(loader.construct_document(node), (), keys)
+    except _YamlFallback:
+        pass
+    finally:
+        loader.dispose()
+
+    return select_subtree(parse(io.StringIO(content)), path, keys)
+
+
+def _select_yaml(
+    stream: TextIO, path: Sequence[str], keys: Optional[AbstractSet[str]]
+) -> Any:
+    import yaml
+
+    return _select_yaml_with(yaml.SafeLoader, _parse_yaml, stream, path, keys)
+
+
+@functools.lru_cache(maxsize=None)
+def _libyaml_event_loader() -> type:
+    from yaml._yaml import CParser  # pylint: disable=no-name-in-module
+    from yaml.composer import Composer
+    from yaml.constructor import SafeConstructor
+    from yaml.resolver import Resolver
+
+    class EventLoader(CParser, Composer, SafeConstructor, Resolver):
+        # parses with libyaml, but composes in Python to compose single nodes
+        def __init__(self, content: str):
+            CParser.__init__(self, content)
+            Composer.__init__(self)
+            SafeConstructor.__init__(self)
+            Resolver.__init__(self)
+
+    return EventLoader
+
+
+def _select_yaml_libyaml(
+    stream: TextIO, path: Sequence[str], keys: Optional[AbstractSet[str]]
+) -> Any:
+    return _select_yaml_with(
+        _libyaml_event_loader(), _parse_yaml_libyaml, stream, path, keys
+    )
+
+
+for _format, _parser in [
+    (
+        FileFormat.JSON,
+        Parser("json", _parse_json, pure_python=True, select=_select_json),
+    ),
+    (
+        FileFormat.JSON,
+        Parser(
+            "orjson",
+            _parse_json_orjson,
+            _module_available("orjson"),
+            select=_select_json,
+        ),
+    ),
+    (FileFormat.TOML, Parser("toml", _parse_toml, pure_python=True)),
+    (
+        FileFormat.TOML,
+        Parser(
+            "tomllib",
+            _parse_toml_tomllib,
+            _module_available("tomllib"),
+            pure_python=True,
+        ),
+    ),
+    (
+        FileFormat.YAML,
+        Parser("pyyaml", _parse_yaml, pure_python=True, select=_select_yaml),
+    ),
+    (
+        FileFormat.YAML,
+        Parser(
+            "libyaml",
+            _parse_yaml_libyaml,
+            _yaml_with_libyaml,
+            select=_select_yaml_libyaml,
+        ),
+    ),
+]:
+    register_parser(_format, _parser)
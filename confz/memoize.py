@@ -0,0 +1,68 @@
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+from . import instrumentation
+from .config_source import ConfigSource, DataSource
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+# results of the current scope by source, None outside of a scope
+_memo: ContextVar[Optional[Dict[Tuple[Any, ...], Future]]] = ContextVar(
+    "confz_memo", default=None
+)
+
+
+@contextmanager
+def memoize_sources() -> Iterator[None]:
+    """Context manager in which each config source is loaded at most once, no matter
+    how many config classes use it. Sources are identified by equality, e.g. all
+    `FileSource(file="/etc/app/base.yaml")` are the same source. Useful when loading
+    many config classes at once, e.g. in :func:`~confz.validate_all_configs`, which
+    uses it automatically. The scope is bound to the current context (see
+    :mod:`contextvars`), i.e. it applies to the current thread or task and to those
+    started with a copy of its context, and can be nested. Data sources are not
+    memoized, since they are not loaded from anywhere."""
+    if _memo.get() is not None:
+        yield  # nested scopes share the outermost one
+        return
+    token = _memo.set({})
+    try:
+        yield
+    finally:
+        _memo.reset(token)
+
+
+def memoized(config_source: ConfigSource, load: Callable[[], T]) -> T:
+    """Load a source, or reuse its result if it was already loaded within the current
+    :func:`memoize_sources` scope. Errors are passed to concurrent callers, but not
+    memoized."""
+    memo = _memo.get()
+    if memo is None or isinstance(config_source, DataSource):
+        return load()
+
+    key: Tuple[Any, ...] = (type(config_source), repr(config_source))
+    if getattr(config_source, "select_fields", False):
+        # the result depends on the fields of the config class
+        key += (instrumentation.get_config_class(),)
+    with _lock:
+        future = memo.get(key)
+        if future is None:
+            owned_future: Future = Future()
+            memo[key] = owned_future
+    if future is not None:
+        return future.result()
+
+    try:
+        result = load()
+    except BaseException as e:
+        with _lock:
+            if memo.get(key) is owned_future:
+                del memo[key]
+        owned_future.set_exception(e)
+        raise
+    owned_future.set_result(result)
+    return result
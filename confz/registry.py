@@ -0,0 +1,112 @@
+import threading
+import weakref
+from typing import Dict, List, NamedTuple, Optional, Type, TYPE_CHECKING
+
+from .config_source import ConfigSource
+
+if TYPE_CHECKING:
+    from .base_config import BaseConfig
+
+    _Ref = weakref.ref[Type[BaseConfig]]
+else:
+    _Ref = weakref.ref
+
+
+class _Index(NamedTuple):
+    # weak references as well, the index must not keep classes alive
+    all: List[_Ref]
+    with_sources: List[_Ref]
+    without_sources: List[_Ref]
+    by_source_type: Dict[type, List[_Ref]]
+
+
+_lock = threading.Lock()
+_classes: Dict[int, _Ref] = {}
+_collected: List[_Ref] = []
+_index: Optional[_Index] = None
+
+
+def _purge():
+    # Called with the lock held. The weakref callbacks only mark collected classes,
+    # since they can run during garbage collection at any point.
+    global _index  # pylint: disable=global-statement
+    while _collected:
+        ref = _collected.pop()
+        for key, value in list(_classes.items()):
+            if value is ref:
+                del _classes[key]
+        _index = None
+
+
+def register(config_class: Type["BaseConfig"]):
+    """Register a newly created config class. Only a weak reference is kept, so
+    dynamically created classes can still be garbage collected."""
+    global _index  # pylint: disable=global-statement
+    with _lock:
+        _purge()
+        _classes[id(config_class)] = weakref.ref(config_class, _collected.append)
+        _index = None
+
+
+def invalidate():
+    """Invalidate the index, e.g. because `CONFIG_SOURCES` of a class changed. Since
+    subclasses inherit their sources, the index is rebuilt completely on next use."""
+    global _index  # pylint: disable=global-statement
+    with _lock:
+        _index = None
+
+
+def _build_index() -> _Index:
+    index = _Index([], [], [], {})
+    for ref in _classes.values():
+        config_class = ref()
+        if config_class is None:  # pragma: no cover (collected concurrently)
+            continue
+        index.all.append(ref)
+        config_sources = config_class.CONFIG_SOURCES
+        if config_sources is None:
+            index.without_sources.append(ref)
+            continue
+        index.with_sources.append(ref)
+        if not isinstance(config_sources, list):
+            config_sources = [config_sources]
+        for source_type in {type(config_source) for config_source in config_sources}:
+            index.by_source_type.setdefault(source_type, []).append(ref)
+    return index
+
+
+def _resolve(refs: List[_Ref]) -> List[Type["BaseConfig"]]:
+    return [cls for cls in (ref() for ref in refs) if cls is not None]
+
+
+def config_classes(
+    has_sources: Optional[bool] = None,
+    source_type: Optional[Type[ConfigSource]] = None,
+) -> List[Type["BaseConfig"]]:
+    """All config classes that currently exist, in the order of their creation.
+
+    :param has_sources: Only classes with (True) or without (False) `CONFIG_SOURCES`.
+    :param source_type: Only classes with a source of this type (or a subclass of it)
+        in `CONFIG_SOURCES`.
+    :return: The config classes.
+    """
+    global _index  # pylint: disable=global-statement
+    with _lock:
+        _purge()
+        if _index is None:
+            _index = _build_index()
+        index = _index
+
+    if source_type is not None:
+        if has_sources is False:
+            return []
+        matches = set()
+        for indexed_type, refs in index.by_source_type.items():
+            if issubclass(indexed_type, source_type):
+                matches.update(refs)
+        return _resolve([ref for ref in index.with_sources if ref in matches])
+    if has_sources is None:
+        return _resolve(index.all)
+    if has_sources:
+        return _resolve(index.with_sources)
+    return _resolve(index.without_sources)
@@ -0,0 +1,183 @@
+import base64
+import datetime
+import json
+import os
+import tempfile
+import threading
+from os import PathLike
+from pathlib import Path
+from typing import Any, Callable, Dict, NamedTuple, Optional, Union
+
+_SNAPSHOT_VERSION = 2
+_TYPE_KEY = "__confz_type__"
+_EXACT_TYPES = frozenset(
+    [
+        dict,
+        list,
+        set,
+        type(None),
+        str,
+        int,
+        float,
+        bool,
+        bytes,
+        datetime.datetime,
+        datetime.date,
+        datetime.time,
+    ]
+)
+
+
+class SnapshotInfo(NamedTuple):
+    """Statistics of the snapshot cache."""
+
+    hits: int  #: Number of configs loaded from a snapshot.
+    misses: int  #: Number of configs loaded from their sources.
+
+
+_lock = threading.Lock()
+_hits = 0
+_misses = 0
+
+
+def snapshot_info() -> SnapshotInfo:
+    """Statistics of the snapshot cache of this process, see
+    :attr:`~confz.BaseConfig.CONFIG_SNAPSHOT_DIR`.
+
+    :return: Number of hits and misses.
+    """
+    with _lock:
+        return SnapshotInfo(hits=_hits, misses=_misses)
+
+
+def snapshot_info_clear():
+    """Reset the statistics of the snapshot cache."""
+    global _hits, _misses  # pylint: disable=global-statement
+    with _lock:
+        _hits = 0
+        _misses = 0
+
+
+def record(hit: bool):
+    global _hits, _misses  # pylint: disable=global-statement
+    with _lock:
+        if hit:
+            _hits += 1
+        else:
+            _misses += 1
+
+
+def _encode(data: Any, exact: bool) -> Any:
+    # pylint: disable=too-many-return-statements
+    if exact and type(data) not in _EXACT_TYPES:
+        # subclasses, e.g. enums of strings, would be restored as their base class
+        raise TypeError(f"Type {type(data)} is not supported")
+    if isinstance(data, dict):
+        # pylint: disable-next=unidiomatic-typecheck
+        if not all(type(key) is str if exact else isinstance(key, str) for key in data):
+            raise TypeError("Only string keys are supported")
+        if _TYPE_KEY in data:
+            items = [[key, _encode(value, exact)] for key, value in data.items()]
+            return {_TYPE_KEY: "dict", "value": items}
+        return {key: _encode(value, exact) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_encode(value, exact) for value in data]
+    if data is None or isinstance(data, (str, int, float)):
+        return data
+    if isinstance(data, datetime.datetime):
+        return {_TYPE_KEY: "datetime", "value": data.isoformat()}
+    if isinstance(data, datetime.date):
+        return {_TYPE_KEY: "date", "value": data.isoformat()}
+    if isinstance(data, datetime.time):
+        return {_TYPE_KEY: "time", "value": data.isoformat()}
+    if isinstance(data, bytes):
+        return {_TYPE_KEY: "bytes", "value": base64.b64encode(data).decode("ascii")}
+    if isinstance(data, set):
+        return {
+            _TYPE_KEY: "set",
+            "value": [_encode(value, exact) for value in data],
+        }
+    raise TypeError(f"Type {type(data)} is not supported")
+
+
+def _decode(data: Dict[str, Any]) -> Any:
+    decoders: Dict[str, Callable[[Any], Any]] = {
+        "datetime": datetime.datetime.fromisoformat,
+        "date": datetime.date.fromisoformat,
+        "time": datetime.time.fromisoformat,
+        "bytes": base64.b64decode,
+        "set": set,
+        "dict": dict,
+    }
+    if data.keys() == {_TYPE_KEY, "value"} and data[_TYPE_KEY] in decoders:
+        return decoders[data[_TYPE_KEY]](data["value"])
+    return data
+
+
+def load_snapshot(
+    folder: Union[PathLike, str], name: str, fingerprint: str
+) -> Optional[dict]:
+    """Load a snapshot if it exists and its fingerprint matches.
+
+    :param folder: Folder of the snapshot.
+    :param name: Name of the snapshot.
+    :param fingerprint: Fingerprint of all inputs of the config.
+    :return: The config or `None` if there is no matching snapshot.
+    """
+    try:
+        with (Path(folder) / f"{name}.json").open(encoding="utf-8") as file:
+            snapshot = json.load(file, object_hook=_decode)
+    except (OSError, ValueError):
+        snapshot = None
+
+    if (
+        isinstance(snapshot, dict)
+        and snapshot.get("version") == _SNAPSHOT_VERSION
+        and snapshot.get("fingerprint") == fingerprint
+    ):
+        record(hit=True)
+        return snapshot["config"]
+    record(hit=False)
+    return None
+
+
+def store_snapshot(
+    folder: Union[PathLike, str],
+    name: str,
+    fingerprint: str,
+    config: dict,
+    exact: bool = False,
+) -> bool:
+    """Store a snapshot, replacing any existing snapshot with the same name. Configs
+    with data which can not be represented in JSON are not stored.
+
+    :param folder: Folder of the snapshot.
+    :param name: Name of the snapshot.
+    :param fingerprint: Fingerprint of all inputs of the config.
+    :param config: The loaded config.
+    :param exact: Whether to only store configs which are restored with exactly the
+        same types, e.g. not with enums of strings, which would become strings.
+    :return: True if the snapshot was stored.
+    """
+    try:
+        content = json.dumps(
+            {
+                "version": _SNAPSHOT_VERSION,
+                "fingerprint": fingerprint,
+                "config": _encode(config, exact),
+            }
+        )
+    except TypeError:
+        return False
+
+    folder = Path(folder)
+    try:
+        folder.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=folder, suffix=".tmp", delete=False
+        ) as file:
+            file.write(content)
+        os.replace(file.name, folder / f"{name}.json")
+    except OSError:
+        return False
+    return True
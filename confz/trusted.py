@@ -0,0 +1,236 @@
+import json
+import threading
+import types
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar, Union
+
+from pydantic import VERSION, BaseModel
+
+from .loaders.loader import digest
+
+SCHEMA_KEY = "__confz_schema__"
+
+M = TypeVar("M", bound=BaseModel)
+
+_Builder = Callable[[Any], Any]
+
+_lock = threading.Lock()
+_fingerprints: "weakref.WeakKeyDictionary[type, Optional[str]]"
+_fingerprints = weakref.WeakKeyDictionary()
+_builders: "weakref.WeakKeyDictionary[type, List[Tuple[str, _Builder]]]"
+_builders = weakref.WeakKeyDictionary()
+_NoneType = type(None)
+_UnionType = getattr(types, "UnionType", None)  # `X | Y`, since Python 3.10
+
+
+class _Untrusted(Exception):
+    """The data can not be constructed without validation."""
+
+
+def schema_fingerprint(model_class: Type[BaseModel]) -> Optional[str]:
+    """Fingerprint of the JSON schema of a model, including all nested models. Data
+    carrying this fingerprint was validated against the same schema and can be
+    constructed without validating it again.
+
+    :param model_class: The model.
+    :return: The fingerprint or `None` if the model has no JSON schema.
+    """
+    with _lock:
+        if model_class in _fingerprints:
+            return _fingerprints[model_class]
+
+    try:
+        if hasattr(model_class, "model_json_schema"):
+            schema = model_class.model_json_schema()
+        else:  # pragma: no cover (pydantic v1)
+            schema = model_class.schema()
+        fingerprint: Optional[str] = digest(
+            model_class.__module__,
+            model_class.__qualname__,
+            VERSION,
+            json.dumps(schema, sort_keys=True, default=repr),
+        )
+    except Exception:  # pylint: disable=broad-exception-caught
+        fingerprint = None  # e.g. arbitrary types without schema
+
+    with _lock:
+        _fingerprints[model_class] = fingerprint
+    return fingerprint
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return {key: _dump_value(inner) for key, inner in value}
+    if isinstance(value, dict):
+        return {key: _dump_value(inner) for key, inner in value.items()}
+    if type(value) in (list, tuple):  # pylint: disable=unidiomatic-typecheck
+        return type(value)(_dump_value(inner) for inner in value)
+    return value  # also sets, since dicts are not hashable
+
+
+def dump(instance: BaseModel) -> Optional[Dict[str, Any]]:
+    """Dump a validated instance into data, which :func:`construct` turns into an
+    equal instance without validation. Nested models become dicts, all other values
+    are kept as they are.
+
+    :param instance: The validated instance.
+    :return: The data, carrying the schema fingerprint of the model, or `None` if the
+        model has no schema fingerprint.
+    """
+    fingerprint = schema_fingerprint(type(instance))
+    if fingerprint is None:
+        return None
+    data = _dump_value(instance)
+    data[SCHEMA_KEY] = fingerprint
+    return data
+
+
+def _fields(model_class: Type[BaseModel]) -> Dict[str, Any]:
+    if hasattr(model_class, "model_fields"):
+        return {
+            name: field.annotation for name, field in model_class.model_fields.items()
+        }
+    return {  # pragma: no cover (pydantic v1)
+        name: field.outer_type_
+        for name, field in model_class.__fields__.items()  # type: ignore
+    }
+
+
+def _contains_model(annotation: Any) -> bool:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return True
+    return any(_contains_model(arg) for arg in getattr(annotation, "__args__", ()))
+
+
+def _untrusted(value: Any) -> Any:
+    raise _Untrusted()
+
+
+def _model_builder(model_class: Type[BaseModel]) -> _Builder:
+    builders: Optional[List[Tuple[str, _Builder]]] = None
+
+    def build(value: Any) -> Any:
+        nonlocal builders
+        if isinstance(value, model_class):
+            return value
+        if not isinstance(value, dict):
+            raise _Untrusted()
+        if builders is None:
+            # resolved on first use, since models can reference themselves
+            builders = _get_builders(model_class)
+        return _construct(model_class, value, builders)
+
+    return build
+
+
+def _optional_builder(build_inner: _Builder) -> _Builder:
+    return lambda value: None if value is None else build_inner(value)
+
+
+def _collection_builder(origin: Type[Any], build_inner: _Builder) -> _Builder:
+    def build(value: Any) -> Any:
+        if not isinstance(value, origin):
+            raise _Untrusted()
+        return origin(build_inner(inner) for inner in value)
+
+    return build
+
+
+def _tuple_builder(build_inners: List[_Builder]) -> _Builder:
+    def build(value: Any) -> Any:
+        if not isinstance(value, tuple) or len(value) != len(build_inners):
+            raise _Untrusted()
+        return tuple(
+            build_inner(inner) for build_inner, inner in zip(build_inners, value)
+        )
+
+    return build
+
+
+def _dict_builder(build_inner: _Builder) -> _Builder:
+    def build(value: Any) -> Any:
+        if not isinstance(value, dict):
+            raise _Untrusted()
+        return {key: build_inner(inner) for key, inner in value.items()}
+
+    return build
+
+
+def _builder(annotation: Any) -> Optional[_Builder]:
+    # pylint: disable=too-many-return-statements
+    # Turns dumped values of a field into the values of the validated instance, or
+    # returns None if they are kept as they are.
+    if not _contains_model(annotation):
+        return None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _model_builder(annotation)
+
+    origin = getattr(annotation, "__origin__", None)
+    args = [arg for arg in annotation.__args__ if arg is not _NoneType]
+    builders = [_builder(arg) or _keep for arg in args]
+    if origin is Union or (
+        _UnionType is not None and isinstance(annotation, _UnionType)
+    ):
+        if len(args) > 1:
+            return _untrusted  # ambiguous which model the data belongs to
+        return _optional_builder(builders[0])
+    if origin in (list, set, frozenset):
+        return _collection_builder(origin, builders[0])
+    if origin is tuple:
+        if len(args) == 2 and args[1] is Ellipsis:
+            return _collection_builder(tuple, builders[0])
+        return _tuple_builder(builders)
+    if origin is dict:
+        return _dict_builder(builders[1])
+    return _untrusted
+
+
+def _keep(value: Any) -> Any:
+    return value
+
+
+def _get_builders(model_class: Type[BaseModel]) -> List[Tuple[str, _Builder]]:
+    with _lock:
+        builders = _builders.get(model_class)
+    if builders is None:
+        builders = []
+        for name, annotation in _fields(model_class).items():
+            builder = _builder(annotation)
+            if builder is not None:
+                builders.append((name, builder))
+        with _lock:
+            _builders[model_class] = builders
+    return builders
+
+
+def _construct(
+    model_class: Type[M], data: Dict[str, Any], builders: List[Tuple[str, _Builder]]
+) -> M:
+    values = dict(data)
+    for name, builder in builders:
+        value = values.get(name)
+        if value is not None:
+            values[name] = builder(value)
+    if hasattr(model_class, "model_construct"):
+        return model_class.model_construct(**values)
+    return model_class.construct(**values)  # pragma: no cover (pydantic v1)
+
+
+def construct(model_class: Type[M], data: Dict[str, Any]) -> Optional[M]:
+    """Construct an instance from the data of :func:`dump` without validation, if it
+    carries the schema fingerprint of the model. Nested models are constructed
+    recursively, as long as their field types determine the model (e.g. not for a
+    union of several models).
+
+    :param model_class: The model.
+    :param data: The data.
+    :return: The instance or `None` if the data has to be validated.
+    """
+    fingerprint = data.get(SCHEMA_KEY)
+    if fingerprint is None or fingerprint != schema_fingerprint(model_class):
+        return None
+    data = {key: value for key, value in data.items() if key != SCHEMA_KEY}
+    try:
+        return _construct(model_class, data, _get_builders(model_class))
+    except _Untrusted:
+        return None
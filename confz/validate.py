@@ -1,52 +1,173 @@
-from .base_config import BaseConfig
+import asyncio
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, NamedTuple, Optional
 
+from . import registry
+from .exceptions import ValidateAllException
+from .memoize import memoize_sources
 
-def _get_sub_classes(cls):
-    direct_sub_classes = cls.__subclasses__()
 
-    all_sub_classes = direct_sub_classes.copy()
-    for sub_class in direct_sub_classes:
-        all_sub_classes.extend(_get_sub_classes(sub_class))
+class ValidationResult(NamedTuple):
+    """Result of a single config class or listener in
+    :func:`~confz.validate_all_configs`."""
 
-    return all_sub_classes
+    item: Any  #: The config class or listener.
+    name: str  #: Qualified name of the config class or listener function.
+    duration: float  #: Duration in seconds.
+    error: Optional[Exception]  #: The error, if any.
 
 
-def validate_all_configs(include_listeners: bool = False):
+def _timed(item: Any, name: str, fn: Callable[[], Any]) -> ValidationResult:
+    start = time.perf_counter()
+    try:
+        fn()
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        return ValidationResult(item, name, time.perf_counter() - start, e)
+    return ValidationResult(item, name, time.perf_counter() - start, None)
+
+
+async def _timed_async(
+    item: Any, name: str, fn: Callable[[], Any], semaphore: Optional[asyncio.Semaphore]
+) -> ValidationResult:
+    if semaphore is not None:
+        async with semaphore:
+            return await _timed_async(item, name, fn, None)
+    start = time.perf_counter()
+    try:
+        await fn()
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        return ValidationResult(item, name, time.perf_counter() - start, e)
+    return ValidationResult(item, name, time.perf_counter() - start, None)
+
+
+def _check_results(results: List[ValidationResult]) -> List[ValidationResult]:
+    if any(result.error is not None for result in results):
+        raise ValidateAllException(results)
+    return results
+
+
+def validate_all_configs(
+    include_listeners: bool = False,
+    parallel: bool = False,
+    max_workers: Optional[int] = None,
+    max_concurrency: Optional[int] = None,
+):
     """Instantiates all config classes with a singleton mechanism
     (`CONFIG_SOURCES` set). This allows to catch validation errors early instead of
     waiting for the first access.
 
+    In parallel mode, config classes and then synchronous listeners are loaded on a
+    thread pool and asynchronous listeners run concurrently. All errors are collected
+    and the duration of each config class and listener is reported.
+
     :param include_listeners: Whether all listeners (marked with
         :func:`~confz.depends_on`) should be included.
-    :raises ConfigException: If any config could not be loaded.
+    :param parallel: Whether to load config classes and listeners in parallel.
+    :param max_workers: Size of the thread pool in parallel mode. Per default, the
+        default of :class:`~concurrent.futures.ThreadPoolExecutor` is used.
+    :param max_concurrency: Maximum number of asynchronous listeners to run at the same
+        time in parallel mode. Per default, all run at the same time.
+    :return: In parallel mode, a :class:`~confz.validate.ValidationResult` for each
+        config class and listener, in the order of execution.
+    :raises ConfigException: If any config could not be loaded. In parallel mode, a
+        :class:`~confz.exceptions.ValidateAllException` with all errors.
     """
     config_classes = []
     sync_listeners = []
     async_listeners = []
-    for config_class in _get_sub_classes(BaseConfig):
-        if config_class.CONFIG_SOURCES is not None:
-            config_classes.append(config_class)
-            if include_listeners and config_class.listeners is not None:
-                for listener in config_class.listeners:
-                    if listener.is_async:
-                        async_listeners.append(listener)
-                    else:
-                        sync_listeners.append(listener)
+    seen = set()  # listeners depending on several config classes run only once
+    for config_class in registry.config_classes(has_sources=True):
+        config_classes.append(config_class)
+        if include_listeners and config_class.listeners is not None:
+            for listener in config_class.listeners:
+                if listener in seen:
+                    continue
+                seen.add(listener)
+                if listener.is_async:
+                    async_listeners.append(listener)
+                else:
+                    sync_listeners.append(listener)
+
+    if parallel:
+        return _validate_parallel(
+            config_classes,
+            sync_listeners,
+            async_listeners,
+            max_workers,
+            max_concurrency,
+        )
 
     def sync_calls():
-        for cls in config_classes:
-            cls()
-        for fn in sync_listeners:
-            fn()
+        with memoize_sources():
+            for cls in config_classes:
+                cls()
+            for fn in sync_listeners:
+                fn()
 
     if len(async_listeners) > 0:
 
         async def inner():
-            sync_calls()
-            for fn in async_listeners:
-                await fn()
+            with memoize_sources():
+                sync_calls()
+                for fn in async_listeners:
+                    await fn()
 
     else:
         inner = sync_calls
 
     return inner()
+
+
+def _validate_parallel(
+    config_classes: list,
+    sync_listeners: list,
+    async_listeners: list,
+    max_workers: Optional[int],
+    max_concurrency: Optional[int],
+):
+    # pylint: disable=too-many-arguments
+    def sync_calls() -> List[ValidationResult]:
+        with memoize_sources(), ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="confz-validate"
+        ) as executor:
+            # each task runs in a copy of the context to share the memoized sources
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run, _timed, cls, cls.__qualname__, cls
+                )
+                for cls in config_classes
+            ]
+            results = [future.result() for future in futures]
+            futures = [
+                executor.submit(contextvars.copy_context().run, _timed, fn, fn.name, fn)
+                for fn in sync_listeners
+            ]
+            results.extend(future.result() for future in futures)
+        return results
+
+    if len(async_listeners) > 0:
+
+        async def inner():
+            with memoize_sources():
+                loop = asyncio.get_running_loop()
+                results = await loop.run_in_executor(
+                    None, contextvars.copy_context().run, sync_calls
+                )
+                semaphore = None
+                if max_concurrency is not None:
+                    semaphore = asyncio.Semaphore(max_concurrency)
+                results.extend(
+                    await asyncio.gather(
+                        *[
+                            _timed_async(fn, fn.name, fn, semaphore)
+                            for fn in async_listeners
+                        ]
+                    )
+                )
+            return _check_results(results)
+
+        return inner()
+
+    return _check_results(sync_calls())
@@ -0,0 +1,271 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from contextlib import AbstractContextManager
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple, Type, Union, TYPE_CHECKING
+
+from .config_source import EnvSource, FileSource
+from .exceptions import FileException
+from .loaders.file_loader import FileLoader
+
+if TYPE_CHECKING:
+    from .base_config import BaseConfig
+
+_StatFingerprint = Optional[Tuple[int, int, int]]
+
+
+def _watched_files(config_class: Type["BaseConfig"]) -> List[Path]:
+    config_sources = config_class.CONFIG_SOURCES
+    if config_sources is None:
+        return []
+    if not isinstance(config_sources, list):
+        config_sources = [config_sources]
+
+    files = []
+    for config_source in config_sources:
+        if isinstance(config_source, FileSource):
+            if isinstance(config_source.file, bytes):
+                continue
+            try:
+                # pylint: disable=protected-access
+                files.append(FileLoader._get_filename(config_source))
+            except FileException:
+                continue
+        elif isinstance(config_source, EnvSource):
+            if config_source.file is not None and not isinstance(
+                config_source.file, bytes
+            ):
+                files.append(Path(config_source.file))
+    return [file.absolute() for file in files]
+
+
+class _PollingBackend:
+    name = "polling"
+
+    def __init__(self, stop_event: threading.Event):
+        self._stop_event = stop_event
+        self._stats: Dict[Path, _StatFingerprint] = {}
+
+    @staticmethod
+    def _stat(file: Path) -> _StatFingerprint:
+        try:
+            stat_result = file.stat()
+        except OSError:
+            return None
+        return stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino
+
+    def watch(self, files: List[Path]):
+        self._stats = {file: self._stat(file) for file in files}
+
+    def wait(self, timeout: float) -> bool:
+        self._stop_event.wait(timeout)
+        changed = False
+        for file, stat in self._stats.items():
+            new_stat = self._stat(file)
+            if new_stat != stat:
+                self._stats[file] = new_stat
+                changed = True
+        return changed
+
+    def close(self):
+        self._stats = {}
+
+
+class _InotifyBackend:
+    name = "inotify"
+
+    # Watch the folders instead of the files, since editors often replace files.
+    _MASK = (
+        0x00000002  # IN_MODIFY
+        | 0x00000004  # IN_ATTRIB
+        | 0x00000008  # IN_CLOSE_WRITE
+        | 0x00000040  # IN_MOVED_FROM
+        | 0x00000080  # IN_MOVED_TO
+        | 0x00000100  # IN_CREATE
+        | 0x00000200  # IN_DELETE
+    )
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self) -> None:
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:  # pragma: no cover
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._names: Dict[int, Set[str]] = {}
+
+    def watch(self, files: List[Path]):
+        for watch_descriptor in self._names:
+            self._libc.inotify_rm_watch(self._fd, watch_descriptor)
+        self._names = {}
+        for file in files:
+            watch_descriptor = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(file.parent), self._MASK
+            )
+            if watch_descriptor >= 0:
+                self._names.setdefault(watch_descriptor, set()).add(file.name)
+
+    def wait(self, timeout: float) -> bool:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return False
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:  # pragma: no cover
+            return False
+
+        changed = False
+        offset = 0
+        while offset < len(data):
+            watch_descriptor, _, _, length = self._EVENT.unpack_from(data, offset)
+            offset += self._EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if name in self._names.get(watch_descriptor, ()):
+                changed = True
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+class ConfigWatcher(AbstractContextManager):
+    """Watches the files behind the `CONFIG_SOURCES` of a config class, i.e. files of
+    :class:`~confz.FileSource` and .env files of :class:`~confz.EnvSource`. On a change,
+    the config is loaded and validated again in a background thread and, if this was
+    successful, replaces the singleton instance. All listeners of the config class
+    (see :func:`~confz.depends_on`) are invalidated afterwards. Changes within
+    `debounce` seconds are combined into a single reload and there are at least
+    `min_interval` seconds between two reloads."""
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+        self,
+        config_class: Type["BaseConfig"],
+        *,
+        debounce: float = 0.5,
+        min_interval: float = 1.0,
+        poll_interval: float = 1.0,
+        use_inotify: Optional[bool] = None,
+    ):
+        # pylint: disable=too-many-arguments
+        self._config_class = config_class
+        self._debounce = debounce
+        self._min_interval = min_interval
+        self._poll_interval = poll_interval
+        self._use_inotify = (
+            sys.platform.startswith("linux") if use_inotify is None else use_inotify
+        )
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._backend: Union[_InotifyBackend, _PollingBackend, None] = None
+
+        self.reload_count = 0  #: Number of successful reloads.
+        self.last_error: Optional[Exception] = None
+        """The error of the last reload, if it failed."""
+
+    @property
+    def backend(self) -> Optional[str]:
+        """Name of the mechanism used to watch files, `"inotify"` or `"polling"`."""
+        return getattr(self._backend, "name", None)
+
+    def start(self) -> "ConfigWatcher":
+        """Start watching in a background thread.
+
+        :return: The watcher itself.
+        """
+        if self._thread is not None:
+            return self
+        backend: Union[_InotifyBackend, _PollingBackend, None] = None
+        if self._use_inotify:
+            try:
+                backend = _InotifyBackend()
+            except (OSError, AttributeError):
+                backend = None
+        if backend is None:
+            backend = _PollingBackend(self._stop_event)
+        backend.watch(_watched_files(self._config_class))
+        self._backend = backend
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(backend,),
+            name=f"confz-watcher-{self._config_class.__qualname__}",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop watching and wait for the background thread to finish."""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def reload(self) -> bool:
+        """Load and validate the config again and replace the singleton instance. If
+        `CONFIG_SOURCES` changed in the meantime, e.g. with
+        :meth:`~confz.BaseConfig.change_config_sources`, the result is discarded.
+
+        :return: True if the config could be loaded and validated and replaced the
+            singleton instance.
+        """
+        config_class = self._config_class
+        config_sources = config_class.CONFIG_SOURCES
+        if config_sources is None:
+            return False
+        try:
+            instance = config_class.confz_create(config_sources, {})
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self.last_error = e
+            return False
+
+        self.last_error = None
+        with config_class.confz_lock():
+            if config_class.CONFIG_SOURCES is not config_sources:
+                return False  # sources changed in the meantime, e.g. in a unit test
+            config_class.confz_instance = instance
+            if config_class.listeners is not None:
+                for listener in config_class.listeners:
+                    listener.reset()
+        self.reload_count += 1
+        return True
+
+    def _run(self, backend: Union[_InotifyBackend, _PollingBackend]) -> None:
+        last_change: Optional[float] = None
+        last_reload = float("-inf")
+        try:
+            while not self._stop_event.is_set():
+                timeout = self._poll_interval
+                if last_change is not None:
+                    timeout = min(self._debounce, self._min_interval, timeout)
+                if backend.wait(timeout):
+                    last_change = time.monotonic()
+
+                now = time.monotonic()
+                if (
+                    last_change is not None
+                    and now - last_change >= self._debounce
+                    and now - last_reload >= self._min_interval
+                ):
+                    last_change = None
+                    last_reload = now
+                    backend.watch(_watched_files(self._config_class))
+                    self.reload()
+        finally:
+            backend.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
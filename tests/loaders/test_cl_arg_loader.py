@@ -1,6 +1,8 @@
 import sys
 
 from confz import BaseConfig, CLArgSource
+from confz.loaders.argv import parse_argv
+from confz.loaders.cl_arg_loader import CLArgLoader
 
 
 class InnerConfig(BaseConfig):
@@ -58,3 +60,53 @@ def test_nested_separator(monkeypatch):
     )
     assert config.inner.attr1 == 1
     assert config.attr2 == 2
+
+
+def test_equal_sign(monkeypatch):
+    argv = sys.argv.copy() + ["--inner.attr1=1", "--attr2", "3", "--attr2=2"]
+    monkeypatch.setattr(sys, "argv", argv)
+    config = OuterConfig(config_sources=CLArgSource())
+    assert config.inner.attr1 == 1
+    assert config.attr2 == 2
+
+
+def test_response_file(monkeypatch, tmp_path):
+    response_file = tmp_path / "args.txt"
+    response_file.write_text("--inner.attr1\n1\n\n--attr2=2\n")
+    argv_backup = sys.argv.copy()
+    monkeypatch.setattr(
+        sys, "argv", argv_backup + ["--attr2", "100", f"@{response_file}"]
+    )
+    config = OuterConfig(config_sources=CLArgSource(response_files=True))
+    assert config.inner.attr1 == 1
+    assert config.attr2 == 2
+
+    # only expanded on request
+    assert parse_argv().args[-1] == f"@{response_file}"
+    assert parse_argv().options["attr2"] == "100"
+
+    # unknown files and recursive files are kept as they are
+    response_file.write_text(f"--inner.attr1\n@{response_file}\n--attr2\n@unknown")
+    monkeypatch.setattr(sys, "argv", argv_backup + [f"@{response_file}"])
+    options = parse_argv(response_files=True).options
+    assert options["attr2"] == "@unknown"
+    assert options["inner.attr1"] == f"@{response_file}"
+
+
+def test_repeated_options(monkeypatch):
+    # first occurrence order with the last value, so the nested dict gets replaced
+    argv = sys.argv.copy() + ["--inner.attr1", "1", "--inner", "2", "--inner.attr1=3"]
+    monkeypatch.setattr(sys, "argv", argv)
+    assert list(parse_argv().options.items()) == [("inner.attr1", "3"), ("inner", "2")]
+    config: dict = {}
+    CLArgLoader.populate_config(config, CLArgSource())
+    assert config == {"inner": "2"}
+
+
+def test_parse_argv_cache(monkeypatch):
+    monkeypatch.setattr(sys, "argv", sys.argv.copy() + ["--attr2", "2"])
+    parsed = parse_argv()
+    assert parse_argv() is parsed
+    sys.argv.extend(["--inner.attr1", "1"])
+    assert parse_argv() is not parsed
+    assert parse_argv().options["inner.attr1"] == "1"
@@ -1,9 +1,13 @@
+import os
+import random
 from typing import Optional
 
 import pytest
 from pydantic import ValidationError
 
 from confz import BaseConfig, EnvSource
+from confz.loaders import env_loader
+from confz.loaders.env_loader import EnvLoader, _transform_name
 from tests.assets import ASSET_FOLDER
 
 
@@ -154,3 +158,158 @@ def test_separator(monkeypatch):
     assert config.attr2 == 1
     assert config.inner.attr1_name == 21
     assert config.inner.attr_override == "2002"
+
+
+def test_plan_cache(monkeypatch):
+    monkeypatch.setenv("ATTR2", "2")
+    monkeypatch.setenv("INNER.ATTR1-NAME", "1")
+    source = EnvSource(allow=["Inner.Attr1-Name", "attr2"], deny=["ATTR2"])
+    plan = EnvLoader._get_plan(source)
+    assert plan.allow == {"inner.attr1_name", "attr2"}
+    assert plan.deny == {"attr2"}
+    assert EnvLoader._get_plan(source) is plan
+
+    # plan follows changes of the source
+    source.deny = None
+    config = OuterConfig(config_sources=source)
+    assert config.attr2 == 2
+    assert EnvLoader._get_plan(source) is not plan
+
+
+def _get_env_vars_reference(config_source: EnvSource) -> dict:
+    # selection of all variables, without snapshot and index
+    plan = EnvLoader._get_plan(config_source)
+    env_vars = {}
+    for env_var, value in os.environ.items():
+        var_name = env_var
+        if plan.prefix is not None:
+            if not var_name.startswith(plan.prefix):
+                continue
+            var_name = var_name[len(plan.prefix) :]
+        var_name = _transform_name(var_name)
+        if plan.allows(var_name):
+            env_vars[plan.remap.get(var_name, var_name)] = value
+    return env_vars
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_snapshot_selection(monkeypatch, seed):
+    rng = random.Random(seed)
+    names = ["a", "A", "a-b", "A_B", "b", "c.d", "C.D"]
+    prefixes = [None, "", "APP_", "app_", "APP"]
+    for _ in range(20):
+        prefix = rng.choice(prefixes) or ""
+        monkeypatch.setenv(prefix + rng.choice(names), str(rng.random()))
+
+    for _ in range(20):
+        source = EnvSource(
+            allow_all=rng.random() < 0.3,
+            allow=rng.sample(names, 3),
+            deny=rng.sample(names, 1),
+            prefix=rng.choice(prefixes),
+            remap={rng.choice(names): "a", rng.choice(names): "x"},
+        )
+        env_vars = EnvLoader._get_env_vars(source)
+        assert env_vars == _get_env_vars_reference(source)
+        assert list(env_vars) == list(_get_env_vars_reference(source))
+
+
+def test_snapshot_shared(monkeypatch):
+    monkeypatch.setenv("ATTR2", "2")
+    source = EnvSource(allow=["attr2"])
+    assert EnvLoader._get_env_vars(source) == {"attr2": "2"}
+    snapshot = env_loader._get_snapshot()
+    assert env_loader._get_snapshot() is snapshot
+
+    # changes of the environment are detected
+    monkeypatch.setenv("ATTR2", "3")
+    assert EnvLoader._get_env_vars(source) == {"attr2": "3"}
+    os.environ["ATTR2"] = "4"
+    assert EnvLoader._get_env_vars(source) == {"attr2": "4"}
+    monkeypatch.delenv("ATTR2")
+    assert EnvLoader._get_env_vars(source) == {}
+    assert env_loader._get_snapshot() is not snapshot
+
+    snapshot = env_loader._get_snapshot()
+    EnvLoader.refresh()
+    assert env_loader._get_snapshot() is not snapshot
+
+
+def test_snapshot_without_raw_environment(monkeypatch):
+    # e.g. if os.environ was replaced, it is copied every time
+    monkeypatch.setattr(os, "environ", {"ATTR2": "2"})
+    source = EnvSource(allow=["attr2"])
+    assert EnvLoader._get_env_vars(source) == {"attr2": "2"}
+    os.environ["ATTR2"] = "3"
+    assert EnvLoader._get_env_vars(source) == {"attr2": "3"}
+
+
+def test_dotenv_prefix(monkeypatch):
+    monkeypatch.setenv("INNER.ATTR1_NAME", "21")
+    monkeypatch.setenv("ATTR2", "1")
+    source = EnvSource(allow_all=True, prefix="INNER.", file=b"INNER.ATTR1_NAME=22")
+    assert EnvLoader._get_env_vars(source) == {"attr1_name": "21"}
+
+
+def test_dotenv_cache(tmp_path):
+    EnvLoader.cache_clear()
+    env_file = tmp_path / "config.env"
+    env_file.write_text("ATTR2=1\nINNER.ATTR1_NAME=2\n")
+    for _ in range(3):
+        # shared by all sources of the same file
+        config = OuterConfig(config_sources=EnvSource(allow_all=True, file=env_file))
+        assert config.attr2 == 1
+    assert EnvLoader.cache_info().misses == 1
+    assert EnvLoader.cache_info().entries == 1
+
+    env_file.write_text("ATTR2=10\nINNER.ATTR1_NAME=2\n")
+    config = OuterConfig(config_sources=EnvSource(allow_all=True, file=env_file))
+    assert config.attr2 == 10
+    assert EnvLoader.cache_info().misses == 2
+    assert EnvLoader.cache_info().entries == 1
+
+
+def test_dotenv_cache_bytes():
+    EnvLoader.cache_clear()
+    data = b"ATTR2=1\nINNER.ATTR1_NAME=2\n"
+    for _ in range(2):
+        config = OuterConfig(config_sources=EnvSource(allow_all=True, file=data))
+        assert config.attr2 == 1
+    config = OuterConfig(
+        config_sources=EnvSource(
+            allow_all=True, file=data.replace(b"ATTR2=1", b"ATTR2=3")
+        )
+    )
+    assert config.attr2 == 3
+    assert EnvLoader.cache_info().misses == 2
+    assert EnvLoader.cache_info().bytes == 2 * len(data)
+
+
+def test_dotenv_cache_interpolation(monkeypatch):
+    EnvLoader.cache_clear()
+    monkeypatch.setenv("OTHER", "1")
+    source = EnvSource(allow=["attr2"], file=b"ATTR2=${OTHER}")
+    assert EnvLoader._get_env_vars(source) == {"attr2": "1"}
+    assert EnvLoader._get_env_vars(source) == {"attr2": "1"}
+
+    # parsed again with the changed environment
+    monkeypatch.setenv("OTHER", "2")
+    assert EnvLoader._get_env_vars(source) == {"attr2": "2"}
+
+
+def test_dotenv_cache_disabled(tmp_path):
+    EnvLoader.cache_clear()
+    env_file = tmp_path / "config.env"
+    env_file.write_text("ATTR2=1\n")
+    source = EnvSource(allow=["attr2"], file=env_file)
+    try:
+        EnvLoader.configure_cache(max_entries=0)
+        assert EnvLoader._get_env_vars(source) == {"attr2": "1"}
+        assert EnvLoader.cache_info().entries == 0
+    finally:
+        EnvLoader.configure_cache()
+
+
+def test_dotenv_directory(tmp_path):
+    source = EnvSource(allow_all=True, prefix="ATTR", file=tmp_path)
+    assert EnvLoader._get_env_vars(source) == {}
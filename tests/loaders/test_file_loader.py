@@ -1,9 +1,12 @@
 import sys
-from typing import List
+from typing import Any, List
 
 import pytest
+import yaml
+from pydantic import Field
 
 from confz import BaseConfig, FileSource, FileFormat
+from confz.cache import copy_tree
 from confz.exceptions import FileException
 from confz.loaders.file_loader import FileLoader
 from tests.assets import ASSET_FOLDER
@@ -131,6 +134,13 @@ def test_invalid_file():
         OuterConfig(config_sources=FileSource(file=ASSET_FOLDER / "non_existing.json"))
 
 
+def test_invalid_file_directory():
+    with pytest.raises(FileException):
+        OuterConfig(
+            config_sources=FileSource(file=ASSET_FOLDER, format=FileFormat.YAML)
+        )
+
+
 def test_invalid_file_str():
     with pytest.raises(FileException):
         OuterConfig(
@@ -219,6 +229,45 @@ def test_from_cl_arg_name(monkeypatch):
     assert config.attr2 == "2"
 
 
+def test_from_cl_arg_equal_sign(monkeypatch):
+    argv_backup = sys.argv.copy()
+    monkeypatch.setattr(
+        sys, "argv", argv_backup + ["--my_config_file=config.json", "config.yml"]
+    )
+    config = OuterConfig(
+        config_sources=FileSource(file_from_cl="--my_config_file", folder=ASSET_FOLDER)
+    )
+    assert config.inner.attr1 == "1 🎉"
+    assert config.attr2 == "2"
+
+
+def test_from_cl_arg_response_file(monkeypatch, tmp_path):
+    argv_backup = sys.argv.copy()
+    response_file = tmp_path / "args.txt"
+    response_file.write_text("--my_config_file\nconfig.json\n")
+    monkeypatch.setattr(sys, "argv", argv_backup + [f"@{response_file}"])
+    config = OuterConfig(
+        config_sources=FileSource(
+            file_from_cl="--my_config_file", folder=ASSET_FOLDER, response_files=True
+        )
+    )
+    assert config.attr2 == "2"
+    config = OuterConfig(
+        config_sources=FileSource(
+            file_from_cl=len(argv_backup) + 1,
+            folder=ASSET_FOLDER,
+            response_files=True,
+        )
+    )
+    assert config.attr2 == "2"
+    with pytest.raises(FileException):
+        OuterConfig(
+            config_sources=FileSource(
+                file_from_cl="--my_config_file", folder=ASSET_FOLDER
+            )
+        )
+
+
 def test_from_cl_arg_optional():
     # if not set, should load the config file without errors
     config = OuterConfig(
@@ -229,3 +278,210 @@ def test_from_cl_arg_optional():
     )
     assert config.inner.attr1 == "1 🎉"
     assert config.attr2 == "2"
+
+
+def test_cache_hit():
+    FileLoader.cache_clear()
+    source = FileSource(file=ASSET_FOLDER / "config.yml")
+    for _ in range(3):
+        config: dict = {}
+        FileLoader.populate_config(config, source)
+    assert config["inner"]["attr1"] == "1 🎉"
+    cache_info = FileLoader.cache_info()
+    assert cache_info.misses == 1
+    assert cache_info.hits == 2
+    assert cache_info.entries == 1
+
+
+def test_cache_invalidation(tmp_path):
+    FileLoader.cache_clear()
+    config_file = tmp_path / "config.json"
+    config_file.write_text('{"inner": {"attr1": "1"}, "attr2": "2"}')
+    config = OuterConfig(config_sources=FileSource(file=config_file))
+    assert config.inner.attr1 == "1"
+
+    config_file.write_text('{"inner": {"attr1": "10"}, "attr2": "20"}')
+    config = OuterConfig(config_sources=FileSource(file=config_file))
+    assert config.inner.attr1 == "10"
+    assert config.attr2 == "20"
+    assert FileLoader.cache_info().misses == 2
+    assert FileLoader.cache_info().entries == 1
+
+
+def test_cache_returns_copies():
+    FileLoader.cache_clear()
+    source = FileSource(file=ASSET_FOLDER / "config.yml")
+    config: dict = {}
+    FileLoader.populate_config(config, source)
+    config["inner"]["attr1"] = "changed"
+    config = {}
+    FileLoader.populate_config(config, source)
+    assert config["inner"]["attr1"] == "1 🎉"
+    assert FileLoader.cache_info().hits == 1
+
+
+def test_cache_eviction():
+    FileLoader.cache_clear()
+    try:
+        FileLoader.configure_cache(max_entries=1)
+        FileLoader.populate_config({}, FileSource(file=ASSET_FOLDER / "config.yml"))
+        FileLoader.populate_config({}, FileSource(file=ASSET_FOLDER / "config.json"))
+        assert FileLoader.cache_info().entries == 1
+        FileLoader.populate_config({}, FileSource(file=ASSET_FOLDER / "config.yml"))
+        assert FileLoader.cache_info().hits == 0
+
+        # files larger than the byte budget are not cached
+        FileLoader.configure_cache(max_bytes=1)
+        assert FileLoader.cache_info().entries == 0
+        FileLoader.populate_config({}, FileSource(file=ASSET_FOLDER / "config.yml"))
+        assert FileLoader.cache_info().entries == 0
+    finally:
+        FileLoader.configure_cache()
+
+
+def test_cache_copies_sets(tmp_path):
+    config_file = tmp_path / "config.yml"
+    config_file.write_text("values: !!set {a, b}")
+    source = FileSource(file=config_file)
+    config: dict = {}
+    FileLoader.populate_config(config, source)
+    config["values"].add("c")
+    config = {}
+    FileLoader.populate_config(config, source)
+    assert config["values"] == {"a", "b"}
+
+
+def test_copy_tree():
+    data = {"a": [{"b": {1}}], "c": (1, 2)}
+    copied = copy_tree(data)
+    assert copied == data
+    assert copied["a"][0] is not data["a"][0]
+    assert copied["a"][0]["b"] is not data["a"][0]["b"]
+    assert copied["c"] is data["c"]
+    assert copy_tree([1]) == [1]
+    assert copy_tree({1}) == {1}
+    assert copy_tree(1) == 1
+
+
+def test_instances_do_not_share_cached_data(tmp_path):
+    class AnyConfig(BaseConfig):
+        items: Any
+
+    config_file = tmp_path / "config.json"
+    config_file.write_text('{"items": [1, 2]}')
+    source = FileSource(file=config_file)
+    config = AnyConfig(config_sources=source)
+    config.items.append(3)
+    assert AnyConfig(config_sources=source).items == [1, 2]
+
+
+def test_yaml_backends():
+    assert FileLoader.yaml_backend(pure_python=True) == "pyyaml"
+    assert FileLoader.yaml_backend() in ("libyaml", "pyyaml")
+
+    config = OuterConfig(
+        config_sources=FileSource(file=ASSET_FOLDER / "config.yml", pure_python=True)
+    )
+    assert config == OuterConfig(
+        config_sources=FileSource(file=ASSET_FOLDER / "config.yml")
+    )
+
+
+def test_yaml_backends_are_safe():
+    content = b"attr: !!python/object/apply:os.getcwd []"
+    for pure_python in (True, False):
+        with pytest.raises(yaml.constructor.ConstructorError):
+            FileLoader.populate_config(
+                {},
+                FileSource(
+                    file=content, format=FileFormat.YAML, pure_python=pure_python
+                ),
+            )
+
+
+@pytest.mark.parametrize("suffix", ["json", "yml", "toml"])
+def test_select(suffix):
+    for select in ["inner", ["inner"]]:
+        config = InnerConfig(
+            config_sources=FileSource(
+                file=ASSET_FOLDER / f"config.{suffix}", select=select
+            )
+        )
+        assert config.attr1 == "1 🎉"
+
+
+def test_select_nested(tmp_path):
+    config_file = tmp_path / "config.yml"
+    config_file.write_text(
+        "services:\n"
+        "  a.b: {inner: {attr1: '1'}, attr2: '2'}\n"
+        "  other: {inner: {attr1: '3'}, attr2: '4'}\n"
+    )
+    source = FileSource(file=config_file, select=["services", "a.b"])
+    assert OuterConfig(config_sources=source).attr2 == "2"
+    source = FileSource(file=config_file, select="services.other.inner")
+    assert InnerConfig(config_sources=source).attr1 == "3"
+
+
+@pytest.mark.parametrize("suffix", ["json", "yml", "toml"])
+def test_select_missing(suffix):
+    source = FileSource(file=ASSET_FOLDER / f"config.{suffix}", select="inner.other")
+    with pytest.raises(FileException, match="Key path 'inner.other' not found"):
+        FileLoader.populate_config({}, source)
+
+    source = FileSource(
+        file=ASSET_FOLDER / f"config.{suffix}", select="other", optional=True
+    )
+    config: dict = {}
+    FileLoader.populate_config(config, source)
+    assert config == {}
+
+
+def test_select_bytes():
+    data = b'{"inner": {"attr1": "1"}, "attr2": "2"}'
+    source = FileSource(file=data, format=FileFormat.JSON, select="inner")
+    assert InnerConfig(config_sources=source).attr1 == "1"
+
+    source = FileSource(
+        file=data, format=FileFormat.JSON, select="other", optional=True
+    )
+    config: dict = {}
+    FileLoader.populate_config(config, source)
+    assert config == {}
+    with pytest.raises(FileException):
+        FileLoader.populate_config(
+            {}, FileSource(file=data, format=FileFormat.JSON, select="other")
+        )
+
+
+def test_select_fields(tmp_path):
+    class AliasConfig(BaseConfig):
+        attr1: str
+        attr2: str = Field(alias="attr-2")
+
+    config_file = tmp_path / "config.json"
+    config_file.write_text('{"attr1": "1", "attr-2": "2", "other": {"large": 3}}')
+    source = FileSource(file=config_file, select_fields=True)
+    config = AliasConfig(config_sources=source)
+    assert config.attr1 == "1"
+    assert config.attr2 == "2"
+
+    # without a config class, all keys are kept
+    config: dict = {}
+    FileLoader.populate_config(config, source)
+    assert config["other"] == {"large": 3}
+
+
+def test_select_cached():
+    FileLoader.cache_clear()
+    file = ASSET_FOLDER / "config.yml"
+    for source in [
+        FileSource(file=file),
+        FileSource(file=file, select="inner"),
+        FileSource(file=file, select="inner"),
+    ]:
+        config: dict = {}
+        FileLoader.populate_config(config, source)
+    assert config == {"attr1": "1 🎉"}
+    assert FileLoader.cache_info().misses == 2
+    assert FileLoader.cache_info().hits == 1
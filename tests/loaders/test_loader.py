@@ -1,3 +1,4 @@
+import random
 from dataclasses import dataclass
 
 import pytest
@@ -5,6 +6,7 @@ import pytest
 from confz import BaseConfig, DataSource, ConfigSource, EnvSource
 from confz.exceptions import UpdateException, ConfigException
 from confz.loaders import Loader, register_loader
+from confz.loaders.loader import digest
 
 
 class InnerConfig(BaseConfig):
@@ -50,6 +52,129 @@ def test_update_dict_recursively():
     assert config.attr2 == 4
 
 
+def test_update_dict_copy_on_write():
+    data = {"inner": {"attr1": 1, "nested": {"a": 1}}, "other": {"b": 2}}
+    config = OuterConfig(
+        config_sources=[
+            DataSource(data=data),
+            DataSource(data={"inner": {"attr1": 3, "nested": {"c": 3}}, "attr2": 4}),
+        ]
+    )
+    assert config.inner.attr1 == 3
+    assert data == {"inner": {"attr1": 1, "nested": {"a": 1}}, "other": {"b": 2}}
+
+    original = {"inner": data["inner"], "other": data["other"]}
+    update = {"inner": {"nested": {"c": 3}}}
+    Loader.update_dict_recursively(original, update)
+    assert original["inner"]["nested"] == {"a": 1, "c": 3}
+    assert original["inner"] is not data["inner"]
+    assert original["other"] is data["other"]  # untouched, so shared
+    assert data["inner"]["nested"] == {"a": 1}
+    assert update == {"inner": {"nested": {"c": 3}}}
+
+    # the update is shared as well, but never modified by later updates
+    Loader.update_dict_recursively(original, {"new": {"d": 4}})
+    Loader.update_dict_recursively(original, {"new": {"e": 5}})
+    assert original["new"] == {"d": 4, "e": 5}
+
+
+@dataclass
+class ModifyingSource(ConfigSource):
+    pass
+
+
+class ModifyingLoader(Loader):
+    @classmethod
+    def populate_config(cls, config: dict, config_source: ModifyingSource):
+        config["inner"]["attr1"] = 2
+        config["inner"]["values"].append(2)
+        config["inner"]["tags"].add("b")
+
+
+register_loader(ModifyingSource, ModifyingLoader)
+
+
+def test_loader_modifying_config():
+    data = {"inner": {"attr1": 1, "values": [1], "tags": {"a"}}, "attr2": 2}
+    config = OuterConfig(config_sources=[DataSource(data=data), ModifyingSource()])
+    assert config.inner.attr1 == 2
+    assert data == {"inner": {"attr1": 1, "values": [1], "tags": {"a"}}, "attr2": 2}
+
+
+def test_update_dict_deep():
+    depth = 10_000
+    original: dict = {}
+    update: dict = {}
+    current_original, current_update = original, update
+    for _ in range(depth):
+        current_original["a"] = {}
+        current_update["a"] = {}
+        current_original, current_update = current_original["a"], current_update["a"]
+    current_update["b"] = 1
+
+    Loader.update_dict_recursively(original, update)
+    for _ in range(depth):
+        original = original["a"]
+    assert original == {"b": 1}
+
+
+def _transform_nested_dicts_reference(dict_in: dict, separator: str) -> dict:
+    dict_out: dict = {}
+    for key, value in dict_in.items():
+        if separator in key and not key.startswith(separator):
+            inner_keys = key.split(separator)
+            dict_inner = dict_out
+            for inner_key in inner_keys[:-1]:
+                if inner_key not in dict_inner:
+                    dict_inner[inner_key] = {}
+                elif not isinstance(dict_inner[inner_key], dict):
+                    raise UpdateException(
+                        f"Config variables contradict each other: Key "
+                        f"'{inner_key}' is both a value and a nested dict."
+                    )
+                dict_inner = dict_inner[inner_key]
+            dict_inner[inner_keys[-1]] = value
+        else:
+            dict_out[key] = value
+    return dict_out
+
+
+def _transform_result(transform, dict_in: dict, separator: str):
+    try:
+        return transform(dict_in, separator)
+    except UpdateException as e:
+        return str(e)
+
+
+@pytest.mark.parametrize("separator", [".", "__", "aba", "ab"])
+def test_transform_nested_dicts(separator):
+    rng = random.Random(separator)
+    parts = ["a", "b", "", "_", "x" + separator, separator + "y"]
+    for _ in range(500):
+        dict_in = {}
+        for idx in range(rng.randint(1, 12)):
+            key = separator.join(rng.choice(parts) for _ in range(rng.randint(1, 4)))
+            dict_in[key] = idx
+        assert _transform_result(
+            Loader.transform_nested_dicts, dict_in, separator
+        ) == _transform_result(_transform_nested_dicts_reference, dict_in, separator)
+
+
+def test_transform_nested_dicts_overwrite():
+    assert Loader.transform_nested_dicts({"a.b.c": 1, "a.b": 2, "a.d": 3}) == {
+        "a": {"b": 2, "d": 3}
+    }
+    with pytest.raises(UpdateException, match="Key 'b' is both"):
+        Loader.transform_nested_dicts({"a.b.c": 1, "a.b": 2, "a.b.c.d": 3})
+    with pytest.raises(UpdateException, match="Key 'a' is both"):
+        Loader.transform_nested_dicts({"a.b.c": 1, "a": 2, "a.b.d": 3})
+    assert Loader.transform_nested_dicts({".a.b": 1, "a__b": 2}) == {
+        ".a.b": 1,
+        "a__b": 2,
+    }
+    assert Loader.transform_nested_dicts({"a___b": 1}, "__") == {"a": {"_b": 1}}
+
+
 def test_dict_contradiction(monkeypatch):
     with pytest.raises(UpdateException):
         OuterConfig(
@@ -75,3 +200,10 @@ def test_unregistered_source():
 
     with pytest.raises(ConfigException):
         InnerConfig(config_sources=CustomSource2(), attr1=2)
+
+
+def test_digest():
+    assert digest({"a": [1, 2]}) == digest({"a": [1, 2]})
+    assert digest({"a": [1, 2]}) != digest({"a": [1], "b": 2})
+    assert digest([1, [2]]) != digest([[1], 2])
+    assert digest(DataSource(data={"a": 1})) != digest(DataSource(data={"a": 2}))
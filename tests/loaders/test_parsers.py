@@ -0,0 +1,184 @@
+import io
+import json
+
+import pytest
+import toml
+
+from confz import BaseConfig, FileSource, FileFormat
+from confz.exceptions import FileException
+from confz.loaders import Parser, register_parser, get_parser
+from confz.loaders import parsers
+from tests.assets import ASSET_FOLDER
+
+
+class InnerConfig(BaseConfig):
+    attr1: str
+
+
+class OuterConfig(BaseConfig):
+    attr2: str
+    inner: InnerConfig
+
+
+@pytest.fixture
+def parser_registry(monkeypatch):
+    registry = {key: value.copy() for key, value in parsers._parsers.items()}
+    monkeypatch.setattr(parsers, "_parsers", registry)
+    monkeypatch.setattr(parsers, "_selected_parsers", {})
+
+
+@pytest.mark.parametrize(
+    "file_format,file_name",
+    [
+        (FileFormat.JSON, "config.json"),
+        (FileFormat.YAML, "config.yml"),
+        (FileFormat.TOML, "config.toml"),
+    ],
+)
+def test_identical_results(file_format, file_name):
+    results = []
+    for parser in parsers._parsers[file_format]:
+        if parser.is_available():
+            with (ASSET_FOLDER / file_name).open(encoding="utf-8") as stream:
+                results.append(parser.parse(stream))
+    assert len(results) >= 2
+    assert all(result == results[0] for result in results)
+
+
+@pytest.mark.parametrize(
+    "content", ['{"big": 100000000000000000000000}', '{"nan": NaN, "inf": Infinity}']
+)
+def test_json_fallback(tmp_path, content):
+    config_file = tmp_path / "config.json"
+    config_file.write_text(content)
+    for parser in parsers._parsers[FileFormat.JSON]:
+        if parser.is_available():
+            with config_file.open(encoding="utf-8") as stream:
+                assert repr(parser.parse(stream)) == repr(json.loads(content))
+
+
+def test_toml_errors(tmp_path):
+    config_file = tmp_path / "config.toml"
+    config_file.write_text("invalid = = toml")
+    for parser in parsers._parsers[FileFormat.TOML]:
+        if parser.is_available():
+            with config_file.open(encoding="utf-8") as stream:
+                with pytest.raises(toml.TomlDecodeError):
+                    parser.parse(stream)
+
+
+def test_pure_python():
+    for file_format in FileFormat:
+        assert get_parser(file_format, pure_python=True).pure_python
+
+
+def test_register_parser(parser_registry):
+    calls = []
+
+    def parse(stream):
+        calls.append(stream.read())
+        return {"inner": {"attr1": "custom"}, "attr2": "2"}
+
+    register_parser(FileFormat.JSON, Parser("custom", parse))
+    register_parser(
+        FileFormat.JSON, Parser("unavailable", parse, is_available=lambda: False)
+    )
+    register_parser(FileFormat.JSON, Parser("last", parse), position=None)
+    assert get_parser(FileFormat.JSON).name == "custom"
+    assert get_parser(FileFormat.JSON, pure_python=True).name == "json"
+
+    config = OuterConfig(
+        config_sources=FileSource(file=b'{"attr2": "1"}', format=FileFormat.JSON)
+    )
+    assert config.inner.attr1 == "custom"
+    assert calls == ['{"attr2": "1"}']
+
+
+def test_unknown_format():
+    with pytest.raises(FileException):
+        get_parser("unknown")
+
+
+SELECT_DOCUMENTS = [
+    '{"a": {"b": {"c": 1, "d": [1, 2]}, "e": "x"}, "f": null}',
+    '{"a": {"b": 1}, "a": {"c": 2}}',
+    '{"a": 1, "a": {"b": {"c": 3}}}',
+    '{"a": {"b": 1}, "a": 2}',
+    '{"a": [{"b": 1}], "b": {}}',
+    '{ "a" : { "b" : true , "c\\"": "\\u00e4" } }',
+    "{}",
+    "[1, 2]",
+    "1",
+]
+SELECT_PATHS = [[], ["a"], ["a", "b"], ["a", "b", "c"], ["a", "c"], ["b"], ["x"]]
+
+
+def _select_reference(content, path, keys):
+    try:
+        return parsers.select_subtree(json.loads(content), path, keys)
+    except KeyError:
+        return KeyError
+
+
+def _select(parser, content, path, keys):
+    try:
+        return parser.select(io.StringIO(content), path, keys)
+    except KeyError:
+        return KeyError
+
+
+@pytest.mark.parametrize("file_format", [FileFormat.JSON, FileFormat.YAML])
+@pytest.mark.parametrize("content", SELECT_DOCUMENTS)
+def test_select(file_format, content):
+    # JSON documents are also YAML documents
+    for parser in parsers._parsers[file_format]:
+        if parser.is_available():
+            for path in SELECT_PATHS:
+                for keys in [None, {"b", 'c"', "x"}]:
+                    expected = _select_reference(content, path, keys)
+                    assert _select(parser, content, path, keys) == expected
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "a:\n  b: &anchor {c: 1}\n  d: *anchor\n",
+        "x: &anchor {c: 1}\na:\n  b: *anchor\n  d: 2\n",
+        "x: [&anchor {c: 1}]\na:\n  b: *anchor\n",
+        "x: &anchor {b: 1}\na:\n  <<: *anchor\n  d: 2\n",
+        "a: &anchor\n  b: {c: 1}\nx: *anchor\n",
+        "1: 1\na: {b: 2, 1: 3}\n",
+        "a: !!map {b: !!str 1}\n",
+        "",
+    ],
+)
+def test_select_yaml(content):
+    for parser in parsers._parsers[FileFormat.YAML]:
+        if parser.is_available():
+            for path in [[], ["a"], ["a", "b"], ["a", "d"]]:
+                for keys in [None, {"b"}]:
+                    try:
+                        data = parser.parse(io.StringIO(content))
+                        expected = parsers.select_subtree(data, path, keys)
+                    except KeyError:
+                        expected = KeyError
+                    assert _select(parser, content, path, keys) == expected
+
+
+def test_select_yaml_single_document():
+    import yaml
+
+    for parser in parsers._parsers[FileFormat.YAML]:
+        if parser.is_available():
+            with pytest.raises(yaml.composer.ComposerError):
+                parser.select(io.StringIO("a: 1\n---\na: 2\n"), ["a"], None)
+
+
+@pytest.mark.parametrize(
+    "content", ['{"a": 1', '{"a" 1}', '{"a": 1 "b": 2}', "{1: 2}", '{"a": 1} 2']
+)
+def test_select_json_errors(content):
+    for parser in parsers._parsers[FileFormat.JSON]:
+        if parser.is_available():
+            with pytest.raises(json.JSONDecodeError):
+                parser.select(io.StringIO(content), ["a"], None)
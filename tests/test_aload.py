@@ -0,0 +1,250 @@
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+import pytest
+from pydantic import ValidationError
+
+from confz import BaseConfig, ConfigSource, DataSource
+from confz.base_config import _get_class_lock
+from confz.exceptions import ConfigException
+from confz.loaders import Loader, register_loader
+from confz.loaders.loader import digest
+
+
+@dataclass
+class ThreadSource(ConfigSource):
+    data: dict
+    delay: float = 0.0
+    threads: list = field(default_factory=list, compare=False, repr=False)
+
+
+class ThreadLoader(Loader):
+    @classmethod
+    def fingerprint(cls, config_source: ThreadSource) -> Optional[str]:
+        return digest(config_source, time.perf_counter())  # never cached
+
+    @classmethod
+    def populate_config(cls, config: dict, config_source: ThreadSource):
+        config_source.threads.append(threading.get_ident())
+        time.sleep(config_source.delay)
+        cls.update_dict_recursively(config, config_source.data)
+
+
+@dataclass
+class AsyncSource(ConfigSource):
+    data: dict
+    calls: list = field(default_factory=list, compare=False, repr=False)
+    error: Optional[str] = None
+    cached: bool = False
+
+
+class AsyncLoader(Loader):
+    @classmethod
+    def fingerprint(cls, config_source: AsyncSource) -> Optional[str]:
+        return digest(config_source) if config_source.cached else None
+
+    @classmethod
+    def populate_config(cls, config: dict, config_source: AsyncSource):
+        raise NotImplementedError  # pragma: no cover
+
+    @classmethod
+    async def apopulate_config(cls, config: dict, config_source: AsyncSource):
+        config_source.calls.append(threading.get_ident())
+        await asyncio.sleep(0.01)
+        if config_source.error is not None:
+            raise ConfigException(config_source.error)
+        cls.update_dict_recursively(config, config_source.data)
+
+
+@dataclass
+class PlainSource(ConfigSource):
+    data: dict
+    threads: list = field(default_factory=list, compare=False, repr=False)
+
+
+class PlainLoader(Loader):
+    @classmethod
+    def populate_config(cls, config: dict, config_source: PlainSource):
+        config_source.threads.append(threading.get_ident())
+        cls.update_dict_recursively(config, config_source.data)
+
+
+register_loader(ThreadSource, ThreadLoader)
+register_loader(PlainSource, PlainLoader)
+register_loader(AsyncSource, AsyncLoader)
+
+
+class AsyncConfig(BaseConfig):
+    attr1: int
+    attr2: int = 0
+
+
+@pytest.mark.asyncio
+async def test_aload():
+    # kwargs only
+    assert (await AsyncConfig.aload(attr1=1)).attr1 == 1
+    with pytest.raises(ValidationError):
+        await AsyncConfig.aload()
+
+    # explicit sources, loaded in a thread
+    source = ThreadSource(data={"attr1": 1}, delay=0.01)
+    config = await AsyncConfig.aload(config_sources=source, attr2=2)
+    assert config.attr1 == 1
+    assert config.attr2 == 2
+    assert source.threads[0] != threading.get_ident()
+
+    # loaders without fingerprint use the default adapter
+    source = PlainSource(data={"attr1": 3})
+    assert (await AsyncConfig.aload(config_sources=source)).attr1 == 3
+    assert source.threads[0] != threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_no_blocking():
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    ticker = asyncio.ensure_future(tick())
+    await AsyncConfig.aload(config_sources=ThreadSource(data={"attr1": 1}, delay=0.1))
+    ticker.cancel()
+    assert ticks > 5
+
+
+@pytest.mark.asyncio
+async def test_native_async():
+    source = AsyncSource(data={"attr1": 1})
+    config = await AsyncConfig.aload(config_sources=[source, DataSource(data={})])
+    assert config.attr1 == 1
+    assert source.calls == [threading.get_ident()]
+
+    source = AsyncSource(data={"attr1": 2}, cached=True)
+    for _ in range(2):
+        assert (await AsyncConfig.aload(config_sources=source)).attr1 == 2
+    assert len(source.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_singleton():
+    source = AsyncSource(data={"attr1": 1})
+
+    class SingletonConfig(AsyncConfig):
+        CONFIG_SOURCES = source
+
+    with pytest.raises(ConfigException):
+        await SingletonConfig.aload(attr1=1)
+
+    instances = await asyncio.gather(*[SingletonConfig.aload() for _ in range(10)])
+    assert len(source.calls) == 1
+    assert all(instance is instances[0] for instance in instances)
+    assert await SingletonConfig.aload() is instances[0]
+    assert SingletonConfig() is instances[0]
+
+
+@pytest.mark.asyncio
+async def test_singleton_shared_with_sync():
+    class SharedConfig(AsyncConfig):
+        CONFIG_SOURCES = ThreadSource(data={"attr1": 1}, delay=0.05)
+
+    # the synchronous load holds the lock, the async load has to wait for it
+    thread = threading.Thread(target=SharedConfig)
+    thread.start()
+    await asyncio.sleep(0.01)
+    instance = await SharedConfig.aload()
+    thread.join()
+    assert instance is SharedConfig()
+
+
+@pytest.mark.asyncio
+async def test_singleton_lock_held():
+    class LockedConfig(AsyncConfig):
+        CONFIG_SOURCES = DataSource(data={"attr1": 1})
+
+    lock = _get_class_lock(LockedConfig)
+    locked = threading.Event()
+    release = threading.Event()
+
+    def hold_lock():
+        with lock:
+            locked.set()
+            release.wait()
+
+    thread = threading.Thread(target=hold_lock)
+    thread.start()
+    locked.wait()
+    task = asyncio.ensure_future(LockedConfig.aload())
+    await asyncio.sleep(0.05)
+    assert not task.done()
+    release.set()
+    instance = await task
+    thread.join()
+    assert instance is LockedConfig()
+
+
+@pytest.mark.asyncio
+async def test_singleton_error():
+    source = AsyncSource(data={"attr1": 1}, error="failed")
+
+    class FailingConfig(AsyncConfig):
+        CONFIG_SOURCES = source
+
+    results = await asyncio.gather(
+        *[FailingConfig.aload() for _ in range(5)], return_exceptions=True
+    )
+    assert all(isinstance(result, ConfigException) for result in results)
+    assert len(source.calls) == 1
+
+    # errors are not cached
+    source.error = None
+    assert (await FailingConfig.aload()).attr1 == 1
+    assert len(source.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_singleton_change_sources():
+    class ChangingConfig(AsyncConfig):
+        CONFIG_SOURCES = AsyncSource(data={"attr1": 1})
+
+    pending = asyncio.ensure_future(ChangingConfig.aload())
+    await asyncio.sleep(0)
+    with ChangingConfig.change_config_sources(DataSource(data={"attr1": 10})):
+        assert (await pending).attr1 == 1
+        assert (await ChangingConfig.aload()).attr1 == 10
+    assert (await ChangingConfig.aload()).attr1 == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("concurrent", [False, True])
+async def test_concurrent(monkeypatch, concurrent):
+    monkeypatch.setattr(AsyncConfig, "CONFIG_CONCURRENT_LOADING", concurrent)
+    sources = [
+        ThreadSource(data={"attr1": 1}, delay=0.05),
+        AsyncSource(data={"attr1": 2}),
+        DataSource(data={"attr2": 3}),
+    ]
+    config = await AsyncConfig.aload(config_sources=sources)
+    assert config.attr1 == 2
+    assert config.attr2 == 3
+
+    sources = [
+        ThreadSource(data={"attr1": 1}, delay=0.05),
+        AsyncSource(data={}, error="first"),
+        AsyncSource(data={}, error="second"),
+    ]
+    with pytest.raises(ConfigException, match="first"):
+        await AsyncConfig.aload(config_sources=sources)
+
+
+@pytest.mark.asyncio
+async def test_snapshot(monkeypatch, tmp_path):
+    monkeypatch.setattr(AsyncConfig, "CONFIG_SNAPSHOT_DIR", tmp_path)
+    config = await AsyncConfig.aload(config_sources=DataSource(data={"attr1": 1}))
+    assert config.attr1 == 1
+    assert len(list(tmp_path.iterdir())) == 1
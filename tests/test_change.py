@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 
 from confz import BaseConfig, DataSource, depends_on
@@ -101,6 +103,108 @@ async def test_depends_async():
     assert my_fn_sync() is my_fn_sync()
 
 
+@pytest.mark.asyncio
+async def test_depends_async_single_flight():
+    calls = []
+
+    @depends_on
+    async def my_fn():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    results = await asyncio.gather(*[my_fn() for _ in range(20)])
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert await my_fn() is results[0]
+
+
+@pytest.mark.asyncio
+async def test_depends_async_error():
+    calls = []
+
+    @depends_on
+    async def my_fn():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        if len(calls) == 1:
+            raise RuntimeError("failed")
+        return "val"
+
+    results = await asyncio.gather(*[my_fn() for _ in range(5)], return_exceptions=True)
+    assert len(calls) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    # errors are not cached
+    assert await my_fn() == "val"
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_depends_async_cancel():
+    @depends_on
+    async def my_fn():
+        await asyncio.sleep(0.01)
+        return "val"
+
+    # a cancelled caller does not cancel the shared execution
+    waiter = asyncio.ensure_future(my_fn())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    assert await my_fn() == "val"
+
+
+@pytest.mark.asyncio
+async def test_depends_async_change():
+    @depends_on(Config1)
+    async def my_fn():
+        config = Config1()
+        await asyncio.sleep(0.01)
+        return config
+
+    pending = asyncio.ensure_future(my_fn())
+    await asyncio.sleep(0.001)
+    with Config1.change_config_sources(DataSource(data={"attr": 10})):
+        # pending execution of before the change is not used
+        assert (await my_fn()).attr == 10
+        assert (await pending).attr == 1
+        assert (await my_fn()).attr == 10
+    assert (await my_fn()).attr == 1
+
+    # pending execution restored after the change
+    Config1.listeners[-1].reset()
+    pending = asyncio.ensure_future(my_fn())
+    await asyncio.sleep(0.001)
+    with Config1.change_config_sources(DataSource(data={"attr": 10})):
+        assert (await my_fn()).attr == 10
+    assert (await my_fn()).attr == 1
+    assert await pending is await my_fn()
+
+
+@pytest.mark.asyncio
+async def test_depends_async_error_during_change():
+    calls = []
+
+    @depends_on(Config1)
+    async def my_fn():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        if len(calls) == 1:
+            raise RuntimeError("failed")
+        return "val"
+
+    pending = asyncio.ensure_future(my_fn())
+    await asyncio.sleep(0.001)
+    with Config1.change_config_sources(DataSource(data={"attr": 10})):
+        with pytest.raises(RuntimeError):
+            await pending
+
+    # the failed execution is not restored after the change
+    assert await my_fn() == "val"
+    assert await my_fn() == "val"
+    assert len(calls) == 2
+
+
 def test_depends_invalid():
     with pytest.raises(ValueError):
 
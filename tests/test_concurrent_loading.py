@@ -0,0 +1,148 @@
+import contextvars
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+import pytest
+
+from confz import BaseConfig, ConfigSource, DataSource
+from confz.exceptions import ConfigException
+from confz.loaders import Loader, register_loader
+from confz.loaders.loader import digest
+
+request_id: contextvars.ContextVar[str] = contextvars.ContextVar("request_id")
+
+
+@dataclass
+class DelayedSource(ConfigSource):
+    data: dict
+    delay: float = 0.0
+    error: Optional[str] = None
+    threads: list = field(default_factory=list, compare=False, repr=False)
+
+
+class DelayedLoader(Loader):
+    @classmethod
+    def fingerprint(cls, config_source: DelayedSource) -> Optional[str]:
+        return digest(config_source, time.perf_counter())  # never cached
+
+    @classmethod
+    def populate_config(cls, config: dict, config_source: DelayedSource):
+        config_source.threads.append(threading.get_ident())
+        time.sleep(config_source.delay)
+        if config_source.error is not None:
+            raise ConfigException(config_source.error)
+        data = {
+            key: request_id.get(value) if value == "request_id" else value
+            for key, value in config_source.data.items()
+        }
+        cls.update_dict_recursively(config, data)
+
+
+@dataclass
+class AccumulatedSource(ConfigSource):
+    seen: list
+
+
+class AccumulatedLoader(Loader):
+    @classmethod
+    def populate_config(cls, config: dict, config_source: AccumulatedSource):
+        config_source.seen.append(dict(config))
+        cls.update_dict_recursively(config, {"attr3": "3"})
+
+
+register_loader(DelayedSource, DelayedLoader)
+register_loader(AccumulatedSource, AccumulatedLoader)
+
+
+class ConcurrentConfig(BaseConfig):
+    attr1: str
+    attr2: str
+    attr3: str = "0"
+
+    CONFIG_CONCURRENT_LOADING = True
+
+
+def test_concurrent():
+    sources = [
+        DelayedSource(data={"attr1": "1", "attr2": "1"}, delay=0.1),
+        DelayedSource(data={"attr2": "2"}, delay=0.1),
+        DelayedSource(data={"attr2": "3"}, delay=0.1),
+        DelayedSource(data={"attr2": "4"}, delay=0.01),
+    ]
+    start = time.perf_counter()
+    config = ConcurrentConfig(config_sources=sources)
+    assert time.perf_counter() - start < 0.25
+    assert config.attr1 == "1"
+    assert config.attr2 == "4"  # declared order, not the order of completion
+    assert len({source.threads[0] for source in sources}) > 1
+
+
+def test_global(monkeypatch):
+    class GlobalConfig(BaseConfig):
+        attr1: str
+
+    sources = [DelayedSource(data={"attr1": "1"}), DelayedSource(data={"attr1": "2"})]
+    GlobalConfig(config_sources=sources)
+    assert {source.threads[0] for source in sources} == {threading.get_ident()}
+
+    monkeypatch.setattr(BaseConfig, "CONFIG_CONCURRENT_LOADING", True)
+    sources = [
+        DelayedSource(data={"attr1": "1"}, delay=0.05),
+        DelayedSource(data={"attr1": "2"}, delay=0.05),
+    ]
+    assert GlobalConfig(config_sources=sources).attr1 == "2"
+    assert len({source.threads[0] for source in sources}) == 2
+
+
+@pytest.mark.parametrize("concurrent", [False, True])
+def test_first_error(monkeypatch, concurrent):
+    monkeypatch.setattr(ConcurrentConfig, "CONFIG_CONCURRENT_LOADING", concurrent)
+    sources = [
+        DelayedSource(data={"attr1": "1"}),
+        DelayedSource(data={}, delay=0.05, error="first"),
+        DelayedSource(data={}, error="second"),
+        DataSource(data={"attr1": "1", "attr2": "2"}),
+    ]
+    with pytest.raises(ConfigException, match="first"):
+        ConcurrentConfig(config_sources=sources)
+
+
+def test_unknown_source():
+    @dataclass
+    class UnknownSource(ConfigSource):
+        pass
+
+    with pytest.raises(ConfigException, match="Unknown config source type"):
+        ConcurrentConfig(
+            config_sources=[DataSource(data={"attr1": "1"}), UnknownSource()]
+        )
+
+
+def test_sources_without_fingerprint():
+    seen: list = []
+    config = ConcurrentConfig(
+        config_sources=[
+            DelayedSource(data={"attr1": "1"}, delay=0.01),
+            AccumulatedSource(seen=seen),
+            DelayedSource(data={"attr2": "2"}),
+        ]
+    )
+    assert seen == [{"attr1": "1"}]
+    assert config.attr3 == "3"
+
+
+def test_context():
+    token = request_id.set("abc")
+    try:
+        config = ConcurrentConfig(
+            config_sources=[
+                DelayedSource(data={"attr1": "request_id"}, delay=0.01),
+                DelayedSource(data={"attr2": "request_id"}, delay=0.01),
+            ]
+        )
+    finally:
+        request_id.reset(token)
+    assert config.attr1 == "abc"
+    assert config.attr2 == "abc"
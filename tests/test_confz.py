@@ -1,8 +1,13 @@
+import threading
+import time
+from dataclasses import dataclass
+
 import pytest
 from pydantic import ValidationError
 
-from confz import BaseConfig, DataSource
+from confz import BaseConfig, ConfigSource, DataSource
 from confz.exceptions import ConfigException
+from confz.loaders import Loader, register_loader
 
 
 class InnerConfig(BaseConfig):
@@ -91,3 +96,75 @@ def test_init_arg():
         config_sources=DataSource(data={"inner": {"attr1": 1}, "attr2": 2}),
     )
     assert config.attr5 == 5
+
+
+@dataclass
+class SlowSource(ConfigSource):
+    calls: list
+
+
+class SlowLoader(Loader):
+    @classmethod
+    def populate_config(cls, config: dict, config_source: SlowSource):
+        config_source.calls.append(threading.get_ident())
+        time.sleep(0.05)
+        cls.update_dict_recursively(config, {"attr2": 2, "inner": {"attr1": 1}})
+
+
+register_loader(SlowSource, SlowLoader)
+
+
+def test_singleton_threads():
+    calls: list = []
+
+    class SingletonConfig(OuterConfig):
+        CONFIG_SOURCES = SlowSource(calls=calls)
+
+    barrier = threading.Barrier(32)
+    instances = []
+
+    def create():
+        barrier.wait()
+        instances.append(SingletonConfig())
+
+    threads = [threading.Thread(target=create) for _ in range(32)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(instances) == 32
+    assert all(instance is instances[0] for instance in instances)
+
+
+def test_singleton_threads_error():
+    calls: list = []
+
+    class FailingConfig(OuterConfig):
+        attr3: int
+        CONFIG_SOURCES = SlowSource(calls=calls)
+
+    errors = []
+
+    def create():
+        try:
+            FailingConfig()
+        except ValidationError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=create) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # failed loads are not cached, so every thread tries on its own
+    assert len(errors) == 4
+    assert len(calls) == 4
+    assert FailingConfig.confz_instance is None
+
+    # adjust config sources so other tests validating all configs don't fail
+    FailingConfig.CONFIG_SOURCES = DataSource(
+        data={"inner": {"attr1": 1}, "attr2": 2, "attr3": 3}
+    )
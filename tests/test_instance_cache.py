@@ -0,0 +1,137 @@
+import time
+from dataclasses import dataclass
+
+import pytest
+
+from confz import BaseConfig, ConfigSource, DataSource, FileSource
+from confz.loaders import Loader, register_loader
+
+
+class InnerConfig(BaseConfig):
+    attr1: int
+
+
+class CachedConfig(BaseConfig):
+    attr2: int
+    inner: InnerConfig
+
+    CONFIG_INSTANCE_CACHE_SIZE = 2
+
+
+@dataclass
+class UnknownSource(ConfigSource):
+    pass
+
+
+class UnknownLoader(Loader):
+    @classmethod
+    def populate_config(cls, config: dict, config_source: UnknownSource):
+        cls.update_dict_recursively(config, {"attr2": 2})
+
+
+register_loader(UnknownSource, UnknownLoader)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    CachedConfig.instance_cache_clear()
+    yield
+    CachedConfig.instance_cache_clear()
+
+
+def test_cache_hit():
+    source = DataSource(data={"attr2": 2})
+    config = CachedConfig(config_sources=source, inner={"attr1": 1})
+    assert CachedConfig(config_sources=source, inner={"attr1": 1}) is config
+    assert CachedConfig(config_sources=[source], inner={"attr1": 1}) is config
+    assert CachedConfig.instance_cache_info().hits == 2
+
+    # other sources or keyword arguments are separate entries
+    other = CachedConfig(config_sources=source, inner={"attr1": 3})
+    assert other is not config
+    assert other.inner.attr1 == 3
+    other = CachedConfig(
+        config_sources=DataSource(data={"attr2": 4}), inner={"attr1": 1}
+    )
+    assert other.attr2 == 4
+    cache_info = CachedConfig.instance_cache_info()
+    assert cache_info.misses == 3
+    assert cache_info.entries == 2
+    assert cache_info.max_entries == 2
+
+
+def test_cache_file_changes(tmp_path):
+    config_file = tmp_path / "config.json"
+    config_file.write_text('{"attr2": 2, "inner": {"attr1": 1}}')
+    source = FileSource(file=config_file)
+    config = CachedConfig(config_sources=source)
+    assert CachedConfig(config_sources=source) is config
+
+    config_file.write_text('{"attr2": 20, "inner": {"attr1": 1}}')
+    changed = CachedConfig(config_sources=source)
+    assert changed.attr2 == 20
+    assert CachedConfig(config_sources=source) is changed
+    cache_info = CachedConfig.instance_cache_info()
+    assert cache_info.hits == 2
+    assert cache_info.entries == 1
+
+
+def test_no_fingerprint():
+    source = UnknownSource()
+    config = CachedConfig(config_sources=source, inner={"attr1": 1})
+    assert CachedConfig(config_sources=source, inner={"attr1": 1}) is not config
+    assert CachedConfig.instance_cache_info().entries == 0
+
+
+def test_ttl(monkeypatch):
+    monkeypatch.setattr(CachedConfig, "CONFIG_INSTANCE_CACHE_TTL", 0.05)
+    source = DataSource(data={"attr2": 2, "inner": {"attr1": 1}})
+    config = CachedConfig(config_sources=source)
+    assert CachedConfig(config_sources=source) is config
+    time.sleep(0.1)
+    assert CachedConfig(config_sources=source) is not config
+
+
+def test_disabled():
+    class UncachedConfig(BaseConfig):
+        attr2: int
+
+    source = DataSource(data={"attr2": 2})
+    assert UncachedConfig(config_sources=source) is not UncachedConfig(
+        config_sources=source
+    )
+    assert UncachedConfig.instance_cache_info().max_entries == 0
+    UncachedConfig.instance_cache_clear()
+
+
+def test_reconfigure(monkeypatch):
+    source = DataSource(data={"attr2": 2, "inner": {"attr1": 1}})
+    CachedConfig(config_sources=source)
+    monkeypatch.setattr(CachedConfig, "CONFIG_INSTANCE_CACHE_SIZE", 5)
+    CachedConfig(config_sources=source)
+    cache_info = CachedConfig.instance_cache_info()
+    assert cache_info.max_entries == 5
+    assert cache_info.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_aload():
+    source = DataSource(data={"attr2": 2, "inner": {"attr1": 1}})
+    config = await CachedConfig.aload(config_sources=source)
+    assert await CachedConfig.aload(config_sources=source) is config
+    assert CachedConfig(config_sources=source) is config
+
+    config = await CachedConfig.aload(
+        config_sources=UnknownSource(), inner=config.inner
+    )
+    assert config.attr2 == 2
+    assert CachedConfig.instance_cache_info().hits == 2
+
+
+def test_objects_as_kwargs():
+    # arbitrary objects could have equal representations, so they are not cached
+    source = DataSource(data={"attr2": 2})
+    inner = InnerConfig(attr1=1)
+    config = CachedConfig(config_sources=source, inner=inner)
+    assert CachedConfig(config_sources=source, inner=inner) is not config
+    assert CachedConfig.instance_cache_info().entries == 0
@@ -0,0 +1,183 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import pytest
+
+from confz import BaseConfig, ConfigSource, DataSource, EnvSource, FileSource
+from confz.config_source import FileFormat
+from confz.instrumentation import Event, Recorder, add_hook, remove_hook
+from confz.loaders import Loader, register_loader
+from confz.loaders.file_loader import FileLoader
+
+
+@dataclass
+class PlainSource(ConfigSource):
+    pass
+
+
+class PlainLoader(Loader):
+    @classmethod
+    def populate_config(cls, config: dict, config_source: PlainSource):
+        cls.update_dict_recursively(config, {"attr2": "2"})
+
+
+@dataclass
+class AsyncSource(ConfigSource):
+    pass
+
+
+class AsyncLoader(Loader):
+    @classmethod
+    def fingerprint(cls, config_source: AsyncSource) -> Optional[str]:
+        return "async"
+
+    @classmethod
+    def populate_config(cls, config: dict, config_source: AsyncSource):
+        raise NotImplementedError  # pragma: no cover
+
+    @classmethod
+    async def apopulate_config(cls, config: dict, config_source: AsyncSource):
+        cls.update_dict_recursively(config, {"attr1": 1})
+
+
+register_loader(PlainSource, PlainLoader)
+register_loader(AsyncSource, AsyncLoader)
+
+
+class InstrumentedConfig(BaseConfig):
+    attr1: int
+    attr2: str
+
+
+@pytest.fixture
+def events():
+    collected: list = []
+    add_hook(collected.append)
+    yield collected
+    remove_hook(collected.append)
+
+
+def test_events(tmp_path, events):
+    FileLoader.cache_clear()
+    config_file = tmp_path / "config.json"
+    config_file.write_text('{"attr1": 1}')
+    sources = [
+        FileSource(file=config_file),
+        EnvSource(allow=["attr2"], prefix="INSTR_"),
+        PlainSource(),
+    ]
+    InstrumentedConfig(config_sources=sources)
+
+    assert [event.phase for event in events] == [
+        "parse",
+        "source",
+        "merge",
+        "source",
+        "merge",
+        "source",
+        "load",
+        "validate",
+    ]
+    assert all(isinstance(event, Event) for event in events)
+    assert all(event.config_class is InstrumentedConfig for event in events)
+    assert all(event.duration >= 0 for event in events)
+
+    parse = events[0]
+    assert parse.source_type is FileSource
+    assert parse.file == config_file
+    assert parse.bytes_read == config_file.stat().st_size
+    assert parse.cache_hit is False
+    assert events[1].source_type is FileSource
+    assert events[1].cache_hit is False
+    assert events[3].source_type is EnvSource
+    assert events[5].source_type is PlainSource
+    assert events[5].cache_hit is None
+
+    # unchanged layers are reused
+    events.clear()
+    InstrumentedConfig(config_sources=sources)
+    sources_events = [event for event in events if event.phase == "source"]
+    assert [event.cache_hit for event in sources_events] == [True, True, None]
+    assert "parse" not in [event.phase for event in events]
+
+    # other classes use the parser cache
+    class OtherConfig(InstrumentedConfig):
+        pass
+
+    events.clear()
+    OtherConfig(config_sources=sources)
+    assert events[0].phase == "parse"
+    assert events[0].cache_hit is True
+    assert events[0].bytes_read == 0
+    assert events[0].config_class is OtherConfig
+
+
+def test_bytes(events):
+    FileLoader.populate_config(
+        {}, FileSource(file=b'{"attr1": 1}', format=FileFormat.JSON)
+    )
+    assert len(events) == 1
+    assert events[0].phase == "parse"
+    assert events[0].bytes_read == 12
+    assert events[0].file is None
+    assert events[0].config_class is None
+
+
+def test_concurrent(events, monkeypatch):
+    monkeypatch.setattr(InstrumentedConfig, "CONFIG_CONCURRENT_LOADING", True)
+    InstrumentedConfig(
+        config_sources=[DataSource(data={"attr1": 1}), DataSource(data={"attr2": "2"})]
+    )
+    assert all(event.config_class is InstrumentedConfig for event in events)
+    assert len([event for event in events if event.phase == "source"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_async(events):
+    await InstrumentedConfig.aload(
+        config_sources=[DataSource(data={"attr1": 1}), PlainSource(), AsyncSource()]
+    )
+    assert [event.phase for event in events] == [
+        "source",
+        "merge",
+        "source",
+        "source",
+        "merge",
+        "load",
+        "validate",
+    ]
+    assert events[3].source_type is AsyncSource
+    assert all(event.config_class is InstrumentedConfig for event in events)
+
+
+def test_recorder():
+    recorder = Recorder(bounds=(0.5, 1.0))
+    recorder(Event("parse", None, FileSource, None, 10, 0.1, False))
+    recorder(Event("parse", None, FileSource, None, 0, 0.7, True))
+    recorder(Event("parse", None, FileSource, None, 0, 2.0, True))
+    recorder(Event("load", None, None, None, None, 0.2, None))
+
+    assert recorder.counters() == {
+        "parse": 3,
+        "parse.cache_hits": 2,
+        "parse.cache_misses": 1,
+        "parse.bytes_read": 10,
+        "load": 1,
+    }
+    histogram = recorder.histograms()["parse"]
+    assert histogram.bounds == (0.5, 1.0)
+    assert histogram.counts == (1, 1, 1)
+    assert histogram.total_count == 3
+    assert histogram.total_duration == pytest.approx(2.8)
+
+    recorder.reset()
+    assert recorder.counters() == {}
+    assert recorder.histograms() == {}
+
+
+def test_recorder_hook():
+    with Recorder() as recorder:
+        InstrumentedConfig(config_sources=DataSource(data={"attr1": 1, "attr2": "2"}))
+    InstrumentedConfig(config_sources=DataSource(data={"attr1": 1, "attr2": "2"}))
+    assert recorder.counters()["load"] == 1
+    assert recorder.histograms()["validate"].total_count == 1
@@ -0,0 +1,147 @@
+import datetime
+import decimal
+from pathlib import Path
+from typing import Any
+
+from confz import BaseConfig, DataSource, FileSource
+from confz.loaders.data_loader import DataLoader
+from confz.loaders.file_loader import FileLoader
+
+
+class LayerConfig(BaseConfig):
+    attr1: int
+    attr2: int
+
+
+def test_unchanged_layers_are_reused(tmp_path, monkeypatch):
+    base_file = tmp_path / "base.json"
+    base_file.write_text('{"attr1": 1, "attr2": 2}')
+    loaded = []
+    populate_layer = FileLoader.populate_layer
+
+    def counting_populate_layer(config, config_source):
+        loaded.append(config_source)
+        populate_layer(config, config_source)
+
+    monkeypatch.setattr(FileLoader, "populate_layer", counting_populate_layer)
+
+    for attr2 in [20, 21, 22]:
+        config = LayerConfig(
+            config_sources=[
+                FileSource(file=base_file),
+                DataSource(data={"attr2": attr2}),
+            ]
+        )
+        assert config.attr1 == 1
+        assert config.attr2 == attr2
+    assert len(loaded) == 1
+
+    base_file.write_text('{"attr1": 10, "attr2": 2}')
+    config = LayerConfig(
+        config_sources=[FileSource(file=base_file), DataSource(data={"attr2": 22})]
+    )
+    assert config.attr1 == 10
+    assert config.attr2 == 22
+    assert len(loaded) == 2
+
+
+def test_layers_are_not_modified():
+    data = {"attr1": 1, "attr2": 2}
+    LayerConfig(config_sources=[DataSource(data=data), DataSource(data={"attr2": 3})])
+    config = LayerConfig(config_sources=DataSource(data=data))
+    assert config.attr2 == 2
+
+
+def test_layer_cache_per_class():
+    class OtherConfig(LayerConfig):
+        pass
+
+    LayerConfig(config_sources=DataSource(data={"attr1": 1, "attr2": 2}))
+    OtherConfig(config_sources=DataSource(data={"attr1": 1, "attr2": 2}))
+    assert LayerConfig.confz_layers is not OtherConfig.confz_layers
+
+
+def test_layers_share_cached_files(tmp_path):
+    class NestedConfig(BaseConfig):
+        inner: dict
+
+    class OtherConfig(NestedConfig):
+        pass
+
+    config_file = tmp_path / "config.json"
+    config_file.write_text('{"inner": {"attr1": 1}}')
+    source = FileSource(file=config_file)
+    NestedConfig(config_sources=source)
+    OtherConfig(config_sources=source)
+    fingerprint = FileLoader.fingerprint(source)
+    layer = NestedConfig.confz_layers.get(fingerprint, True)
+    assert layer["inner"] is OtherConfig.confz_layers.get(fingerprint, True)["inner"]
+    assert NestedConfig.confz_layers.info().bytes > 0
+
+
+def test_layer_cache_size():
+    class TextConfig(BaseConfig):
+        text: str
+
+        CONFIG_LAYER_CACHE_BYTES = 1024
+
+    TextConfig(config_sources=DataSource(data={"text": "small"}))
+    assert TextConfig.confz_layers.info().entries == 1
+    TextConfig(config_sources=DataSource(data={"text": "large" * 1024}))
+    assert TextConfig.confz_layers.info().entries == 1
+    TextConfig.CONFIG_LAYER_CACHE_BYTES = 1
+    TextConfig(config_sources=DataSource(data={"text": "small"}))
+    assert TextConfig.confz_layers.info().entries == 0
+
+    class NoLayersConfig(LayerConfig):
+        CONFIG_LAYER_CACHE_BYTES = 0
+
+    config = NoLayersConfig(config_sources=DataSource(data={"attr1": 1, "attr2": 2}))
+    assert config.attr2 == 2
+    assert "confz_layers" not in NoLayersConfig.__dict__
+
+
+class Box:
+    def __init__(self, value):
+        self.value = value
+
+    def __repr__(self):
+        return "Box(...)"
+
+
+def test_layers_of_objects():
+    # objects with equal representations are not mistaken for each other
+    assert repr(Box(1)) == repr(Box(2))
+
+    class BoxConfig(BaseConfig, arbitrary_types_allowed=True):
+        box: Box
+
+    assert BoxConfig(config_sources=DataSource(data={"box": Box(1)})).box.value == 1
+    assert BoxConfig(config_sources=DataSource(data={"box": Box(2)})).box.value == 2
+    assert DataLoader.fingerprint(DataSource(data={"box": Box(1)})) is None
+
+
+def test_fingerprint_plain_data():
+    data = {
+        "values": [1, 2.5, True, None, b"x", ("a",), {"b"}, frozenset()],
+        "time": datetime.datetime(2024, 1, 1),
+        "path": Path("/tmp"),
+        "amount": decimal.Decimal("1.5"),
+    }
+    assert DataLoader.fingerprint(DataSource(data=data)) is not None
+
+
+def test_deep_data():
+    class DeepConfig(BaseConfig):
+        a: Any
+
+    data: dict = {}
+    node = data
+    for _ in range(5000):
+        node["a"] = {}
+        node = node["a"]
+    source = DataSource(data=data)
+    assert DataLoader.fingerprint(source) is not None
+    config = DeepConfig(config_sources=[source, DataSource(data={"a": {"b": 1}})])
+    assert config.a["b"] == 1
+    assert config.a["a"] is not data["a"]["a"]
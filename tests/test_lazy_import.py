@@ -0,0 +1,69 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import confz
+
+PROJECT_FOLDER = Path(__file__).parent.parent.resolve()
+PARSER_MODULES = ["yaml", "toml", "dotenv"]
+HEAVY_MODULES = ["asyncio", "ctypes"]
+
+
+def _run_python(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_FOLDER,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _imported_modules(import_time_output: str):
+    modules = set()
+    for line in import_time_output.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            modules.add(line.rsplit("|", 1)[1].strip().split(".")[0])
+    return modules
+
+
+def test_import_does_not_load_parsers():
+    code = (
+        "import sys\n"
+        "import confz\n"
+        "from confz import BaseConfig, DataSource, EnvSource, FileSource\n"
+        "class Config(BaseConfig):\n"
+        "    attr: int\n"
+        "Config(config_sources=[DataSource(data={'attr': 1}), EnvSource()])\n"
+        f"print([m for m in {PARSER_MODULES + HEAVY_MODULES} if m in sys.modules])\n"
+    )
+    result = _run_python(code)
+    assert result.stdout.strip() == "[]"
+    assert _imported_modules(result.stderr).isdisjoint(PARSER_MODULES)
+    assert _imported_modules(result.stderr).isdisjoint(HEAVY_MODULES)
+    assert "confz" in _imported_modules(result.stderr)
+
+
+def test_public_names():
+    for name in confz.__all__:
+        assert getattr(confz, name) is not None
+    assert set(confz.__all__) <= set(dir(confz))
+    with pytest.raises(AttributeError):
+        getattr(confz, "unknown_name")
+
+
+def test_submodules():
+    code = (
+        "import confz\n"
+        "print(confz.exceptions.ConfigException.__name__)\n"
+        "print(confz.loaders.Loader.__name__)\n"
+        "print(confz.validate.validate_all_configs.__name__)\n"
+    )
+    result = _run_python(code)
+    assert result.stdout.split() == [
+        "ConfigException",
+        "Loader",
+        "validate_all_configs",
+    ]
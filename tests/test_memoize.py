@@ -0,0 +1,169 @@
+import contextvars
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+import pytest
+
+from confz import (
+    BaseConfig,
+    ConfigSource,
+    FileSource,
+    memoize_sources,
+    validate_all_configs,
+)
+from confz.exceptions import ConfigException
+from confz.loaders import Loader, register_loader
+from confz.loaders.loader import digest
+
+
+@dataclass
+class CountingSource(ConfigSource):
+    name: str
+    delay: float = 0.0
+    error: Optional[str] = None
+    calls: list = field(default_factory=list, compare=False, repr=False)
+
+
+class CountingLoader(Loader):
+    @classmethod
+    def fingerprint(cls, config_source: CountingSource) -> Optional[str]:
+        return digest(config_source, time.perf_counter())  # never cached
+
+    @classmethod
+    def populate_config(cls, config: dict, config_source: CountingSource):
+        config_source.calls.append(1)
+        time.sleep(config_source.delay)
+        if config_source.error is not None:
+            raise ConfigException(config_source.error)
+        cls.update_dict_recursively(config, {"attr1": 1})
+
+
+register_loader(CountingSource, CountingLoader)
+
+
+class MemoConfig1(BaseConfig):
+    attr1: int
+
+
+class MemoConfig2(BaseConfig):
+    attr1: int
+    attr2: int = 2
+
+
+def test_memoize():
+    calls: list = []
+    with memoize_sources():
+        MemoConfig1(config_sources=CountingSource(name="a", calls=calls))
+        MemoConfig2(config_sources=CountingSource(name="a", calls=calls))
+        assert len(calls) == 1
+
+        MemoConfig2(config_sources=CountingSource(name="b", calls=calls))
+        assert len(calls) == 2
+
+        # nested scopes share the memo
+        with memoize_sources():
+            MemoConfig1(config_sources=CountingSource(name="b", calls=calls))
+        MemoConfig2(config_sources=CountingSource(name="a", calls=calls))
+        assert len(calls) == 2
+
+    MemoConfig1(config_sources=CountingSource(name="a", calls=calls))
+    assert len(calls) == 3
+
+
+def test_memoize_threads():
+    calls: list = []
+    barrier = threading.Barrier(8)
+
+    def load():
+        barrier.wait()
+        MemoConfig1(config_sources=CountingSource(name="c", delay=0.05, calls=calls))
+
+    with memoize_sources():
+        # threads started with a copy of the context share the scope
+        threads = [
+            threading.Thread(target=contextvars.copy_context().run, args=(load,))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert len(calls) == 1
+
+
+def test_memoize_other_threads():
+    # threads outside of the scope are not affected
+    calls: list = []
+
+    def load():
+        MemoConfig1(config_sources=CountingSource(name="c", calls=calls))
+
+    with memoize_sources():
+        load()
+        thread = threading.Thread(target=load)
+        thread.start()
+        thread.join()
+    assert len(calls) == 2
+
+
+def test_memoize_errors():
+    calls: list = []
+    source = CountingSource(name="d", delay=0.05, error="failed", calls=calls)
+    errors = []
+
+    def load():
+        try:
+            MemoConfig1(config_sources=source)
+        except ConfigException as e:
+            errors.append(e)
+
+    with memoize_sources():
+        threads = [
+            threading.Thread(target=contextvars.copy_context().run, args=(load,))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(errors) == 4
+        n_calls = len(calls)
+        assert n_calls < 4
+
+        # errors are not memoized
+        with pytest.raises(ConfigException):
+            MemoConfig1(config_sources=source)
+        assert len(calls) == n_calls + 1
+
+
+def test_validate_all_configs():
+    calls: list = []
+
+    class Singleton1(MemoConfig1):
+        CONFIG_SOURCES = CountingSource(name="e", calls=calls)
+
+    class Singleton2(MemoConfig2):
+        CONFIG_SOURCES = CountingSource(name="e", calls=calls)
+
+    validate_all_configs()
+    assert len(calls) == 1
+    validate_all_configs(parallel=True)
+    assert len(calls) == 1  # both singletons already loaded
+
+
+def test_memoize_select_fields(tmp_path):
+    class FirstConfig(BaseConfig):
+        first: int
+
+    class SecondConfig(BaseConfig):
+        second: int
+
+    config_file = tmp_path / "config.json"
+    config_file.write_text('{"first": 1, "second": 2}')
+    source = FileSource(file=config_file, select_fields=True)
+    with memoize_sources():
+        # the selected keys depend on the config class
+        assert FirstConfig(config_sources=source).first == 1
+        assert SecondConfig(config_sources=source).second == 2
@@ -0,0 +1,70 @@
+import gc
+import weakref
+
+from confz import BaseConfig, DataSource, EnvSource, FileSource
+from confz.registry import config_classes
+
+
+class RegistryConfig(BaseConfig):
+    attr1: int
+
+
+def test_registry():
+    class WithSources(RegistryConfig):
+        CONFIG_SOURCES = [DataSource(data={"attr1": 1}), EnvSource(prefix="REG_")]
+
+    class Inherited(WithSources):
+        pass
+
+    class Both(Inherited, WithSources):
+        pass
+
+    all_classes = config_classes()
+    assert BaseConfig not in all_classes
+    assert all_classes.count(Both) == 1
+    assert all_classes.index(RegistryConfig) < all_classes.index(WithSources)
+    assert all_classes.index(WithSources) < all_classes.index(Inherited)
+
+    assert RegistryConfig in config_classes(has_sources=False)
+    assert RegistryConfig not in config_classes(has_sources=True)
+    with_sources = config_classes(has_sources=True)
+    assert {WithSources, Inherited, Both} <= set(with_sources)
+
+    assert {WithSources, Inherited, Both} <= set(config_classes(source_type=EnvSource))
+    assert WithSources not in config_classes(source_type=FileSource)
+    assert config_classes(has_sources=False, source_type=EnvSource) == []
+
+
+def test_registry_changed_sources():
+    class Changing(RegistryConfig):
+        pass
+
+    class Child(Changing):
+        pass
+
+    assert Child not in config_classes(source_type=DataSource)
+
+    Changing.CONFIG_SOURCES = DataSource(data={"attr1": 1})
+    assert {Changing, Child} <= set(config_classes(source_type=DataSource))
+
+    with Changing.change_config_sources(FileSource(file="config.yml")):
+        assert Child in config_classes(source_type=FileSource)
+        assert Child not in config_classes(source_type=DataSource)
+    assert Child in config_classes(source_type=DataSource)
+
+    Changing.CONFIG_SOURCES = None
+    assert Child in config_classes(has_sources=False)
+
+
+def test_registry_garbage_collection():
+    def create():
+        class Dynamic(RegistryConfig):
+            CONFIG_SOURCES = DataSource(data={"attr1": 1})
+
+        assert Dynamic in config_classes(has_sources=True)
+        return weakref.ref(Dynamic)
+
+    ref = create()
+    gc.collect()
+    assert ref() is None
+    assert all(cls.__name__ != "Dynamic" for cls in config_classes())
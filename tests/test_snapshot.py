@@ -0,0 +1,228 @@
+import datetime
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Set
+
+import pytest
+
+from confz import (
+    BaseConfig,
+    CLArgSource,
+    ConfigSource,
+    DataSource,
+    EnvSource,
+    FileFormat,
+    FileSource,
+)
+from confz.exceptions import FileException
+from confz.loaders import Loader, register_loader
+from confz.loaders.file_loader import FileLoader
+from confz.snapshot import snapshot_info, snapshot_info_clear
+
+
+class InnerConfig(BaseConfig):
+    attr1: int
+
+
+class OuterConfig(BaseConfig):
+    attr2: int
+    inner: InnerConfig
+
+
+@dataclass
+class UnknownSource(ConfigSource):
+    pass
+
+
+class UnknownLoader(Loader):
+    @classmethod
+    def populate_config(cls, config: dict, config_source: UnknownSource):
+        cls.update_dict_recursively(config, {"attr2": 2})
+
+
+register_loader(UnknownSource, UnknownLoader)
+
+
+def test_snapshot(tmp_path, monkeypatch):
+    config_file = tmp_path / "config.json"
+    config_file.write_text('{"inner": {"attr1": 1}, "attr2": 2}')
+    monkeypatch.setenv("CONF_ATTR2", "3")
+    sources = [
+        FileSource(file=b'{"inner": {"attr1": 0}}', format=FileFormat.JSON),
+        FileSource(file=config_file),
+        EnvSource(allow_all=True, prefix="CONF_"),
+        CLArgSource(prefix="conf_"),
+    ]
+    monkeypatch.setattr(OuterConfig, "CONFIG_SNAPSHOT_DIR", tmp_path / "snapshots")
+    snapshot_info_clear()
+
+    assert OuterConfig(config_sources=sources).attr2 == 3
+    assert snapshot_info() == (0, 1)
+    assert len(list((tmp_path / "snapshots").iterdir())) == 1
+
+    # loads snapshot without parsing the file
+    FileLoader.cache_clear()
+    assert OuterConfig(config_sources=sources).attr2 == 3
+    assert snapshot_info() == (1, 1)
+    assert FileLoader.cache_info().misses == 0
+
+    # changed environment variables invalidate the snapshot
+    monkeypatch.setenv("CONF_ATTR2", "4")
+    assert OuterConfig(config_sources=sources).attr2 == 4
+    monkeypatch.setenv("OTHER_ATTR2", "5")
+    assert OuterConfig(config_sources=sources).attr2 == 4
+    assert snapshot_info() == (2, 2)
+
+    # changed files invalidate the snapshot
+    config_file.write_text('{"inner": {"attr1": 10}, "attr2": 2}')
+    assert OuterConfig(config_sources=sources).inner.attr1 == 10
+    assert snapshot_info() == (2, 3)
+
+    # changed command line arguments invalidate the snapshot
+    monkeypatch.setattr(sys, "argv", sys.argv + ["--conf_attr2", "6"])
+    assert OuterConfig(config_sources=sources).attr2 == 6
+    assert snapshot_info() == (2, 4)
+
+    # kwargs are part of the fingerprint
+    config = OuterConfig(
+        config_sources=DataSource(data={"attr2": 1}), inner={"attr1": 1}
+    )
+    assert config.inner.attr1 == 1
+    config = OuterConfig(
+        config_sources=DataSource(data={"attr2": 1}), inner={"attr1": 2}
+    )
+    assert config.inner.attr1 == 2
+    assert snapshot_info() == (2, 6)
+
+    # missing files can not be fingerprinted
+    with pytest.raises(FileException):
+        OuterConfig(config_sources=FileSource(file=tmp_path / "missing.json"))
+    assert snapshot_info() == (2, 7)
+
+
+def test_snapshot_singleton(tmp_path):
+    class SingletonConfig(BaseConfig):
+        attr: int
+
+        CONFIG_SOURCES = DataSource(data={"attr": 1})
+        CONFIG_SNAPSHOT_DIR = tmp_path
+
+    snapshot_info_clear()
+    assert SingletonConfig().attr == 1
+    SingletonConfig.confz_instance = None
+    assert SingletonConfig().attr == 1
+    assert snapshot_info() == (1, 1)
+
+
+def test_snapshot_select_fields(tmp_path):
+    class SelectConfig(BaseConfig):
+        attr1: int
+
+        CONFIG_SNAPSHOT_DIR = tmp_path
+
+    class NewSelectConfig(SelectConfig):
+        attr2: int = 0
+
+    # the same class in a later version, with another field
+    NewSelectConfig.__qualname__ = SelectConfig.__qualname__
+
+    config_file = tmp_path / "config.json"
+    config_file.write_text('{"attr1": 1, "attr2": 2}')
+    source = FileSource(file=config_file, select_fields=True)
+    snapshot_info_clear()
+    assert SelectConfig(config_sources=source).attr1 == 1
+    assert NewSelectConfig(config_sources=source).attr2 == 2
+    assert NewSelectConfig(config_sources=source).attr2 == 2
+    assert snapshot_info() == (1, 2)
+
+
+def test_snapshot_optional_file(tmp_path, monkeypatch):
+    config_file = tmp_path / "config.json"
+    sources = [
+        DataSource(data={"inner": {"attr1": 1}, "attr2": 2}),
+        FileSource(file=config_file, optional=True),
+    ]
+    monkeypatch.setattr(OuterConfig, "CONFIG_SNAPSHOT_DIR", tmp_path / "snapshots")
+    snapshot_info_clear()
+    assert OuterConfig(config_sources=sources).attr2 == 2
+    config_file.write_text('{"attr2": 3}')
+    assert OuterConfig(config_sources=sources).attr2 == 3
+    assert snapshot_info() == (0, 2)
+
+
+def test_snapshot_types(tmp_path):
+    class TypesConfig(BaseConfig):
+        date: datetime.date
+        time: datetime.time
+        timestamp: datetime.datetime
+        data: bytes
+        values: Set[str]
+        items: List[Dict[str, str]]
+
+        CONFIG_SNAPSHOT_DIR = tmp_path
+
+    config_file = tmp_path / "config.yml"
+    config_file.write_text(
+        "date: 2024-01-01\n"
+        "timestamp: 2024-01-01 10:00:00\n"
+        "data: !!binary aGVsbG8=\n"
+        "values: !!set {a, b}\n"
+    )
+    sources = [
+        FileSource(file=config_file),
+        DataSource(
+            data={
+                "time": datetime.time(10, 0),
+                "items": [{"__confz_type__": "date", "value": "2024-01-01"}],
+            }
+        ),
+    ]
+    snapshot_info_clear()
+    config = TypesConfig(config_sources=sources)
+    assert TypesConfig(config_sources=sources) == config
+    assert config.items[0]["value"] == "2024-01-01"
+    assert snapshot_info() == (1, 1)
+
+
+def test_snapshot_not_supported(tmp_path):
+    class IntKeyConfig(BaseConfig):
+        attr: Dict[int, int]
+
+        CONFIG_SNAPSHOT_DIR = tmp_path / "snapshots"
+
+    class UnknownConfig(BaseConfig):
+        attr2: int
+
+        CONFIG_SNAPSHOT_DIR = tmp_path / "snapshots"
+
+    snapshot_info_clear()
+    source = DataSource(data={"attr": {1: 1}})
+    assert IntKeyConfig(config_sources=source).attr == {1: 1}
+    assert IntKeyConfig(config_sources=source).attr == {1: 1}
+    assert UnknownConfig(config_sources=UnknownSource()).attr2 == 2
+    source = DataSource(data={"attr2": 2, "other": object()})
+    assert UnknownConfig(config_sources=source).attr2 == 2
+    source = DataSource(data={"attr2": 2, "other": (1, 2)})
+    assert UnknownConfig(config_sources=source).attr2 == 2
+    assert snapshot_info() == (0, 5)
+    assert not (tmp_path / "snapshots").exists()
+
+    # unusable snapshot folders are ignored
+    (tmp_path / "file").write_text("")
+    IntKeyConfig.CONFIG_SNAPSHOT_DIR = tmp_path / "file"
+    source = DataSource(data={"attr": {}})
+    assert IntKeyConfig(config_sources=source).attr == {}
+
+
+def test_snapshot_object_kwargs(tmp_path):
+    # keyword arguments are identified by their representation, so only builtin
+    # values are supported
+    class SnapshotConfig(OuterConfig):
+        CONFIG_SNAPSHOT_DIR = tmp_path
+
+    snapshot_info_clear()
+    source = DataSource(data={"attr2": 2})
+    for attr1 in [1, 2]:
+        config = SnapshotConfig(config_sources=source, inner=InnerConfig(attr1=attr1))
+        assert config.inner.attr1 == attr1
+    assert snapshot_info() == (0, 2)
@@ -0,0 +1,311 @@
+import sys
+from enum import Enum, IntEnum
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple, Union
+
+import pytest
+from pydantic import ValidationError
+
+from confz import BaseConfig, DataSource, EnvSource
+from confz.snapshot import snapshot_info, snapshot_info_clear
+from confz.trusted import SCHEMA_KEY, construct, dump, schema_fingerprint
+
+
+class InnerConfig(BaseConfig):
+    attr: int
+
+
+class OtherConfig(BaseConfig):
+    attr: str
+
+
+class OuterConfig(BaseConfig):
+    number: int
+    inner: InnerConfig
+    optional: Optional[InnerConfig] = None
+    items: List[InnerConfig] = []
+    mapping: Dict[str, InnerConfig] = {}
+    pair: Tuple[InnerConfig, int] = (InnerConfig(attr=0), 0)
+    many: Tuple[InnerConfig, ...] = ()
+    unique: FrozenSet[InnerConfig] = frozenset()
+    values: List[int] = []
+
+
+class UnionConfig(BaseConfig):
+    inner: Union[InnerConfig, OtherConfig]
+
+
+class SequenceConfig(BaseConfig):
+    items: Sequence[InnerConfig]
+
+
+class Unknown:
+    pass
+
+
+class ArbitraryConfig(BaseConfig, arbitrary_types_allowed=True):
+    attr: Unknown
+
+
+def _count_validations(monkeypatch, config_class) -> List[Any]:
+    calls: List[Any] = []
+    init = config_class.__init__
+
+    def counting_init(self, **kwargs):
+        calls.append(kwargs)
+        init(self, **kwargs)
+
+    monkeypatch.setattr(config_class, "__init__", counting_init)
+    return calls
+
+
+def test_roundtrip(monkeypatch):
+    config = OuterConfig(
+        number=1,
+        inner={"attr": 2},
+        optional={"attr": 3},
+        items=[{"attr": 4}],
+        mapping={"a": {"attr": 5}},
+        pair=({"attr": 6}, 7),
+        many=[{"attr": 8}, {"attr": 9}],
+        unique=[{"attr": 10}],
+        values=[11],
+    )
+    data = config.trusted_dump()
+    assert data is not None
+    assert data[SCHEMA_KEY] == schema_fingerprint(OuterConfig)
+    assert data["inner"] == {"attr": 2}
+    assert data["pair"] == ({"attr": 6}, 7)
+
+    calls = _count_validations(monkeypatch, OuterConfig)
+    trusted_config = OuterConfig.from_trusted(data)
+    assert trusted_config == config
+    assert isinstance(trusted_config.unique, frozenset)
+    assert not calls
+
+
+def test_not_validated():
+    data = {"number": "not validated", "inner": {"attr": 1}}
+    data[SCHEMA_KEY] = schema_fingerprint(OuterConfig)
+    assert OuterConfig.from_trusted(data).number == "not validated"
+
+
+def test_untrusted():
+    data = {"number": "1", "inner": {"attr": 1}}
+    assert OuterConfig.from_trusted(data).number == 1
+    data[SCHEMA_KEY] = "other"
+    assert OuterConfig.from_trusted(data).number == 1
+    data["number"] = "invalid"
+    with pytest.raises(ValidationError):
+        OuterConfig.from_trusted(data)
+
+    # data of other classes is validated
+    data = InnerConfig(attr=1).trusted_dump()
+    with pytest.raises(ValidationError):
+        OuterConfig.from_trusted(data)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"inner": 1},
+        {"items": ({"attr": 1},)},
+        {"pair": ({"attr": 1},)},
+        {"many": [{"attr": 1}]},
+        {"mapping": [("a", {"attr": 1})]},
+    ],
+)
+def test_unexpected_structure(data):
+    # data which does not fit the fields is validated instead
+    data.update({"number": 1, SCHEMA_KEY: schema_fingerprint(OuterConfig)})
+    data.setdefault("inner", {"attr": 1})
+    assert construct(OuterConfig, data) is None
+
+
+def test_unexpected_structure_validated():
+    data = {"number": 1, "inner": {"attr": 1}, "many": [{"attr": 2}]}
+    data[SCHEMA_KEY] = schema_fingerprint(OuterConfig)
+    assert OuterConfig.from_trusted(data).many == (InnerConfig(attr=2),)
+
+
+def test_ambiguous_models():
+    config = UnionConfig(inner={"attr": "a"})
+    assert isinstance(config.inner, OtherConfig)
+    data = config.trusted_dump()
+    assert construct(UnionConfig, data) is None
+    assert UnionConfig.from_trusted(data) == config
+
+    config = SequenceConfig(items=[{"attr": 1}])
+    data = config.trusted_dump()
+    assert construct(SequenceConfig, data) is None
+    assert SequenceConfig.from_trusted(data) == config
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="requires X | Y")
+def test_union_type():
+    class UnionTypeConfig(BaseConfig):
+        inner: InnerConfig | None
+
+    config = UnionTypeConfig(inner={"attr": 1})
+    assert construct(UnionTypeConfig, config.trusted_dump()) == config
+
+
+def test_no_schema():
+    config = ArbitraryConfig(attr=Unknown())
+    assert schema_fingerprint(ArbitraryConfig) is None
+    assert config.trusted_dump() is None
+    assert dump(config) is None
+
+
+def test_snapshot(tmp_path, monkeypatch):
+    class SnapshotConfig(BaseConfig):
+        number: int
+        items: List[InnerConfig]
+
+        CONFIG_SNAPSHOT_DIR = tmp_path
+        CONFIG_SNAPSHOT_TRUSTED = True
+
+    source = DataSource(data={"number": "1", "items": [{"attr": "2"}]})
+    snapshot_info_clear()
+    config = SnapshotConfig(config_sources=source)
+
+    calls = _count_validations(monkeypatch, SnapshotConfig)
+    assert SnapshotConfig(config_sources=source) == config
+    assert snapshot_info() == (1, 1)
+    assert not calls
+
+    # untrusted snapshots are validated
+    SnapshotConfig.CONFIG_SNAPSHOT_TRUSTED = False
+    assert SnapshotConfig(config_sources=source) == config
+    assert SnapshotConfig(config_sources=source) == config
+    assert snapshot_info() == (2, 2)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_snapshot_aload(tmp_path, monkeypatch):
+    class SnapshotConfig(BaseConfig):
+        number: int
+
+        CONFIG_SNAPSHOT_DIR = tmp_path
+        CONFIG_SNAPSHOT_TRUSTED = True
+
+    source = DataSource(data={"number": "1"})
+    snapshot_info_clear()
+    config = await SnapshotConfig.aload(config_sources=source)
+    calls = _count_validations(monkeypatch, SnapshotConfig)
+    assert await SnapshotConfig.aload(config_sources=source) == config
+    assert snapshot_info() == (1, 1)
+    assert not calls
+
+
+def test_snapshot_validated_config(tmp_path):
+    # the validated config is stored, even if the loaded data is not supported
+    class SnapshotConfig(BaseConfig):
+        number: int
+
+        CONFIG_SNAPSHOT_DIR = tmp_path
+        CONFIG_SNAPSHOT_TRUSTED = True
+
+    source = DataSource(data={"number": 1, "other": (1, 2)})
+    snapshot_info_clear()
+    assert SnapshotConfig(config_sources=source).number == 1
+    assert SnapshotConfig(config_sources=source).number == 1
+    assert snapshot_info() == (1, 1)
+
+
+@pytest.mark.parametrize(
+    "annotation, data",
+    [
+        (Union[InnerConfig, OtherConfig], {"attr": "a"}),  # not constructed
+        (Path, "/tmp"),  # not representable in JSON
+    ],
+)
+def test_snapshot_loaded_config(tmp_path, annotation, data):
+    # the loaded config is stored if the validated one can not be restored
+    class SnapshotConfig(BaseConfig):
+        attr: annotation
+
+        CONFIG_SNAPSHOT_DIR = tmp_path
+        CONFIG_SNAPSHOT_TRUSTED = True
+
+    source = DataSource(data={"attr": data})
+    snapshot_info_clear()
+    config = SnapshotConfig(config_sources=source)
+    assert SnapshotConfig(config_sources=source) == config
+    assert snapshot_info() == (1, 1)
+
+
+class Mode(str, Enum):
+    FAST = "fast"
+
+
+class Level(IntEnum):
+    HIGH = 2
+
+
+def test_snapshot_exact_types(tmp_path):
+    # enums of strings and integers would be restored as strings and integers
+    class SnapshotConfig(BaseConfig):
+        mode: Mode
+        level: Level
+        levels: Dict[Mode, int] = {}
+
+        CONFIG_SNAPSHOT_DIR = tmp_path
+        CONFIG_SNAPSHOT_TRUSTED = True
+
+    source = DataSource(data={"mode": "fast", "level": 2, "levels": {"fast": 1}})
+    snapshot_info_clear()
+    SnapshotConfig(config_sources=source)
+    config = SnapshotConfig(config_sources=source)
+    assert snapshot_info() == (1, 1)
+    assert type(config.mode) is Mode
+    assert type(config.level) is Level
+    assert [type(key) for key in config.levels] == [Mode]
+
+
+def test_snapshot_untrusted_fingerprint(tmp_path):
+    # a schema fingerprint provided by a source does not make the snapshot trusted
+    class SnapshotConfig(BaseConfig):
+        number: int
+
+        CONFIG_SNAPSHOT_DIR = tmp_path
+
+    source = DataSource(
+        data={"number": "5", SCHEMA_KEY: schema_fingerprint(SnapshotConfig)}
+    )
+    snapshot_info_clear()
+    assert SnapshotConfig(config_sources=source).number == 5
+    assert SnapshotConfig(config_sources=source).number == 5
+    assert snapshot_info() == (1, 1)
+
+    SnapshotConfig.CONFIG_SNAPSHOT_TRUSTED = True
+    assert SnapshotConfig(config_sources=source).number == 5
+    assert SnapshotConfig(config_sources=source).number == 5
+    assert snapshot_info() == (2, 2)
+
+
+def test_sources_not_trusted(monkeypatch):
+    # the fingerprint in loaded data does not skip the validation of other sources
+    data = OuterConfig(number=1, inner={"attr": 2}).trusted_dump()
+    monkeypatch.setenv("APP_NUMBER", "not-a-number")
+    with pytest.raises(ValidationError):
+        OuterConfig(
+            config_sources=[
+                DataSource(data=data),
+                EnvSource(allow_all=True, prefix="APP_"),
+            ]
+        )
+
+    monkeypatch.setenv("APP_NUMBER", "3")
+    config = OuterConfig(
+        config_sources=[DataSource(data=data), EnvSource(allow_all=True, prefix="APP_")]
+    )
+    assert config.number == 3
+
+    # also not if a source provides the fingerprint on its own
+    monkeypatch.setenv("APP_NUMBER", "not-a-number")
+    monkeypatch.setenv("APP_INNER.ATTR", "1")
+    monkeypatch.setenv(f"APP_{SCHEMA_KEY}", data[SCHEMA_KEY])
+    with pytest.raises(ValidationError):
+        OuterConfig(config_sources=EnvSource(allow_all=True, prefix="APP_"))
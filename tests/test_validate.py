@@ -1,7 +1,11 @@
+import asyncio
+import threading
+
 import pytest
 from pydantic import ValidationError
 
 from confz import BaseConfig, DataSource, validate_all_configs, depends_on
+from confz.exceptions import ValidateAllException
 
 
 def test_validate():
@@ -64,3 +68,126 @@ async def test_listeners():
     validate_all_configs(include_listeners=False)
     with pytest.raises(ValueError):
         await validate_all_configs(include_listeners=True)
+
+    # remove broken listener so successive test don't fail because of it
+    EmptyConfig.listeners.remove(broken_fn)
+
+
+def test_validate_parallel():
+    class ParallelConfig(BaseConfig):
+        attr1: int
+
+        CONFIG_SOURCES = DataSource(data={"attr1": 1})
+
+    class BrokenConfig1(BaseConfig):
+        attr1: int
+
+        CONFIG_SOURCES = DataSource(data={})
+
+    class BrokenConfig2(BaseConfig):
+        attr1: int
+
+        CONFIG_SOURCES = DataSource(data={"attr1": "a"})
+
+    with pytest.raises(ValidateAllException) as exc_info:
+        validate_all_configs(parallel=True, max_workers=2)
+    errors = exc_info.value.errors
+    assert {error.item for error in errors} == {BrokenConfig1, BrokenConfig2}
+    assert all(isinstance(error.error, ValidationError) for error in errors)
+    assert "BrokenConfig1" in str(exc_info.value)
+    assert "BrokenConfig2" in str(exc_info.value)
+    assert ParallelConfig.confz_instance is not None
+
+    # adjust config sources so successive test don't fail because of broken configs
+    BrokenConfig1.CONFIG_SOURCES = DataSource(data={"attr1": 1})
+    BrokenConfig2.CONFIG_SOURCES = DataSource(data={"attr1": 1})
+
+    results = validate_all_configs(parallel=True)
+    result = next(result for result in results if result.item is ParallelConfig)
+    assert result.name.endswith("ParallelConfig")
+    assert result.duration >= 0
+    assert result.error is None
+
+
+@pytest.mark.asyncio
+async def test_validate_parallel_sync_listeners():
+    class SyncListenerConfig(BaseConfig):
+        CONFIG_SOURCES = []
+
+    barrier = threading.Barrier(2, timeout=5)
+
+    @depends_on(SyncListenerConfig)
+    def fn1():
+        barrier.wait()
+
+    @depends_on(SyncListenerConfig)
+    def fn2():
+        barrier.wait()
+
+    @depends_on(SyncListenerConfig)
+    async def fn3():
+        pass  # validate_all_configs is a coroutine with asynchronous listeners
+
+    # would time out if the listeners ran one after another
+    results = await validate_all_configs(include_listeners=True, parallel=True)
+    assert {fn1, fn2, fn3} <= {result.item for result in results}
+
+
+@pytest.mark.asyncio
+async def test_validate_parallel_shared_listeners():
+    class FirstConfig(BaseConfig):
+        CONFIG_SOURCES = []
+
+    class SecondConfig(BaseConfig):
+        CONFIG_SOURCES = []
+
+    calls = []
+
+    @depends_on(FirstConfig, SecondConfig)
+    def shared_fn():
+        calls.append(1)
+
+    @depends_on(FirstConfig)
+    async def async_fn():
+        pass
+
+    results = await validate_all_configs(include_listeners=True, parallel=True)
+    assert [result.item for result in results].count(shared_fn) == 1
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_validate_parallel_async_listeners():
+    class AsyncListenerConfig(BaseConfig):
+        CONFIG_SOURCES = []
+
+    running = 0
+    max_running = 0
+
+    async def run():
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    for _ in range(6):
+        depends_on(AsyncListenerConfig)(run)
+
+    @depends_on(AsyncListenerConfig)
+    async def broken_fn():
+        raise ValueError("broken")
+
+    with pytest.raises(ValidateAllException) as exc_info:
+        await validate_all_configs(
+            include_listeners=True, parallel=True, max_concurrency=3
+        )
+    assert max_running == 3
+    assert [error.item for error in exc_info.value.errors] == [broken_fn]
+    assert isinstance(exc_info.value.errors[0].error, ValueError)
+
+    AsyncListenerConfig.listeners.remove(broken_fn)
+    max_running = 0
+    results = await validate_all_configs(include_listeners=True, parallel=True)
+    assert max_running == 6
+    assert all(result.error is None for result in results)
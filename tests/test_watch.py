@@ -0,0 +1,156 @@
+import time
+
+import pytest
+
+from confz import (
+    BaseConfig,
+    DataSource,
+    EnvSource,
+    FileFormat,
+    FileSource,
+    depends_on,
+    watch,
+)
+
+
+def _wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError  # pragma: no cover
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize("use_inotify", [False, True])
+def test_watch(tmp_path, use_inotify):
+    config_file = tmp_path / "config.json"
+    config_file.write_text('{"attr1": 1}')
+    env_file = tmp_path / ".env"
+    env_file.write_text("ATTR2=2")
+
+    class WatchedConfig(BaseConfig):
+        attr1: int
+        attr2: int
+
+        CONFIG_SOURCES = [
+            FileSource(file=config_file),
+            FileSource(file=b"{}", format=FileFormat.JSON),
+            FileSource(file_from_env="UNSET_CONFIG_FILE", optional=True),
+            EnvSource(allow=["attr2"], file=env_file),
+            EnvSource(allow=["attr3"], file=b"ATTR3=3"),
+            DataSource(data={}),
+        ]
+
+    @depends_on(WatchedConfig)
+    def listener():
+        return WatchedConfig().attr1
+
+    assert listener() == 1
+    first_instance = WatchedConfig()
+
+    with WatchedConfig.watch_config_sources(
+        debounce=0.1, min_interval=0.1, poll_interval=0.02, use_inotify=use_inotify
+    ) as watcher:
+        assert watcher.backend == ("inotify" if use_inotify else "polling")
+        assert watcher.start() is watcher
+
+        config_file.write_text('{"attr1": 10}')
+        _wait_for(lambda: WatchedConfig().attr1 == 10)
+        assert listener() == 10
+        assert first_instance.attr1 == 1
+
+        # invalid configs do not replace the instance
+        config_file.write_text('{"attr1": "invalid"}')
+        _wait_for(lambda: watcher.last_error is not None)
+        assert WatchedConfig().attr1 == 10
+
+        env_file.write_text("ATTR2=20")
+        config_file.write_text('{"attr1": 100}')
+        _wait_for(lambda: WatchedConfig().attr2 == 20)
+        assert watcher.last_error is None
+        assert WatchedConfig().attr1 == 100
+        assert watcher.reload_count == 2
+
+    watcher.stop()
+    config_file.write_text('{"attr1": 1000}')
+    time.sleep(0.2)
+    assert WatchedConfig().attr1 == 100
+
+
+def test_watch_debounce(tmp_path):
+    config_file = tmp_path / "config.json"
+    config_file.write_text('{"attr": 0}')
+
+    class DebouncedConfig(BaseConfig):
+        attr: int
+
+        CONFIG_SOURCES = FileSource(file=config_file)
+
+    assert DebouncedConfig().attr == 0
+    with DebouncedConfig.watch_config_sources(
+        debounce=0.3, min_interval=0.1, poll_interval=0.02, use_inotify=False
+    ) as watcher:
+        for value in range(1, 6):
+            config_file.write_text(f'{{"attr": {value}}}')
+            time.sleep(0.05)
+        _wait_for(lambda: DebouncedConfig().attr == 5)
+        assert watcher.reload_count == 1
+
+
+def test_watch_deleted_file(tmp_path):
+    config_file = tmp_path / "config.json"
+    config_file.write_text('{"attr": 0}')
+
+    class DeletedConfig(BaseConfig):
+        attr: int
+
+        CONFIG_SOURCES = FileSource(file=config_file)
+
+    assert DeletedConfig().attr == 0
+    with DeletedConfig.watch_config_sources(
+        debounce=0.0, min_interval=0.0, poll_interval=0.02, use_inotify=False
+    ) as watcher:
+        config_file.unlink()
+        _wait_for(lambda: watcher.last_error is not None)
+    assert DeletedConfig().attr == 0
+
+
+def test_watch_inotify_fallback(monkeypatch):
+    class UnwatchedConfig(BaseConfig):
+        attr: int = 1
+
+    def raise_error():
+        raise OSError
+
+    monkeypatch.setattr(watch, "_InotifyBackend", raise_error)
+    watcher = UnwatchedConfig.watch_config_sources(use_inotify=True)
+    watcher.stop()
+    assert watcher.backend is None
+    with watcher:
+        assert watcher.backend == "polling"
+    assert not watcher.reload()
+
+
+def test_watch_reload_during_change(monkeypatch):
+    class ChangedConfig(BaseConfig):
+        attr1: int
+
+        CONFIG_SOURCES = DataSource(data={"attr1": 1})
+
+    watcher = ChangedConfig.watch_config_sources()
+    change = ChangedConfig.change_config_sources(DataSource(data={"attr1": 2}))
+    create = ChangedConfig.confz_create
+
+    def create_and_change(config_sources, kwargs):
+        instance = create(config_sources, kwargs)
+        change.__enter__()  # sources change while the reload is running
+        return instance
+
+    monkeypatch.setattr(ChangedConfig, "confz_create", create_and_change)
+    assert not watcher.reload()
+    assert watcher.reload_count == 0
+    monkeypatch.undo()
+
+    assert ChangedConfig().attr1 == 2
+    change.__exit__(None, None, None)
+    assert ChangedConfig().attr1 == 1